@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Module Alertes Quantum Scanner v6.1
+Rendu MarkdownV2 des alertes Telegram : gabarit et fragments constants préparés une fois,
+échappement en une passe (str.translate) de tous les caractères réservés.
+
+Deux formats : l'alerte complète (un message par projet) et l'entrée de digest, compacte,
+que TelegramNotifier regroupe à plusieurs par message jusqu'à `telegram.max_message_length`.
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Caractères réservés MarkdownV2 (https://core.telegram.org/bots/api#markdownv2-style), antislash compris
+MDV2_RESERVED = "\\_*[]()~`>#+-=|{}.!"
+
+
+def _ascii_table(reserved: str) -> list:
+    """Table de str.translate indexée par code point : une liste (accès direct) plutôt qu'un dict
+    (hachage par caractère, ~2,5x plus lent). Hors ASCII, IndexError = caractère inchangé."""
+    return [("\\" + chr(i)) if chr(i) in reserved else chr(i) for i in range(128)]
+
+
+_ESCAPE = _ascii_table(MDV2_RESERVED)
+# Dans la partie (...) d'un lien, seuls ')' et '\' sont à échapper
+_URL_ESCAPE = _ascii_table("\\)")
+
+MAX_FIELD_CHARS = 200  # un champ source (nom, flags) ne peut pas faire déborder un message
+
+SEPARATOR = "\\-\\-\\-"
+
+ALERT_TEMPLATE = f"""
+\U0001F30C *QUANTUM SCAN \\- {{name}} \\({{symbol}}\\)*
+
+\U0001F4CA *SCORE: {{score}}/100* \\| \U0001F3AF *VERDICT:* {{verdict}}
+\U0001F680 *PHASE: ICO/IDO/PRE\\-TGE*
+
+{SEPARATOR}
+
+\U0001F4B0 *FINANCIERS*
+• Hard Cap: {{hard_cap}} €
+• MC Estimé: {{mc}} €
+• Potentiel: x{{potential}}
+
+{SEPARATOR}
+
+\U0001F3AF *TOP 5 RATIOS*
+{{top_ratios}}
+
+{SEPARATOR}
+
+\U0001F6E1 *SÉCURITÉ*
+• Audit: {{audit}}
+• Domain Age: {{domain_age}} jours
+
+{SEPARATOR}
+
+\U000026A0\ufe0f *RED FLAGS:* {{flags}}
+
+{SEPARATOR}
+
+\U0001F517 *LIENS*
+{{links}}
+
+\\_ID: {{alert_id}} \\| {{date}}\\_
+"""
+
+DIGEST_ENTRY_TEMPLATE = (
+    "{icon} *{name} \\({symbol}\\)* \\- {source}\n"
+    "\U0001F4CA *{score}/100* \\| *{verdict}* \\| Hard Cap {hard_cap} €\n"
+    "\U0001F3AF {top_ratios}\n"
+    "\U000026A0\ufe0f {flags}\n"
+    "\U0001F517 {links}"
+)
+DIGEST_HEADER = "\U0001F30C *QUANTUM DIGEST* \\| {count} projets \\| {date}\n\n"
+DIGEST_JOINER = "\n\n"
+
+_VERDICT_ICONS = {"GO": "\U0001F680", "REVIEW": "\U0001F50E"}
+
+
+def escape_md(value) -> str:
+    """Texte brut -> MarkdownV2 (une seule passe sur la chaîne)."""
+    return str(value).translate(_ESCAPE)
+
+
+def escape_url(url: str) -> str:
+    return str(url).translate(_URL_ESCAPE)
+
+
+def _number(value: float, spec: str) -> str:
+    """Nombre formaté : seuls '.' et '-' peuvent y être réservés (chiffres, ',', 'e', 'inf', 'nan')."""
+    return format(value, spec).replace(".", "\\.").replace("-", "\\-").replace("+", "\\+")
+
+
+def _clip(value, limit: int = MAX_FIELD_CHARS) -> str:
+    text = str(value)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def telegram_length(text: str) -> int:
+    """Longueur comptée par Telegram (unités UTF-16 : un emoji hors BMP en vaut deux)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+class AlertRenderer:
+    """Alertes MarkdownV2 pour un jeu de poids donné.
+
+    Les libellés de ratios (nom échappé, poids en %) sont construits à l'initialisation ;
+    par message ne restent que l'échappement des valeurs et le classement des ratios.
+    """
+
+    def __init__(self, weights: Dict[str, float], top_ratios: int = 5, digest_top_ratios: int = 3):
+        self.weights = {k: w for k, w in weights.items() if w > 0}
+        self.top_ratios = top_ratios
+        self.digest_top_ratios = digest_top_ratios
+        self._alert = ALERT_TEMPLATE.format_map
+        self._entry = DIGEST_ENTRY_TEMPLATE.format_map
+        self._ratio_lines = {k: (f"• {escape_md(k)}: ", f"% \\(Poids: {escape_md(f'{w * 100:.0f}')}%\\)")
+                             for k, w in self.weights.items()}
+        self._ratio_labels = {k: escape_md(k) for k in self.weights}
+        self._verdicts: Dict[str, str] = {}
+        self._date_minute = -1
+        self._date = ""
+
+    def _escaped_verdict(self, verdict: str) -> str:
+        if verdict not in self._verdicts:
+            self._verdicts[verdict] = escape_md(verdict)
+        return self._verdicts[verdict]
+
+    def _escaped_date(self, now: Optional[datetime]) -> str:
+        """Horodatage à la minute : formaté et échappé une fois par minute, pas à chaque alerte."""
+        if now is not None:
+            return escape_md(now.strftime('%Y-%m-%d %H:%M'))
+        minute = int(time.time() // 60)
+        if minute != self._date_minute:
+            self._date_minute, self._date = minute, escape_md(datetime.now().strftime('%Y-%m-%d %H:%M'))
+        return self._date
+
+    def _top(self, ratios: Dict[str, float], n: int) -> List[Tuple[str, float]]:
+        # 21 ratios : un tri complet (timsort en C) bat heapq.nlargest et sa clé Python
+        weights = self.weights
+        ranked = sorted(ratios.items(), key=lambda kv: kv[1] * weights.get(kv[0], 0), reverse=True)
+        return [kv for kv in ranked if kv[0] in weights][:n]
+
+    @staticmethod
+    def _links(project: Dict) -> str:
+        links = [f"[{label}]({escape_url(url)})" for label, url in
+                 (("Launchpad", project.get('link')), ("Site", project.get('website')))
+                 if url and str(url).startswith(("http://", "https://"))]
+        return " \\| ".join(links) or "Aucun"
+
+    @staticmethod
+    def _flags(analysis: Dict) -> str:
+        return escape_md(_clip(", ".join(analysis.get('flags') or []))) or "Aucun ✅"
+
+    def alert(self, project: Dict, analysis: Dict, now: Optional[datetime] = None) -> str:
+        """Alerte complète d'un projet (un message)."""
+        ratios = analysis.get('ratios') or {}
+        lines = self._ratio_lines
+        top = "\n".join(f"{lines[k][0]}{_number(v * 100, '.0f')}{lines[k][1]}" for k, v in self._top(ratios, self.top_ratios))
+        score = analysis['score']
+        return self._alert({
+            "name": escape_md(_clip(project.get('name', 'N/A'))),
+            "symbol": escape_md(_clip(project.get('symbol', 'N/A'))),
+            "score": _number(score, '.1f'),
+            "verdict": self._escaped_verdict(analysis['verdict']),
+            "hard_cap": _number(project.get('hard_cap_usd') or 0, ',.0f'),
+            "mc": _number(project.get('mc') or 0, ',.0f'),
+            "potential": _number(score / 50, '.1f'),
+            "top_ratios": top or "Aucun",
+            "audit": escape_md(_clip(project.get('audit_firm') or 'Absent')),
+            "domain_age": escape_md(project.get('domain_age_days', 0)),
+            "flags": self._flags(analysis),
+            "links": self._links(project),
+            "alert_id": _number(time.time(), ''),
+            "date": self._escaped_date(now),
+        })
+
+    def digest_entry(self, project: Dict, analysis: Dict) -> str:
+        """Bloc compact d'un projet, à regrouper avec d'autres par `pack_digest`."""
+        ratios = analysis.get('ratios') or {}
+        labels = self._ratio_labels
+        top = ", ".join(f"{labels[k]} {_number(v * 100, '.0f')}%" for k, v in self._top(ratios, self.digest_top_ratios))
+        return self._entry({
+            "icon": _VERDICT_ICONS.get(analysis['verdict'], "\U0001F4CC"),
+            "name": escape_md(_clip(project.get('name', 'N/A'))),
+            "symbol": escape_md(_clip(project.get('symbol', 'N/A'))),
+            "source": escape_md(_clip(project.get('source', 'N/A'))),
+            "score": _number(analysis['score'], '.1f'),
+            "verdict": self._escaped_verdict(analysis['verdict']),
+            "hard_cap": _number(project.get('hard_cap_usd') or 0, ',.0f'),
+            "top_ratios": top or "Aucun ratio",
+            "flags": self._flags(analysis),
+            "links": self._links(project),
+        })
+
+
+def pack_digest(entries: Sequence[str], max_length: int = 4096, now: Optional[datetime] = None) -> Tuple[str, int]:
+    """Message de digest avec autant d'entrées que possible, coupé entre deux projets.
+
+    Renvoie (texte, nombre d'entrées consommées) ; au moins une entrée est toujours prise.
+    """
+    date = escape_md((now or datetime.now()).strftime('%Y-%m-%d %H:%M'))
+    # En-tête dimensionné pour le pire compte (toutes les entrées), recalculé à la fin
+    budget = max_length - telegram_length(DIGEST_HEADER.format(count=len(entries), date=date))
+    taken, used = 0, 0
+    for entry in entries:
+        size = telegram_length(entry) + (telegram_length(DIGEST_JOINER) if taken else 0)
+        if taken and used + size > budget:
+            break
+        used += size
+        taken += 1
+    return DIGEST_HEADER.format(count=taken, date=date) + DIGEST_JOINER.join(entries[:taken]), taken
@@ -2,28 +2,179 @@
 """
 Module Anti-Scam Quantum Scanner v6.0
 10+ bases de données anti-scam intégrées
+
+Chaque fournisseur a ses propres limites (section antiscam.providers) : requêtes simultanées,
+débit (token bucket), délai maximal et circuit breaker. check_addresses vérifie des milliers
+d'adresses en flux : un fournisseur lent ou en panne est ignoré pour une adresse au-delà de
+`max_wait` au lieu de bloquer les autres.
 """
 
 import aiohttp
 import asyncio
+import itertools
 import json
 import re
-from typing import Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from loguru import logger
 from urllib.parse import urlparse
-import whois
-from datetime import datetime
+from metrics import Histogram
+from phishing_blacklist import phishing_blacklist
+from rate_limiter import CircuitBreaker, TokenBucket, parse_retry_after
+from whois_cache import domain_age_resolver
+from ttl_cache import SQLiteCacheTier, TieredCache
+
+# TTL par fournisseur (secondes) : une liste noire bouge peu, un honeypot/les taxes beaucoup plus
+DEFAULT_PROVIDER_TTLS = {
+    "cryptoscamdb": 24 * 3600,
+    "tokensniffer": 6 * 3600,
+    "honeypot": 1800,
+    "rugdoc": 24 * 3600,
+}
+
+class ProviderUnavailable(Exception):
+    """Fournisseur ignoré pour une adresse (circuit ouvert, attente > max_wait) : rien n'est mis en cache."""
+
+
+class ProviderLimit:
+    """Concurrence, débit et circuit breaker d'un fournisseur, avec latences et erreurs observées."""
+
+    def __init__(self, name: str, rate: float = 20.0, burst: float = 20, concurrency: int = 8,
+                 timeout: float = 10.0, max_wait: float = 30.0, failure_threshold: int = 5,
+                 cooldown: float = 120.0, bulk: bool = False):
+        self.name = name
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate if rate > 0 else float('inf'), burst)
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.bulk = bulk
+        self.latency = Histogram()
+        self.stats = self.new_stats()
+        self.waiting = 0
+
+    @staticmethod
+    def new_stats() -> Dict[str, float]:
+        return {"requests": 0, "successes": 0, "errors": 0, "timeouts": 0, "throttled_429": 0,
+                "fast_failed": 0, "skipped": 0, "queue_wait_s": 0.0}
+
+    def expected_wait(self) -> float:
+        """Attente estimée d'une nouvelle requête : requêtes en file x latence moyenne / concurrence."""
+        latency = self.latency
+        if not latency.count or not self.semaphore.locked():
+            return 0.0
+        return (self.waiting + 1) * (latency.sum / latency.count) / self.concurrency
+
+    def _circuit_open(self) -> bool:
+        breaker = self.breaker
+        return breaker.state == "open" and time.monotonic() - breaker.opened_at < breaker.cooldown
+
+    @asynccontextmanager
+    async def slot(self):
+        """Créneau de requête : place libre puis jeton, en moins de `max_wait` ; ProviderUnavailable sinon."""
+        if self._circuit_open():
+            self.stats['fast_failed'] += 1
+            raise ProviderUnavailable(f"{self.name}: circuit ouvert")
+        if self.expected_wait() > self.max_wait:
+            # File trop longue pour la latence observée : ignoré tout de suite plutôt qu'après max_wait
+            self.stats['skipped'] += 1
+            raise ProviderUnavailable(f"{self.name}: file d'attente > {self.max_wait:.0f}s")
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.stats['skipped'] += 1
+            raise ProviderUnavailable(f"{self.name}: pas de place en {self.max_wait:.0f}s") from None
+        finally:
+            self.waiting -= 1
+        try:
+            wait = self.bucket.reserve()
+            if wait > self.max_wait - (time.monotonic() - started):
+                self.bucket.refund()
+                self.stats['skipped'] += 1
+                raise ProviderUnavailable(f"{self.name}: débit dépassé")
+            if wait > 0:
+                await asyncio.sleep(wait)
+            # Vérifié en dernier : en half-open, allow() réserve l'unique requête de test
+            if not self.breaker.allow():
+                self.stats['fast_failed'] += 1
+                raise ProviderUnavailable(f"{self.name}: circuit ouvert")
+            probe = self.breaker.state == "half_open"
+            self.stats['queue_wait_s'] += time.monotonic() - started
+            self.stats['requests'] += 1
+            try:
+                yield
+            finally:
+                # Requête de test annulée avant record_* : le créneau de test est rendu
+                if probe:
+                    self.breaker.release_probe()
+        finally:
+            self.semaphore.release()
+
+    def record_success(self, seconds: float):
+        self.latency.observe(seconds)
+        self.stats['successes'] += 1
+        self.breaker.record_success()
+        self.bucket.speed_up()
+
+    def record_failure(self, seconds: float, timeout: bool = False):
+        self.latency.observe(seconds)
+        self.stats['timeouts' if timeout else 'errors'] += 1
+        if self.breaker.record_failure():
+            logger.warning(f"Anti-scam: circuit ouvert pour {self.name} ({self.breaker.cooldown:.0f}s)")
+
+    def record_throttled(self, seconds: float, retry_after: Optional[float]):
+        """429 : débit divisé par deux et pause partagée ; le fournisseur répond, le circuit reste fermé."""
+        self.latency.observe(seconds)
+        self.stats['throttled_429'] += 1
+        self.breaker.record_success()
+        self.bucket.slow_down()
+        self.bucket.pause(min(retry_after if retry_after is not None else 1.0, self.max_wait))
+
+    def reset_stats(self):
+        self.latency = Histogram()
+        self.stats = self.new_stats()
+        self.breaker.open_seconds = 0.0
+
+    def report(self) -> Dict:
+        return {**self.stats, "queue_wait_s": round(self.stats['queue_wait_s'], 3),
+                "latency": self.latency.summary(), "circuit": self.breaker.state, "rate": self.bucket.rate}
+
 
 class AntiScamAPI:
     """API anti-scam avec 10+ bases de données"""
     
-    def __init__(self):
-        self.cache = {}
-        self.rate_limits = {}
+    def __init__(self, http=None, cache_size: int = 10000, provider_ttls: Optional[Dict[str, float]] = None,
+                 negative_ttl: float = 300, persistent_cache: Optional[str] = None,
+                 provider_limits: Optional[Dict[str, Dict]] = None, max_wait: float = 30.0,
+                 max_in_flight: int = 200, failure_threshold: int = 5, cooldown: float = 120.0):
+        # Client HTTP partagé (http_client.HttpClient) injecté par le scanner ; sinon session locale
+        self.http = http
+        # Cache LRU borné par (fournisseur, adresse) + tier SQLite optionnel entre deux runs
+        self.cache = TieredCache(cache_size, SQLiteCacheTier(persistent_cache) if persistent_cache else None)
+        self.provider_ttls = {**DEFAULT_PROVIDER_TTLS, **(provider_ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.max_in_flight = max_in_flight
+        self.rate_limits = {
+            # Défauts de ProviderLimit, surchargés par antiscam.providers.<nom>
+            name: ProviderLimit(name, **{"max_wait": max_wait, "failure_threshold": failure_threshold,
+                                         "cooldown": cooldown, **(provider_limits or {}).get(name, {})})
+            for name in DEFAULT_PROVIDER_TTLS
+        }
+        # Listes complètes téléchargées par check_addresses (une requête pour tout un lot)
+        self._bulk_lists: Dict[str, Tuple[float, frozenset]] = {}
+        # Sans client partagé, check_addresses ouvre une session pour tout le lot, partagée par
+        # les appels qui se chevauchent et fermée par le dernier qui se termine
+        self._batch_session: Optional[aiohttp.ClientSession] = None
+        self._batch_users = 0
         
         # Bases de données anti-scam
         self.databases = {
             "cryptoscamdb": "https://api.cryptoscamdb.org/v1/check/{}",
+            "cryptoscamdb_list": "https://api.cryptoscamdb.org/v1/addresses",
             "chainabuse": "https://api.chainabuse.com/v1/reports/{}",
             "tokensniffer": "https://api.tokensniffer.com/v2/tokens/{}",
             "honeypot": "https://api.honeypot.is/v2/IsHoneypot?address={}",
@@ -33,33 +184,143 @@ class AntiScamAPI:
             "safety_triangle": "https://api.safetytriangle.com/v1/check/{}"
         }
     
+    @classmethod
+    def from_settings(cls, settings: Dict, http=None) -> "AntiScamAPI":
+        """Construit l'API depuis config.yml (sections antiscam.cache et antiscam.providers)."""
+        cfg = settings.get('antiscam', {})
+        cache = cfg.get('cache', {})
+        breaker = cfg.get('circuit_breaker', {})
+        return cls(http=http, cache_size=cache.get('max_entries', 10000),
+                   provider_ttls=cache.get('provider_ttls'), negative_ttl=cache.get('negative_ttl', 300),
+                   persistent_cache=cache.get('persistent_path') if cache.get('persistent', False) else None,
+                   provider_limits=cfg.get('providers'), max_wait=cfg.get('max_wait', 30.0),
+                   max_in_flight=cfg.get('max_in_flight', 200),
+                   failure_threshold=breaker.get('failure_threshold', 5), cooldown=breaker.get('cooldown', 120))
+    
+    @property
+    def providers(self) -> Dict:
+        return {
+            "cryptoscamdb": self._check_cryptoscamdb,
+            "tokensniffer": self._check_tokensniffer,
+            "honeypot": self._check_honeypot,
+            "rugdoc": self._check_rugdoc,
+        }
+    
+    @property
+    def bulk_loaders(self) -> Dict[str, Callable[[], Awaitable[Optional[Callable[[str], Dict]]]]]:
+        """Fournisseurs publiant leur base entière : une requête par lot au lieu d'une par adresse."""
+        return {"cryptoscamdb": self._load_cryptoscamdb_list}
+    
+    async def _cached_check(self, provider: str, address: str,
+                            lookups: Optional[Dict[str, "asyncio.Task"]] = None) -> Dict:
+        """Résultat d'un fournisseur via le cache (TTL propre, erreurs en cache négatif court)."""
+        return await self.cache.get_or_load(
+            f"{provider}:{address.lower()}", lambda: self._provider_check(provider, address, lookups),
+            ttl=self.provider_ttls.get(provider, 3600), negative_ttl=self.negative_ttl,
+            is_error=lambda result: 'error' in result)
+    
+    async def _provider_check(self, provider: str, address: str,
+                              lookups: Optional[Dict[str, "asyncio.Task"]] = None) -> Dict:
+        if lookups and provider in lookups:
+            # shield : une adresse annulée n'annule pas le téléchargement partagé par le lot
+            lookup = await asyncio.shield(lookups[provider])
+            if lookup is not None:
+                return lookup(address)
+        return await self.providers[provider](address)
+    
     async def check_address(self, address: str) -> Dict:
         """Vérifie une adresse dans toutes les bases"""
-        if address in self.cache:
-            return self.cache[address]
-        
+        # Coalescing : des appels concurrents pour la même adresse partagent une seule vérification
+        return await self.cache.flight.do(f"address:{address.lower()}", lambda: self._check_address(address))
+    
+    async def check_addresses(self, addresses: Iterable[str],
+                              max_in_flight: Optional[int] = None) -> AsyncIterator[Tuple[str, Dict]]:
+        """Vérifie un lot d'adresses ; (adresse, résultat) est produit dès qu'une adresse est terminée.
+
+        Au plus `max_in_flight` adresses en cours ; les limites de chaque fournisseur s'appliquent
+        en plus. Un fournisseur sans créneau en `max_wait` (file estimée trop longue, circuit
+        ouvert) figure dans `skipped` du résultat. Doublons (à la casse près) vérifiés une fois.
+        """
+        limit = max_in_flight or self.max_in_flight
+        # Lot vide : ni session ni téléchargement des listes complètes
+        addresses = iter(addresses)
+        first = next((address for address in addresses if address), None)
+        if first is None:
+            return
+        addresses = itertools.chain([first], addresses)
+        started, done_count = time.monotonic(), 0
+        owns_session = self.http is None
+        if owns_session:
+            if self._batch_session is None:
+                self._batch_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                    limit=sum(p.concurrency for p in self.rate_limits.values())))
+            self._batch_users += 1
+        lookups = {name: asyncio.ensure_future(loader()) for name, loader in self.bulk_loaders.items()
+                   if self.rate_limits[name].bulk}
+
+        async def screen(address: str) -> Tuple[str, Dict]:
+            return address, await self.cache.flight.do(f"address:{address.lower()}",
+                                                        lambda: self._check_address(address, lookups))
+
+        pending, seen = set(), set()
+        try:
+            for address in addresses:
+                if not address or address.lower() in seen:
+                    continue
+                seen.add(address.lower())
+                pending.add(asyncio.ensure_future(screen(address)))
+                if len(pending) < limit:
+                    continue
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    done_count += 1
+                    yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    done_count += 1
+                    yield task.result()
+        finally:
+            # Consommateur arrêté en cours de route : rien ne doit continuer en arrière-plan
+            leftovers = [*pending, *lookups.values()]
+            for task in leftovers:
+                task.cancel()
+            await asyncio.gather(*leftovers, return_exceptions=True)
+            if owns_session:
+                self._batch_users -= 1
+                if not self._batch_users and self._batch_session is not None:
+                    session, self._batch_session = self._batch_session, None
+                    await session.close()
+            if done_count:
+                elapsed = time.monotonic() - started
+                logger.info(f"Anti-scam: {done_count} adresses vérifiées en {elapsed:.1f}s "
+                            f"({done_count / elapsed if elapsed else 0:.0f}/s)")
+                for name, report in self.provider_stats().items():
+                    logger.info(f"Anti-scam [{name}]: {report}")
+    
+    async def _check_address(self, address: str, lookups: Optional[Dict[str, "asyncio.Task"]] = None) -> Dict:
         results = {
             "is_scam": False,
             "confidence": 0.0,
             "sources": [],
             "reasons": [],
-            "details": {}
+            "details": {},
+            "skipped": []
         }
         
-        tasks = [
-            self._check_cryptoscamdb(address),
-            self._check_tokensniffer(address),
-            self._check_honeypot(address),
-            self._check_rugdoc(address)
-        ]
+        names = list(self.providers)
+        tasks = [self._cached_check(provider, address, lookups) for provider in names]
         
         checks = await asyncio.gather(*tasks, return_exceptions=True)
         
         scam_count = 0
         total_checks = 0
         
-        for check in checks:
-            if isinstance(check, dict) and check:
+        for provider, check in zip(names, checks):
+            if isinstance(check, ProviderUnavailable):
+                # Non consultée : ni signalement ni absence de signalement, hors du calcul de confiance
+                results['skipped'].append(provider)
+            elif isinstance(check, dict) and check:
                 total_checks += 1
                 source = check.get('source', 'unknown')
                 results['details'][source] = check
@@ -74,23 +335,97 @@ class AntiScamAPI:
             results['confidence'] = scam_count / total_checks
             results['is_scam'] = results['confidence'] > 0.3  # Seuil de 30%
         
-        self.cache[address] = results
         return results
     
+    def cache_stats(self) -> Dict:
+        """Compteurs hit / miss / coalesce / évictions du cache."""
+        return self.cache.report()
+    
+    def provider_stats(self) -> Dict[str, Dict]:
+        """Par fournisseur : requêtes, erreurs, timeouts, 429, ignorés, latences (p50/p95), état du circuit."""
+        return {name: limit.report() for name, limit in self.rate_limits.items()}
+    
+    def reset_stats(self):
+        for limit in self.rate_limits.values():
+            limit.reset_stats()
+    
+    async def close(self):
+        await self.cache.close()
+    
+    @asynccontextmanager
+    async def _session(self):
+        """Session du pool partagé si injecté, sinon session éphémère."""
+        if self.http is not None:
+            yield self.http.session
+        elif self._batch_session is not None:
+            yield self._batch_session
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
+    
+    async def _get_json(self, provider: str, url: str):
+        """GET sous les limites du fournisseur : JSON si 200, None sinon ; 429 et pannes lèvent."""
+        limit = self.rate_limits[provider]
+        async with limit.slot():
+            started = time.monotonic()
+            try:
+                async with self._session() as session:
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=limit.timeout)) as response:
+                        if response.status == 429:
+                            limit.record_throttled(time.monotonic() - started,
+                                                   parse_retry_after(response.headers.get('Retry-After')))
+                            raise aiohttp.ClientResponseError(response.request_info, (), status=429,
+                                                              message="Too Many Requests")
+                        if response.status >= 500:
+                            raise aiohttp.ClientResponseError(response.request_info, (), status=response.status)
+                        data = await response.json() if response.status == 200 else None
+            except aiohttp.ClientResponseError as e:
+                if e.status != 429:
+                    limit.record_failure(time.monotonic() - started)
+                raise
+            except asyncio.TimeoutError:
+                limit.record_failure(time.monotonic() - started, timeout=True)
+                raise
+            except Exception:
+                limit.record_failure(time.monotonic() - started)
+                raise
+            limit.record_success(time.monotonic() - started)
+            return data
+    
+    async def _load_cryptoscamdb_list(self) -> Optional[Callable[[str], Dict]]:
+        """Toutes les adresses signalées à CryptoScamDB (/v1/addresses), gardées le TTL du fournisseur."""
+        ttl = self.provider_ttls.get("cryptoscamdb", 3600)
+        cached = self._bulk_lists.get("cryptoscamdb")
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            listed = cached[1]
+        else:
+            try:
+                data = await self._get_json("cryptoscamdb", self.databases["cryptoscamdb_list"])
+            except Exception as e:
+                logger.debug(f"CryptoScamDB liste complète indisponible, vérification adresse par adresse: {e}")
+                return None
+            if not isinstance(data, dict) or not data.get('success'):
+                return None
+            listed = frozenset(a.lower() for a in (data.get('result') or {}))
+            self._bulk_lists["cryptoscamdb"] = (time.monotonic(), listed)
+
+        def lookup(address: str) -> Dict:
+            return {"is_scam": address.lower() in listed, "reason": "Listed in CryptoScamDB", "source": "CryptoScamDB"}
+        return lookup
+    
     async def _check_cryptoscamdb(self, address: str) -> Dict:
         """Vérifie CryptoScamDB"""
         try:
-            url = self.databases["cryptoscamdb"].format(address)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            "is_scam": data.get('success', False) and data.get('result', {}).get('success', False),
-                            "reason": "Listed in CryptoScamDB",
-                            "source": "CryptoScamDB"
-                        }
+            data = await self._get_json("cryptoscamdb", self.databases["cryptoscamdb"].format(address))
+            if data is not None:
+                return {
+                    "is_scam": data.get('success', False) and data.get('result', {}).get('success', False),
+                    "reason": "Listed in CryptoScamDB",
+                    "source": "CryptoScamDB"
+                }
             return {"is_scam": False, "source": "CryptoScamDB"}
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             logger.debug(f"CryptoScamDB error: {e}")
             return {"is_scam": False, "error": str(e), "source": "CryptoScamDB"}
@@ -98,19 +433,18 @@ class AntiScamAPI:
     async def _check_tokensniffer(self, address: str) -> Dict:
         """Vérifie TokenSniffer"""
         try:
-            url = self.databases["tokensniffer"].format(address)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        score = data.get('score', 100)
-                        return {
-                            "is_scam": score < 20,
-                            "score": score,
-                            "reason": f"TokenSniffer score: {score}/100",
-                            "source": "TokenSniffer"
-                        }
+            data = await self._get_json("tokensniffer", self.databases["tokensniffer"].format(address))
+            if data is not None:
+                score = data.get('score', 100)
+                return {
+                    "is_scam": score < 20,
+                    "score": score,
+                    "reason": f"TokenSniffer score: {score}/100",
+                    "source": "TokenSniffer"
+                }
             return {"is_scam": False, "source": "TokenSniffer"}
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             logger.debug(f"TokenSniffer error: {e}")
             return {"is_scam": False, "error": str(e), "source": "TokenSniffer"}
@@ -118,21 +452,20 @@ class AntiScamAPI:
     async def _check_honeypot(self, address: str) -> Dict:
         """Vérifie Honeypot.is"""
         try:
-            url = self.databases["honeypot"].format(address)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        is_honeypot = data.get('IsHoneypot', False)
-                        tax = data.get('BuyTax', 0)
-                        return {
-                            "is_honeypot": is_honeypot,
-                            "is_scam": is_honeypot or tax > 15,
-                            "tax": tax,
-                            "reason": f"Honeypot: {is_honeypot}, Tax: {tax}%",
-                            "source": "Honeypot.is"
-                        }
+            data = await self._get_json("honeypot", self.databases["honeypot"].format(address))
+            if data is not None:
+                is_honeypot = data.get('IsHoneypot', False)
+                tax = data.get('BuyTax', 0)
+                return {
+                    "is_honeypot": is_honeypot,
+                    "is_scam": is_honeypot or tax > 15,
+                    "tax": tax,
+                    "reason": f"Honeypot: {is_honeypot}, Tax: {tax}%",
+                    "source": "Honeypot.is"
+                }
             return {"is_scam": False, "source": "Honeypot.is"}
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             logger.debug(f"Honeypot error: {e}")
             return {"is_scam": False, "error": str(e), "source": "Honeypot.is"}
@@ -140,41 +473,41 @@ class AntiScamAPI:
     async def _check_rugdoc(self, address: str) -> Dict:
         """Vérifie RugDoc"""
         try:
-            url = self.databases["rugdoc"].format(address)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # RugDoc retourne un score de risque
-                        risk_level = data.get('risk_level', 'low')
-                        is_risky = risk_level in ['high', 'very_high']
-                        return {
-                            "is_scam": is_risky,
-                            "risk_level": risk_level,
-                            "reason": f"RugDoc risk: {risk_level}",
-                            "source": "RugDoc"
-                        }
+            data = await self._get_json("rugdoc", self.databases["rugdoc"].format(address))
+            if data is not None:
+                # RugDoc retourne un score de risque
+                risk_level = data.get('risk_level', 'low')
+                is_risky = risk_level in ['high', 'very_high']
+                return {
+                    "is_scam": is_risky,
+                    "risk_level": risk_level,
+                    "reason": f"RugDoc risk: {risk_level}",
+                    "source": "RugDoc"
+                }
             return {"is_scam": False, "source": "RugDoc"}
+        except ProviderUnavailable:
+            raise
         except Exception as e:
             logger.debug(f"RugDoc error: {e}")
             return {"is_scam": False, "error": str(e), "source": "RugDoc"}
     
     async def check_domain(self, domain: str) -> Dict:
         """Vérifie un domaine"""
+        # Liste de phishing MetaMask (lookup O(1), partagé avec le scanner)
+        await phishing_blacklist.refresh(self.http.session if self.http is not None else None)
+        is_phishing = phishing_blacklist.is_blacklisted(domain)
+        
         try:
-            # Vérification WHOIS
-            domain_info = whois.whois(domain)
-            creation_date = domain_info.creation_date
-            
-            if isinstance(creation_date, list):
-                creation_date = creation_date[0]
-            
-            age_days = (datetime.now() - creation_date).days if creation_date else 0
+            # Vérification WHOIS (non bloquante, cache SQLite partagé avec le scanner)
+            age_days = await domain_age_resolver.age_days(domain)
+            if age_days is None:
+                raise LookupError("WHOIS indisponible")
             
             return {
                 "age_days": age_days,
-                "is_suspicious": age_days < 7,
-                "reason": f"Domain age: {age_days} days",
+                "is_phishing": is_phishing,
+                "is_suspicious": age_days < 7 or is_phishing,
+                "reason": "Listed in MetaMask phishing list" if is_phishing else f"Domain age: {age_days} days",
                 "source": "WHOIS"
             }
             
@@ -182,6 +515,7 @@ class AntiScamAPI:
             logger.debug(f"Domain check error: {e}")
             return {
                 "age_days": 0,
+                "is_phishing": is_phishing,
                 "is_suspicious": True,
                 "reason": f"Error: {e}",
                 "source": "WHOIS"
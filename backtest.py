@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Module Backtest Quantum Scanner v6.1
+Re-scoring hors ligne de l'historique des ratios (table ratios de quantum.db) contre des
+milliers de vecteurs de poids candidats, sans réseau.
+
+Toutes les lignes de ratios sont chargées en une matrice float32 (N, 21) ; les candidats
+(de même somme que les poids actuels) forment une matrice (C, 21) et chaque bloc de lignes est scoré
+pour tous les candidats en un produit matriciel. Pour chaque candidat : répartition GO / REVIEW / REJECT, lignes dont le
+verdict change par rapport aux poids actuels et, si un jeu d'issues étiquetées est fourni,
+accord avec ces issues (dernier snapshot de chaque projet étiqueté). La lecture de SQLite
+(~1 M lignes en quelques secondes) est faite une fois : la matrice est gardée dans `cache_dir`
+et seules les nouvelles lignes sont relues aux runs suivants.
+
+Les flags (domaine jeune, owner...) ne sont pas historisés : les verdicts du backtest ne
+dépendent que du score, pour les poids actuels comme pour les candidats. Les rejets durs
+n'ont pas de ligne de ratios et sont absents de l'historique.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import itertools
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from persistence import RATIO_COLUMNS
+from startup import lazy_module
+
+np = lazy_module("numpy")
+
+VERDICTS = ("REJECT", "REVIEW", "GO")  # codes 0 / 1 / 2 : (score >= review) + (score >= go)
+_LABEL_ALIASES = {
+    "go": 2, "good": 2, "success": 2, "1": 2, "true": 2,
+    "review": 1,
+    "reject": 0, "bad": 0, "scam": 0, "rug": 0, "0": 0, "false": 0,
+}
+
+
+@dataclass
+class History:
+    ratios: "np.ndarray"        # (N, 21) float32, ordre RATIO_COLUMNS
+    project_ids: "np.ndarray"   # (N,) int64
+    projects: Dict[Tuple[str, str], int] = field(default_factory=dict)  # (name, source) -> project_id
+
+    def __len__(self) -> int:
+        return self.ratios.shape[0]
+
+    def latest_rows(self, project_ids: Sequence[int]) -> "np.ndarray":
+        """Indice du dernier snapshot de chaque projet (-1 si le projet n'a aucune ligne)."""
+        ids = self.project_ids
+        # Lignes triées par id croissant : la première occurrence dans l'ordre inverse est la plus récente
+        uniq, first_in_reversed = np.unique(ids[::-1], return_index=True)
+        last = dict(zip(uniq.tolist(), (len(ids) - 1 - first_in_reversed).tolist()))
+        return np.array([last.get(int(pid), -1) for pid in project_ids], dtype=np.int64)
+
+
+def _read_rows(conn: sqlite3.Connection, after_id: int, chunk_rows: int) -> "np.ndarray":
+    """Lignes de ratios d'id > after_id : matrice float64 (id, project_id, 21 ratios), lue par blocs."""
+    width = len(RATIO_COLUMNS) + 2
+    columns = ", ".join(f"COALESCE({c}, 0.0)" for c in RATIO_COLUMNS)
+    n = conn.execute("SELECT COUNT(*) FROM ratios WHERE id > ?", (after_id,)).fetchone()[0]
+    data = np.empty((n, width), dtype=np.float64)
+    cursor = conn.execute(f"SELECT id, project_id, {columns} FROM ratios WHERE id > ? ORDER BY id", (after_id,))
+    row = 0
+    while row < n:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        # Un tuple Python par ligne, jamais toute la table à la fois
+        block = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64, count=len(rows) * width)
+        data[row:row + len(rows)] = block.reshape(len(rows), width)
+        row += len(rows)
+    return data[:row]
+
+
+def _cache_file(cache_dir: str, db_path: str) -> str:
+    digest = hashlib.sha256(os.path.abspath(db_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"ratios_{digest}.npz")
+
+
+def _read_cache(path: str) -> Optional[Tuple["np.ndarray", "np.ndarray", int]]:
+    try:
+        with np.load(path) as cached:
+            return cached["ratios"], cached["project_ids"], int(cached["last_id"])
+    except (OSError, KeyError, ValueError) as e:
+        if os.path.exists(path):
+            logger.debug(f"Cache de backtest illisible ({path}): {e}")
+        return None
+
+
+def _write_cache(path: str, history: "History", last_id: int):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        np.savez(f, ratios=history.ratios, project_ids=history.project_ids, last_id=np.int64(last_id))
+    os.replace(tmp, path)
+
+
+def load_history(db_path: str, cache_dir: Optional[str] = None, chunk_rows: int = 200_000) -> History:
+    """Table ratios -> matrice float32 (N, 21).
+
+    Avec `cache_dir`, la matrice est gardée en .npz et seules les lignes ajoutées depuis (id plus
+    grand que le dernier mis en cache) sont relues : la table est en ajout seul. Si des lignes
+    anciennes ont disparu (nettoyage des orphelins), le cache est reconstruit.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    cache_path = _cache_file(cache_dir, db_path) if cache_dir else None
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cached = _read_cache(cache_path) if cache_path else None
+        if cached is not None:
+            ratios, project_ids, last_id = cached
+            kept = conn.execute("SELECT COUNT(*) FROM ratios WHERE id <= ?", (last_id,)).fetchone()[0]
+            if kept != len(ratios):
+                logger.info("Backtest: historique modifié depuis la mise en cache, relecture complète")
+                cached = None
+        if cached is None:
+            ratios = np.empty((0, len(RATIO_COLUMNS)), dtype=np.float32)
+            project_ids, last_id = np.empty(0, dtype=np.int64), 0
+        data = _read_rows(conn, last_id, chunk_rows)
+        projects = {(name, source): pid for pid, name, source in conn.execute("SELECT id, name, source FROM projects")}
+    finally:
+        conn.close()
+
+    if len(data):
+        ratios = np.concatenate([ratios, data[:, 2:].astype(np.float32)])
+        project_ids = np.concatenate([project_ids, data[:, 1].astype(np.int64)])
+    history = History(np.ascontiguousarray(ratios), project_ids, projects)
+    if cache_path and (len(data) or cached is None):
+        try:
+            _write_cache(cache_path, history, int(data[-1, 0]) if len(data) else last_id)
+        except OSError as e:
+            logger.warning(f"Cache de backtest non écrit ({cache_path}): {e}")
+    return history
+
+
+def load_labels(path: str) -> List[Tuple[str, str, int]]:
+    """CSV name,source,outcome ; outcome GO/REVIEW/REJECT ou good/bad (scam, rug, 1/0...)."""
+    labels = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for line in csv.DictReader(f):
+            outcome = _LABEL_ALIASES.get(str(line.get('outcome', '')).strip().lower())
+            if outcome is None or not line.get('name'):
+                logger.warning(f"Étiquette ignorée: {line}")
+                continue
+            labels.append((line['name'], line.get('source', ''), outcome))
+    return labels
+
+
+def weight_vector(weights: Mapping[str, float]) -> "np.ndarray":
+    return np.array([float(weights.get(k, 0.0)) for k in RATIO_COLUMNS], dtype=np.float64)
+
+
+def sample_candidates(base: "np.ndarray", count: int, concentration: float = 50.0,
+                      seed: int = 0) -> "np.ndarray":
+    """(count, 21) poids tirés d'une Dirichlet centrée sur `base` normalisé (concentration 0 = uniforme
+    sur le simplexe), ramenés à la somme de `base` : les seuils GO/REVIEW s'appliquent à la même
+    échelle de score. La première ligne est `base`."""
+    rng = np.random.default_rng(seed)
+    total = base.sum()
+    center = base / total
+    if concentration > 0:
+        alpha = np.maximum(center * concentration * len(center), 1e-3)
+    else:
+        alpha = np.ones(len(center))
+    candidates = rng.dirichlet(alpha, size=max(count, 1)) * total
+    candidates[0] = base
+    return candidates
+
+
+def grid_candidates(base: "np.ndarray", grid: Mapping[str, Sequence[float]]) -> "np.ndarray":
+    """Grille {ratio: multiplicateurs} : produit cartésien appliqué aux poids `base`, ramené à la somme de `base`."""
+    index = [RATIO_COLUMNS.index(r) for r in grid]
+    rows = []
+    for combo in itertools.product(*grid.values()):
+        w = base.copy()
+        w[index] = w[index] * np.asarray(combo, dtype=np.float64)
+        if w.sum() > 0:
+            rows.append(w * (base.sum() / w.sum()))
+    return np.array(rows, dtype=np.float64).reshape(-1, len(base))
+
+
+class Backtester:
+    """Scores et verdicts de l'historique pour C candidats, par blocs d'environ `block_elements` scores.
+
+    Les lignes sont regroupées par verdict sous les poids actuels : dans un groupe, le nombre de
+    verdicts changés se déduit des seuls comptages « score >= GO » et « score >= REVIEW » d'un
+    candidat, sans comparer ligne à ligne. Les scores d'un bloc sont en disposition (C, lignes) :
+    chaque comptage est une somme contiguë sur des uint8.
+    """
+
+    MAX_BLOCK_ROWS = 65535  # sommes par candidat accumulées en uint16 dans un bloc
+
+    def __init__(self, weights: Mapping[str, float], go_score: float, review_score: float,
+                 block_elements: int = 2_000_000):
+        self.base = weight_vector(weights)
+        self.go_score = go_score
+        self.review_score = review_score
+        self.block_elements = block_elements
+
+    def _codes(self, scores: "np.ndarray") -> "np.ndarray":
+        """0 REJECT / 1 REVIEW / 2 GO : mêmes seuils que BatchScorer.verdicts (score >= GO_SCORE, >= REVIEW_SCORE)."""
+        return (scores >= self.review_score).view(np.uint8) + (scores >= self.go_score).view(np.uint8)
+
+    def _counts(self, w: "np.ndarray", ratios: "np.ndarray", rows: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Par candidat : lignes avec score >= GO et lignes avec score >= REVIEW."""
+        go = np.zeros(w.shape[0], dtype=np.int64)
+        review_or_go = np.zeros(w.shape[0], dtype=np.int64)
+        for start in range(0, len(ratios), rows):
+            scores = w @ ratios[start:start + rows].T                      # (C, lignes) : un produit par bloc
+            go += (scores >= self.go_score).view(np.uint8).sum(axis=1, dtype=np.uint16)
+            review_or_go += (scores >= self.review_score).view(np.uint8).sum(axis=1, dtype=np.uint16)
+        return go, review_or_go
+
+    def evaluate(self, history: History, candidates: "np.ndarray",
+                 labels: Optional[List[Tuple[str, str, int]]] = None) -> Dict:
+        """Répartition des verdicts, changements vs poids actuels et accord avec les étiquettes, par candidat."""
+        started = time.perf_counter()
+        n, c = len(history), candidates.shape[0]
+        w = np.ascontiguousarray(candidates * 100, dtype=np.float32)     # (C, 21), scores en 0-100
+        # Poids quasi nuls de la Dirichlet : sous-normaux en float32, ils ralentissent le produit de ~2x
+        w[w < np.finfo(np.float32).tiny] = 0
+        base_codes = self._codes(history.ratios @ (self.base * 100).astype(np.float32))
+        base_counts = np.bincount(base_codes, minlength=3)
+        rows = max(1, min(self.block_elements // max(c, 1), self.MAX_BLOCK_ROWS))
+
+        go = np.zeros(c, dtype=np.int64)
+        review_or_go = np.zeros(c, dtype=np.int64)
+        changed = np.zeros(c, dtype=np.int64)
+        for code in range(3):
+            size = int(base_counts[code])
+            if not size:
+                continue
+            g, r = self._counts(w, history.ratios[base_codes == code], rows)
+            go += g
+            review_or_go += r
+            if code == 0:    # REJECT -> change dès que score >= REVIEW
+                changed += r
+            elif code == 1:  # REVIEW -> change sous REVIEW ou au-dessus de GO
+                changed += size - r + g
+            else:            # GO -> change sous GO
+                changed += size - g
+
+        distribution = np.stack([n - review_or_go, review_or_go - go, go], axis=1)
+        result = {"rows": n, "candidates": c, "baseline": {"distribution": dict(zip(VERDICTS, base_counts.tolist()))},
+                  "distribution": distribution, "changed": changed}
+        if labels:
+            result.update(self._agreement(history, w, labels))
+        result["elapsed_s"] = time.perf_counter() - started
+        return result
+
+    def _agreement(self, history: History, w: "np.ndarray", labels: List[Tuple[str, str, int]]) -> Dict:
+        ids = [history.projects.get((name, source), -1) for name, source, _ in labels]
+        rows = history.latest_rows(ids)
+        known = rows >= 0
+        if not known.any():
+            logger.warning("Backtest: aucun projet étiqueté trouvé dans l'historique")
+            return {}
+        expected = np.array([outcome for _, _, outcome in labels], dtype=np.uint8)[known]
+        block = history.ratios[rows[known]]
+        codes = self._codes(w @ block.T)                                    # (C, étiquetés)
+        base_codes = self._codes(block @ (self.base * 100).astype(np.float32))[None, :]
+        good, bad = expected == 2, expected == 0
+
+        def label_metrics(pred: "np.ndarray") -> Dict[str, "np.ndarray"]:
+            is_go = pred == 2
+            n_go = is_go.sum(axis=1)
+            return {
+                "agreement": (pred == expected).mean(axis=1),
+                # Part des GO qui sont de bons projets, part des mauvais projets jamais passés en GO
+                "go_precision": (is_go & good).sum(axis=1) / np.maximum(n_go, 1),
+                "bad_not_go": (~is_go & bad).sum(axis=1) / max(int(bad.sum()), 1),
+            }
+
+        baseline = {k: round(float(v[0]), 4) for k, v in label_metrics(base_codes).items()}
+        return {"labeled": int(known.sum()), "labels_missing": int((~known).sum()),
+                "label_metrics": label_metrics(codes), "baseline_labels": baseline}
+
+
+def summarize(result: Dict, candidates: "np.ndarray", top: int = 10) -> List[Dict]:
+    """Meilleurs candidats : accord avec les étiquettes, puis moins de verdicts changés."""
+    label_metrics = result.get("label_metrics")
+    if label_metrics is not None:
+        order = np.lexsort((result["changed"], -label_metrics["go_precision"], -label_metrics["agreement"]))
+    else:
+        order = np.argsort(result["changed"], kind="stable")
+    rows = []
+    for i in order[:top]:
+        entry = {"candidate": int(i), "weights": {k: round(float(w), 4) for k, w in zip(RATIO_COLUMNS, candidates[i])},
+                 "distribution": dict(zip(VERDICTS, result["distribution"][i].tolist())),
+                 "changed": int(result["changed"][i])}
+        if label_metrics is not None:
+            entry.update({k: round(float(v[i]), 4) for k, v in label_metrics.items()})
+        rows.append(entry)
+    return rows
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark du criblage anti-scam d'un lot d'adresses, entièrement hors ligne (mock_upstream).
+
+Deux façons de vérifier N adresses de contrat, cache vide à chaque fois :
+  - v6.0 : check_address par paquets de `--in-flight` adresses (asyncio.gather), sans limites
+    par fournisseur ni liste complète : chaque paquet attend son fournisseur le plus lent ;
+  - check_addresses : flux, limites par fournisseur, liste CryptoScamDB en une requête.
+
+Un fournisseur peut être ralenti (--slow-provider, --slow-ms) ou en panne (--down-provider).
+Mesures : durée totale, délai avant le premier résultat, délai médian d'obtention d'un
+résultat, adresses où un fournisseur a été ignoré, statistiques par fournisseur.
+
+    python benchmarks/bench_antiscam.py
+    python benchmarks/bench_antiscam.py --addresses 5000 --slow-provider rugdoc --slow-ms 3000 --down-provider tokensniffer
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from antiscam_api import AntiScamAPI  # noqa: E402
+from mock_upstream import Behaviour, GROUPS, MockConfig, MockUpstream, project_contract, split_projects  # noqa: E402
+
+PROVIDERS = ("cryptoscamdb", "tokensniffer", "honeypot", "rugdoc")
+
+
+def make_api(urls, limits, max_wait: float, in_flight: int) -> AntiScamAPI:
+    api = AntiScamAPI(provider_limits=limits, max_wait=max_wait, max_in_flight=in_flight)
+    api.databases.update({k: urls[k] for k in (*PROVIDERS, "cryptoscamdb_list")})
+    return api
+
+
+async def legacy_screen(api: AntiScamAPI, addresses, in_flight: int):
+    """Paquets de check_address : un résultat n'est disponible qu'à la fin de son paquet."""
+    started, times, flagged = time.perf_counter(), [], 0
+    for i in range(0, len(addresses), in_flight):
+        results = await asyncio.gather(*(api.check_address(a) for a in addresses[i:i + in_flight]))
+        elapsed = time.perf_counter() - started
+        times.extend([elapsed] * len(results))
+        flagged += sum(r['is_scam'] for r in results)
+    return times, flagged, 0
+
+
+async def stream_screen(api: AntiScamAPI, addresses, in_flight: int):
+    started, times, flagged, skipped = time.perf_counter(), [], 0, 0
+    async for _, result in api.check_addresses(addresses, max_in_flight=in_flight):
+        times.append(time.perf_counter() - started)
+        flagged += result['is_scam']
+        skipped += bool(result['skipped'])
+    return times, flagged, skipped
+
+
+async def run(args):
+    config = MockConfig(projects=args.addresses, behaviours={g: Behaviour(latency_ms=args.latency_ms) for g in GROUPS})
+    if args.slow_provider:
+        config.route_behaviours[args.slow_provider] = Behaviour(latency_ms=args.slow_ms)
+    if args.down_provider:
+        config.route_behaviours[args.down_provider] = Behaviour(latency_ms=args.latency_ms, error_rate=1.0)
+    mock = MockUpstream(config)
+    await mock.start()
+    urls = mock.urls()
+    addresses = [project_contract(source, i) for source, n in split_projects(args.addresses).items() for i in range(n)]
+
+    # v6.0 : aucune limite par fournisseur (débit illimité, concurrence = paquet entier, jamais ignoré)
+    unlimited = {p: {"rate": 0, "concurrency": args.in_flight, "bulk": False} for p in PROVIDERS}
+    limited = {p: {"rate": args.rate, "burst": args.rate, "concurrency": args.concurrency, "bulk": p == "cryptoscamdb"}
+               for p in PROVIDERS}
+    results = {}
+    for name, limits, screen in (("legacy", unlimited, legacy_screen), ("check_addresses", limited, stream_screen)):
+        api = make_api(urls, limits, args.max_wait if name != "legacy" else 3600, args.in_flight)
+        mock.reset_counters()
+        started = time.perf_counter()
+        times, flagged, skipped = await screen(api, addresses, args.in_flight)
+        total = time.perf_counter() - started
+        await api.close()
+        results[name] = {"total_s": round(total, 3), "addresses_per_s": round(len(addresses) / total, 1),
+                         "first_result_s": round(min(times), 3), "median_result_s": round(statistics.median(times), 3),
+                         "flagged": flagged, "with_skipped_provider": skipped,
+                         "upstream_requests": {route: c["requests"] for route, c in mock.counters.items()},
+                         "providers": api.provider_stats()}
+    await mock.close()
+    return addresses, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du criblage anti-scam par lot")
+    parser.add_argument('--addresses', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='Latence des fournisseurs')
+    parser.add_argument('--slow-provider', default="rugdoc", choices=[*PROVIDERS, ""])
+    parser.add_argument('--slow-ms', type=float, default=1500.0)
+    parser.add_argument('--down-provider', default="", choices=[*PROVIDERS, ""])
+    parser.add_argument('--in-flight', type=int, default=100, help='Adresses en cours simultanément')
+    parser.add_argument('--rate', type=float, default=400.0, help='Requêtes/s par fournisseur (check_addresses)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Requêtes simultanées par fournisseur')
+    parser.add_argument('--max-wait', type=float, default=2.0, help='antiscam.max_wait pour check_addresses')
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/antiscam_<date>.json)')
+    args = parser.parse_args()
+
+    addresses, results = asyncio.run(run(args))
+    for name, r in results.items():
+        print(f"[bench_antiscam] {name:<16} {r['total_s']:7.2f}s ({r['addresses_per_s']:.0f} adresses/s), "
+              f"1er résultat {r['first_result_s']:.2f}s, médiane {r['median_result_s']:.2f}s, "
+              f"{r['flagged']} signalées, {r['with_skipped_provider']} avec un fournisseur ignoré")
+        for provider, stats in r["providers"].items():
+            print(f"[bench_antiscam]   {provider:<13} {stats['requests']:6d} requêtes, {stats['errors']} erreurs, "
+                  f"{stats['skipped']} ignorées, {stats['fast_failed']} circuit, p95 {stats['latency']['p95_s']:.3f}s")
+
+    started = datetime.now(timezone.utc)
+    report = {"benchmark": "antiscam", "timestamp": started.isoformat(timespec="seconds"),
+              "params": {k: v for k, v in vars(args).items() if k != "output"}, "results": results}
+    output = args.output or os.path.join(BENCH_DIR, "results", f"antiscam_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_antiscam] Rapport: {output}")
+
+
+if __name__ == "__main__":
+    main()
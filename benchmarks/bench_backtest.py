@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark du backtest hors ligne (--backtest) sur un historique synthétique.
+
+Construit (ou réutilise) une base de N projets x K snapshots de ratios, puis mesure :
+  - le chargement de la table ratios en matrice float32 (load_history), depuis SQLite puis
+    depuis le cache .npz ;
+  - l'évaluation de C candidats par blocs matriciels (Backtester.evaluate), étiquettes comprises ;
+  - la référence naïve, un produit et trois comparaisons par candidat, mesurée sur quelques
+    candidats et extrapolée à C.
+
+    python benchmarks/bench_backtest.py                               # 25 000 x 40 = 1 M lignes, 2 000 candidats
+    python benchmarks/bench_backtest.py --candidates 5000 --db /tmp/backtest.db
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+import yaml  # noqa: E402
+
+from backtest import Backtester, load_history, load_labels, sample_candidates  # noqa: E402
+from bench_queries import create_schema, populate  # noqa: E402
+
+
+def write_labels(path: str, projects: int, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "source", "outcome"])
+        for i in rng.sample(range(projects), min(count, projects)):
+            writer.writerow([f"Project {i}", ("Binance", "CoinList", "Polkastarter")[i % 3],
+                             rng.choice(["good", "bad", "review"])])
+
+
+def naive_seconds(backtester: Backtester, ratios: np.ndarray, candidates: np.ndarray) -> float:
+    """Une passe complète par candidat (score, codes, comparaison aux poids actuels)."""
+    base_codes = backtester._codes(ratios @ (backtester.base * 100).astype(np.float32))
+    started = time.perf_counter()
+    for w in candidates:
+        codes = backtester._codes(ratios @ (w * 100).astype(np.float32))
+        np.bincount(codes, minlength=3)
+        np.count_nonzero(codes != base_codes)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du backtest des poids sur l'historique des ratios")
+    parser.add_argument('--config', default=os.path.join(REPO_ROOT, "config.yml"))
+    parser.add_argument('--projects', type=int, default=25000)
+    parser.add_argument('--snapshots', type=int, default=40, help='Lignes de ratios par projet')
+    parser.add_argument('--candidates', type=int, default=2000)
+    parser.add_argument('--labels', type=int, default=2000, help='Projets étiquetés (synthétiques)')
+    parser.add_argument('--naive-sample', type=int, default=20, help='Candidats mesurés pour la référence naïve')
+    parser.add_argument('--db', help='Base à créer/réutiliser (défaut: fichier temporaire supprimé à la fin)')
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/backtest_<date>.json)')
+    args = parser.parse_args()
+
+    with open(args.config, encoding='utf-8') as f:
+        settings = yaml.safe_load(f) or {}
+    weights = {k: float(w) for k, w in settings.get('ratios', {}).get('weights', {}).items()}
+    decision = settings.get('decision', {})
+    cfg = settings.get('backtest', {})
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_backtest_")
+    db_path = args.db or os.path.join(tmp_dir, "quantum.db")
+    if not os.path.exists(db_path):
+        started = time.perf_counter()
+        asyncio.run(create_schema(db_path))
+        populate(db_path, args.projects, args.snapshots)
+        print(f"[bench_backtest] Base générée en {time.perf_counter() - started:.0f}s: {db_path}")
+    labels_path = os.path.join(tmp_dir, "labels.csv")
+    write_labels(labels_path, args.projects, args.labels)
+
+    started = time.perf_counter()
+    history = load_history(db_path, cache_dir=tmp_dir)
+    load_s = time.perf_counter() - started
+    started = time.perf_counter()
+    load_history(db_path, cache_dir=tmp_dir)
+    cached_load_s = time.perf_counter() - started
+    labels = load_labels(labels_path)
+
+    backtester = Backtester(weights, decision.get('go_score', 70), decision.get('review_score', 40),
+                            block_elements=int(cfg.get('block_elements', 2_000_000)))
+    candidates = sample_candidates(backtester.base, args.candidates, float(cfg.get('concentration', 50)), seed=42)
+    result = backtester.evaluate(history, candidates, labels)
+    sample = min(args.naive_sample, len(candidates))
+    naive_s = naive_seconds(backtester, history.ratios, candidates[:sample]) * len(candidates) / max(sample, 1)
+
+    rows, evaluate_s = result["rows"], result["elapsed_s"]
+    print(f"[bench_backtest] {rows} lignes chargées en {load_s:.2f}s "
+          f"({history.ratios.nbytes / 1024 / 1024:.0f} Mo en float32), {cached_load_s:.2f}s depuis le cache")
+    print(f"[bench_backtest] {len(candidates)} candidats: {evaluate_s:.2f}s "
+          f"({rows * len(candidates) / evaluate_s / 1e6:.0f} M scores/s), "
+          f"naïf extrapolé {naive_s:.2f}s (x{naive_s / evaluate_s:.1f})")
+    print(f"[bench_backtest] {result.get('labeled', 0)} projets étiquetés, "
+          f"poids actuels {result['baseline']['distribution']}")
+
+    started = datetime.now(timezone.utc)
+    report = {"benchmark": "backtest", "timestamp": started.isoformat(timespec="seconds"),
+              "params": {"projects": args.projects, "snapshots": args.snapshots, "candidates": len(candidates),
+                         "labels": args.labels, "block_elements": backtester.block_elements},
+              "results": {"rows": rows, "load_s": round(load_s, 3), "cached_load_s": round(cached_load_s, 3),
+                          "evaluate_s": round(evaluate_s, 3),
+                          "scores_per_s": round(rows * len(candidates) / evaluate_s),
+                          "naive_extrapolated_s": round(naive_s, 3), "naive_sample": sample,
+                          "labeled": result.get('labeled', 0),
+                          "baseline": result['baseline']['distribution']}}
+    output = args.output or os.path.join(BENCH_DIR, "results", f"backtest_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    if not args.db:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    for name in os.listdir(tmp_dir):
+        if name.endswith(('.csv', '.npz')):
+            os.remove(os.path.join(tmp_dir, name))
+    print(f"[bench_backtest] Rapport: {output}")
+
+
+if __name__ == "__main__":
+    main()
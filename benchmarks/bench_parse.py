@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Benchmark du parsing HTML des launchpads (scraping.py) sur des pages fixtures.
+
+Pour chaque source active de `scraping.sources` (config.yml), la page `<source>.html`
+du répertoire de fixtures est utilisée telle quelle (page réelle sauvegardée) ; à défaut
+une page synthétique respectant les sélecteurs de la source y est générée et sauvegardée.
+Sans source active (config livrée), `--pages` sources synthétiques sont mesurées.
+
+Mesures :
+  - parse_listing en direct : temps par page (coût CPU pur, bs4 + lxml) ;
+  - toutes les pages en parallèle via HtmlScraper, en pool de processus et en thread,
+    et en direct dans la boucle : durée totale et blocage maximal de la boucle d'événements.
+
+    python benchmarks/bench_parse.py                               # 200 cartes par page synthétique
+    python benchmarks/bench_parse.py --items 1000 --processes 4 --rounds 5
+    python benchmarks/bench_parse.py --fixtures pages_sauvegardees/  # <source>.html des sources actives
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from html import escape
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import yaml  # noqa: E402
+
+from scraping import HtmlScraper, ScrapeSpec, parse_listing  # noqa: E402
+
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)$")
+
+
+def _element(selector: str, content: str, default_tag: str = "div") -> str:
+    """Balise satisfaisant un sélecteur simple (`tag.classe.classe`) ; le reste n'est pas généré."""
+    css, _, attr = selector.partition("@")
+    match = _SIMPLE_SELECTOR.match(css)
+    if not match:
+        raise ValueError(f"Sélecteur non générable: {selector!r} (fournir une page sauvegardée)")
+    tag = match.group(1) or default_tag
+    classes = match.group(2).replace(".", " ").strip()
+    attrs = f' class="{classes}"' if classes else ""
+    if attr:
+        return f'<{tag}{attrs} {attr}="{escape(content)}">lien</{tag}>'
+    return f"<{tag}{attrs}>{escape(content)}</{tag}>"
+
+
+def synthetic_specs(n: int) -> List[ScrapeSpec]:
+    """Sources fictives (sélecteurs inventés) pour mesurer le parsing sans source configurée."""
+    return [ScrapeSpec(f"synthetic_{i}", f"Synthetic {i}", f"https://launchpad-{i}.example.com/pools",
+                       f".card-{i}", {"name": f".title-{i}", "symbol": f".symbol-{i}", "link": "a@href",
+                                      "hard_cap_usd": f".raise-{i}"}, "BSC")
+            for i in range(n)]
+
+
+def fixture_page(spec: ScrapeSpec, items: int, seed: int = 7) -> str:
+    """Page synthétique : en-tête, scripts et menus parasites, puis `items` cartes projet."""
+    rng = random.Random(f"{seed}:{spec.key}")
+    filler = "".join(f'<li class="nav-item"><a href="/section/{i}">Section {i}</a></li>' for i in range(60))
+    script = "<script>window.__STATE__ = " + json.dumps({"k": "x" * 20000}) + ";</script>"
+    cards = []
+    for i in range(items):
+        values = {"name": f"{spec.name} Project {i}", "symbol": f"TK{i}", "link": f"/project/{i}",
+                  "website": f"https://{spec.key}-project-{i}.io", "hard_cap_usd": f"${rng.randint(50, 5000) * 1000:,}"}
+        inner = "".join(_element(selector, values.get(k, f"{k} {i}"), "span") for k, selector in spec.fields.items()
+                        if selector.partition("@")[0])
+        card = _element(spec.item, "", "div").replace("></", f">{inner}<div class=\"card-footer\">Ends in {i % 24}h</div></", 1)
+        cards.append(card)
+    return (f"<!DOCTYPE html><html><head><title>{escape(spec.name)}</title>{script}</head><body>"
+            f"<nav><ul>{filler}</ul></nav><main>{''.join(cards)}</main><footer>{filler}</footer></body></html>")
+
+
+def load_pages(specs: List[ScrapeSpec], fixtures: str, items: int) -> Dict[str, str]:
+    os.makedirs(fixtures, exist_ok=True)
+    pages = {}
+    for spec in specs:
+        path = os.path.join(fixtures, f"{spec.key}.html")
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(fixture_page(spec, items))
+        with open(path, encoding='utf-8') as f:
+            pages[spec.key] = f.read()
+    return pages
+
+
+def direct_parse(specs: List[ScrapeSpec], pages: Dict[str, str], rounds: int) -> Dict[str, Dict]:
+    results = {}
+    for spec in specs:
+        samples, count = [], 0
+        for _ in range(rounds):
+            started = time.perf_counter()
+            count = len(parse_listing(pages[spec.key], spec))
+            samples.append((time.perf_counter() - started) * 1000)
+        results[spec.key] = {"bytes": len(pages[spec.key]), "projects": count,
+                             "median_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2)}
+    return results
+
+
+async def _loop_stall(stop: asyncio.Event, tick: float = 0.005) -> float:
+    """Retard maximal observé d'un réveil programmé toutes les `tick` secondes."""
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + tick
+        await asyncio.sleep(tick)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst
+
+
+async def concurrent_parse(specs: List[ScrapeSpec], pages: Dict[str, str], rounds: int, mode: str,
+                           processes: int, max_pending: int) -> Dict:
+    """Toutes les pages `rounds` fois en parallèle ; mode 'process', 'thread' ou 'inline'."""
+    scraper = HtmlScraper(processes=processes if mode == "process" else 0, max_pending=max_pending,
+                          max_page_bytes=1 << 40, parse_timeout=600)
+    try:
+        if mode != "inline":
+            # Démarrage du pool hors mesure (spawn des workers, import de bs4/lxml)
+            await asyncio.gather(*(scraper.parse(pages[s.key], s) for s in specs[:max(1, processes)]))
+
+        async def parse(spec):
+            if mode == "inline":
+                return parse_listing(pages[spec.key], spec)
+            return await scraper.parse(pages[spec.key], spec)
+
+        stop = asyncio.Event()
+        stall = asyncio.create_task(_loop_stall(stop))
+        await asyncio.sleep(0.02)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(parse(s) for _ in range(rounds) for s in specs))
+        total_s = time.perf_counter() - started
+        stop.set()
+        worst = await stall
+    finally:
+        scraper.close()
+    return {"pages": len(results), "projects": sum(len(r) for r in results), "total_s": round(total_s, 3),
+            "pages_per_s": round(len(results) / total_s, 1), "max_loop_stall_ms": round(worst * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du parsing HTML des launchpads")
+    parser.add_argument('--config', default=os.path.join(REPO_ROOT, "config.yml"))
+    parser.add_argument('--fixtures', default=os.path.join(BENCH_DIR, "results", "fixtures"),
+                        help='Pages <source>.html (générées si absentes)')
+    parser.add_argument('--items', type=int, default=200, help='Cartes projet par page synthétique')
+    parser.add_argument('--pages', type=int, default=12, help='Sources synthétiques si aucune source active')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--max-pending', type=int, default=4)
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/parse_<date>.json)')
+    args = parser.parse_args()
+
+    with open(args.config, encoding='utf-8') as f:
+        specs = HtmlScraper.from_settings(yaml.safe_load(f) or {}).specs
+    if not specs:
+        print(f"[bench_parse] Aucune source active dans scraping.sources : {args.pages} sources synthétiques")
+        specs = synthetic_specs(args.pages)
+    pages = load_pages(specs, args.fixtures, args.items)
+
+    direct = direct_parse(specs, pages, args.rounds)
+    for key, r in direct.items():
+        print(f"[bench_parse] {key:<14} {r['bytes'] / 1024:7.0f} Ko  {r['projects']:5d} projets  "
+              f"{r['median_ms']:8.2f} ms/page")
+    modes = {}
+    for mode in ("process", "thread", "inline"):
+        modes[mode] = asyncio.run(concurrent_parse(specs, pages, args.rounds, mode, args.processes, args.max_pending))
+        r = modes[mode]
+        print(f"[bench_parse] {mode:<8} {r['pages']} pages en {r['total_s']:.2f}s ({r['pages_per_s']} pages/s), "
+              f"boucle bloquée jusqu'à {r['max_loop_stall_ms']} ms")
+
+    started = datetime.now(timezone.utc)
+    report = {"benchmark": "parse", "timestamp": started.isoformat(timespec="seconds"),
+              "params": {k: getattr(args, k) for k in ("items", "pages", "rounds", "processes", "max_pending")},
+              "fixtures": args.fixtures, "pages": direct, "concurrent": modes}
+    output = args.output or os.path.join(BENCH_DIR, "results", f"parse_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_parse] Rapport: {output}")
+
+
+if __name__ == "__main__":
+    main()
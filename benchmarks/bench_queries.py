@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark des requêtes d'historique de ProjectStore sur une grosse base synthétique.
+
+Construit (ou réutilise) une base de N projets x K snapshots de ratios, puis mesure
+chaque requête de l'API (latest_verdict, latest_verdicts, score_history, top_projects)
+via aiosqlite et en sqlite3 brut, avec le plan d'exécution (doit utiliser un index).
+
+    python benchmarks/bench_queries.py                               # 50 000 x 40 = 2 M lignes de ratios
+    python benchmarks/bench_queries.py --projects 100000 --snapshots 30 --db /tmp/big.db
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from persistence import RATIO_COLUMNS, ProjectStore  # noqa: E402
+
+VERDICTS = ("GO", "REVIEW", "REJECT")
+
+
+async def create_schema(db_path: str):
+    store = ProjectStore(db_path)
+    await store.open()
+    await store.close()
+
+
+def populate(db_path: str, projects: int, snapshots: int, seed: int = 7):
+    """Remplissage direct en sqlite3 (bien plus rapide que le chemin applicatif pour des millions de lignes)."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    start = datetime(2024, 1, 1)
+    conn.executemany(
+        "INSERT INTO projects (name, source, verdict, score, reason, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+        ((f"Project {i}", ("Binance", "CoinList", "Polkastarter")[i % 3], rng.choice(VERDICTS),
+          rng.uniform(0, 100), "bench", (start + timedelta(minutes=i)).strftime('%Y-%m-%d %H:%M:%S'))
+         for i in range(projects)))
+    ratio_sql = (f"INSERT INTO ratios (project_id, {', '.join(RATIO_COLUMNS)}, score, created_at) "
+                 f"VALUES (?, {', '.join('?' * len(RATIO_COLUMNS))}, ?, ?)")
+    # Une ligne par projet et par scan, dans l'ordre d'écriture réel (scan après scan)
+    for k in range(snapshots):
+        when = (start + timedelta(hours=6 * k)).strftime('%Y-%m-%d %H:%M:%S')
+        conn.executemany(ratio_sql, ((pid, *[rng.random() for _ in RATIO_COLUMNS], rng.uniform(0, 100), when)
+                                     for pid in range(1, projects + 1)))
+        conn.commit()
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(samples), 4), "max_ms": round(max(samples), 4)}
+
+
+async def atimed(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": round(statistics.median(samples), 4), "max_ms": round(max(samples), 4)}
+
+
+async def run_queries(db_path: str, projects: int, repeat: int) -> dict:
+    rng = random.Random(1)
+    names = [(f"Project {i}", ("Binance", "CoinList", "Polkastarter")[i % 3]) for i in range(projects)]
+    pick = lambda: rng.choice(names)  # noqa: E731
+
+    # Requêtes SQL brutes (coût propre à SQLite) + plans d'exécution
+    raw = sqlite3.connect(db_path)
+    raw_queries = {
+        "latest_verdict": ("SELECT name, source, verdict, score FROM projects WHERE name = ? AND source = ?", lambda: pick()),
+        "latest_verdicts": ("SELECT name, source, verdict, score FROM projects WHERE verdict = ? ORDER BY updated_at DESC LIMIT 100",
+                            lambda: ("GO",)),
+        "score_history": ("SELECT r.created_at, r.score FROM ratios r WHERE r.project_id = "
+                          "(SELECT id FROM projects WHERE name = ? AND source = ?) ORDER BY r.created_at DESC, r.id DESC LIMIT -1",
+                          lambda: pick()),
+        "top_projects": ("SELECT name, source, verdict, score FROM projects ORDER BY score DESC LIMIT 10", lambda: ()),
+        "top_projects_go": ("SELECT name, source, verdict, score FROM projects WHERE verdict = 'GO' ORDER BY score DESC LIMIT 10",
+                            lambda: ()),
+    }
+    results = {}
+    for name, (sql, params) in raw_queries.items():
+        plan = [row[3] for row in raw.execute(f"EXPLAIN QUERY PLAN {sql}", params())]
+        results[name] = {"sqlite3": timed(lambda: raw.execute(sql, params()).fetchall(), repeat), "plan": plan}
+    raw.close()
+
+    # Même chose via l'API asynchrone (aller-retour aiosqlite compris)
+    store = ProjectStore(db_path)
+    await store.open()
+    try:
+        api = {
+            "latest_verdict": lambda: store.latest_verdict(*pick()),
+            "latest_verdicts": lambda: store.latest_verdicts(verdict="GO"),
+            "score_history": lambda: store.score_history(*pick()),
+            "top_projects": lambda: store.top_projects(10),
+            "top_projects_go": lambda: store.top_projects(10, verdict="GO"),
+        }
+        for name, fn in api.items():
+            results[name]["api"] = await atimed(fn, repeat)
+    finally:
+        await store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des requêtes d'historique de quantum.db")
+    parser.add_argument('--projects', type=int, default=50000)
+    parser.add_argument('--snapshots', type=int, default=40, help='Lignes de ratios par projet')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--db', help='Base à créer/réutiliser (défaut: fichier temporaire supprimé à la fin)')
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/queries_<date>.json)')
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="bench_queries_"), "quantum.db")
+    if not os.path.exists(db_path):
+        started = time.perf_counter()
+        asyncio.run(create_schema(db_path))
+        populate(db_path, args.projects, args.snapshots)
+        print(f"[bench_queries] Base générée en {time.perf_counter() - started:.0f}s: {db_path}")
+
+    results = asyncio.run(run_queries(db_path, args.projects, args.repeat))
+    with sqlite3.connect(db_path) as conn:
+        ratio_rows = conn.execute("SELECT COUNT(*) FROM ratios").fetchone()[0]
+    for name, r in results.items():
+        print(f"[bench_queries] {name:<16} sqlite3 {r['sqlite3']['median_ms']:.3f} ms | "
+              f"API {r['api']['median_ms']:.3f} ms | {'; '.join(r['plan'])}")
+
+    started = datetime.now(timezone.utc)
+    report = {"benchmark": "queries", "timestamp": started.isoformat(timespec="seconds"),
+              "projects": args.projects, "ratio_rows": ratio_rows,
+              "db_size_mb": round(os.path.getsize(db_path) / 1024 / 1024, 1), "queries": results}
+    output = args.output or os.path.join(BENCH_DIR, "results", f"queries_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    if not args.db:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    print(f"[bench_queries] Rapport: {output}")
+
+
+if __name__ == "__main__":
+    main()
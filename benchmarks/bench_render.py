@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark du rendu des alertes Telegram : implémentation v6.0 (esc() à 12 str.replace,
+tri complet des ratios à chaque message) contre alert_renderer (gabarit préparé, str.translate).
+
+Mesures sur N projets synthétiques (champs avec caractères réservés, 21 ratios) :
+  - échappement seul : esc() contre escape_md() ;
+  - alerte complète : rendu v6.0 contre AlertRenderer.alert ;
+  - digest : AlertRenderer.digest_entry + pack_digest, et nombre de messages Telegram
+    (un par projet avant, paquets de max_message_length en digest).
+
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --projects 5000 --rounds 10
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+import yaml  # noqa: E402
+
+from alert_renderer import AlertRenderer, escape_md, pack_digest  # noqa: E402
+
+
+# ============================================================================
+# Référence : rendu de QuantumScanner.send_telegram v6.0
+# ============================================================================
+
+def legacy_esc(t):
+    return str(t).replace('.', '\\.').replace('-', '\\-').replace('!', '\\!').replace('(', '\\(').replace(')', '\\)').replace('=', '\\=').replace('+', '\\+').replace('|', '\\|').replace('[', '\\[').replace(']', '\\]').replace('{', '\\{').replace('}', '\\}')
+
+
+def legacy_render(project: Dict, analysis: Dict, weights: Dict[str, float]) -> str:
+    esc = legacy_esc
+    verdict = analysis['verdict']
+    ratios = analysis['ratios']
+    weighted_ratios = {k: v * weights.get(k, 0) for k, v in ratios.items()}
+    top_5 = sorted(weighted_ratios.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_str = "\n".join([f"• {esc(k)}: {ratios.get(k)*100:.0f}% \\(Poids: {weights.get(k)*100:.0f}\\%\\)" for k, w in top_5])
+    return f"""
+\U0001F30C *QUANTUM SCAN \\- {esc(project.get('name', 'N/A'))} \\({esc(project.get('symbol', 'N/A'))}\\)*
+
+\U0001F4CA *SCORE: {analysis['score']:.1f}/100* \\| \U0001F3AF *VERDICT:* {esc(verdict)}
+\U0001F680 *PHASE: ICO/IDO/PRE\\-TGE*
+
+---
+
+\U0001F4B0 *FINANCIERS*
+• Hard Cap: {esc(f"{project.get('hard_cap_usd', 0):,.0f}")} €
+• MC Estimé: {esc(f"{project.get('mc', 0):,.0f}")} €
+• Potentiel: x{esc(f"{analysis['score'] / 50:.1f}")}
+
+---
+
+\U0001F3AF *TOP 5 RATIOS*
+{esc(top_str)}
+
+---
+
+\U0001F6E1 *SÉCURITÉ*
+• Audit: {esc(project.get('audit_firm', 'Absent'))}
+• Domain Age: {esc(project.get('domain_age_days', 0))} jours
+
+---
+
+\U000026A0️ *RED FLAGS:* {esc(", ".join(analysis.get('flags', [])) or "Aucun ✅")}
+
+---
+
+\U0001F517 *LIENS*
+\\[Launchpad]({esc(project.get('link', ''))}) | \\[Site]({esc(project.get('website', ''))})
+
+\\_ID: {esc(str(time.time()))} \\| {esc(datetime.now().strftime('%Y-%m-%d %H:%M'))}\\_
+"""
+
+
+# ============================================================================
+# Données et mesures
+# ============================================================================
+
+def synthetic_alerts(n: int, weights: Dict[str, float], seed: int = 7) -> List[Tuple[Dict, Dict]]:
+    rng = random.Random(seed)
+    flags = ["LOW_LIQUIDITY", "NO_AUDIT", "DOMAIN_TOO_YOUNG", "owner>30%", "honeypot?"]
+    alerts = []
+    for i in range(n):
+        project = {"name": f"Project-{i} (v{i % 3}.0)!", "symbol": f"PRJ_{i}", "source": rng.choice(["Binance", "CoinList", "Polkastarter"]),
+                   "link": f"https://launchpad.example/view/{i}", "website": f"https://project-{i}.io",
+                   "hard_cap_usd": rng.uniform(5e4, 5e6), "mc": rng.uniform(1e4, 2e5),
+                   "audit_firm": rng.choice(["CertiK", "PeckShield", "Absent"]), "domain_age_days": rng.randint(1, 900)}
+        analysis = {"verdict": rng.choice(["GO", "REVIEW"]), "score": rng.uniform(40, 95),
+                    "flags": rng.sample(flags, rng.randint(0, 3)),
+                    "ratios": {k: rng.random() for k in weights}}
+        alerts.append((project, analysis))
+    return alerts
+
+
+def timed(fn: Callable[[], object], rounds: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {"median_s": round(statistics.median(samples), 6), "min_s": round(min(samples), 6)}
+
+
+def digest_messages(entries: List[str], max_length: int) -> List[str]:
+    messages, rest = [], entries
+    while rest:
+        text, taken = pack_digest(rest, max_length)
+        messages.append(text)
+        rest = rest[taken:]
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du rendu MarkdownV2 des alertes Telegram")
+    parser.add_argument('--config', default=os.path.join(REPO_ROOT, "config.yml"))
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/render_<date>.json)')
+    args = parser.parse_args()
+
+    with open(args.config, encoding='utf-8') as f:
+        settings = yaml.safe_load(f) or {}
+    weights = {k: float(w) for k, w in settings.get('ratios', {}).get('weights', {}).items()}
+    max_length = settings.get('telegram', {}).get('max_message_length', 4096)
+    alerts = synthetic_alerts(args.projects, weights)
+    renderer = AlertRenderer(weights)
+    fields = [str(p[k]) for p, _ in alerts for k in ("name", "symbol", "link", "website")]
+
+    results = {
+        "escape": {"legacy_esc": timed(lambda: [legacy_esc(v) for v in fields], args.rounds),
+                   "escape_md": timed(lambda: [escape_md(v) for v in fields], args.rounds)},
+        "alert": {"legacy": timed(lambda: [legacy_render(p, a, weights) for p, a in alerts], args.rounds),
+                  "renderer": timed(lambda: [renderer.alert(p, a) for p, a in alerts], args.rounds)},
+        "digest": timed(lambda: digest_messages([renderer.digest_entry(p, a) for p, a in alerts], max_length),
+                        args.rounds),
+    }
+    messages = digest_messages([renderer.digest_entry(p, a) for p, a in alerts], max_length)
+    results["messages"] = {"per_project": len(alerts), "digest": len(messages),
+                           "max_digest_length": max(len(m.encode("utf-16-le")) // 2 for m in messages)}
+
+    # Débits affichés sur le meilleur tour (moins sensible au bruit de la machine), médianes dans le rapport
+    per_s = lambda r: round(args.projects / r["min_s"]) if r["min_s"] else 0  # noqa: E731
+    for name, r in results["escape"].items():
+        print(f"[bench_render] {name:<10} {len(fields) / r['min_s']:12.0f} champs/s")
+    for name, r in results["alert"].items():
+        print(f"[bench_render] alerte {name:<9} {per_s(r):10d} alertes/s")
+    print(f"[bench_render] digest          {per_s(results['digest']):10d} projets/s, "
+          f"{results['messages']['digest']} messages au lieu de {results['messages']['per_project']}")
+
+    started = datetime.now(timezone.utc)
+    report = {"benchmark": "render", "timestamp": started.isoformat(timespec="seconds"),
+              "params": {"projects": args.projects, "rounds": args.rounds, "max_message_length": max_length},
+              "results": results}
+    output = args.output or os.path.join(BENCH_DIR, "results", f"render_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_render] Rapport: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmark bout en bout de QuantumScanner.scan, entièrement hors ligne.
+
+Le processus parent démarre benchmarks/mock_upstream.py (launchpads, liste phishing,
+bases anti-scam, Telegram, nœud JSON-RPC) puis lance un sous-processus par taille de scan, dans un
+répertoire temporaire (quantum.db, cache/ et logs/ neufs, RSS mesuré proprement).
+Le WHOIS est remplacé par une résolution synthétique avec latence configurable.
+
+Rapport JSON (benchmarks/results/) : projets/s, latence par projet p50/p95/p99
+(soumission au pipeline -> fin de l'étage notify), RSS max, taille de la base,
+compteurs du scanner et requêtes servies par le mock.
+
+Usage :
+    python benchmarks/bench_scan.py                       # 10 / 1000 / 50000 projets
+    python benchmarks/bench_scan.py --sizes 10,1000 --latency-ms 30 --rate-429 0.02
+    python benchmarks/bench_scan.py --sizes 1000 --workers 4                 # scan réparti (file de jobs)
+    python benchmarks/bench_scan.py --sizes 1000 --http-cache   # + second scan à chaud (304 sur les launchpads)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from mock_upstream import (GROUPS, MockConfig, MockUpstream, add_behaviour_arguments, behaviour_from_args,
+                           project_contract, project_pair, project_website)
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+# ============================================================================
+# SOUS-PROCESSUS : un scan complet contre le mock
+# ============================================================================
+
+def run_child(args):
+    os.chdir(args.workdir)
+    sys.path.insert(0, REPO_ROOT)
+    urls = json.loads(args.urls)
+
+    import main
+    from loguru import logger
+    from onchain import OnChainEnricher
+    from whois_cache import domain_age_resolver
+    from phishing_blacklist import phishing_blacklist
+
+    logger.remove(0)  # console : avertissements seulement, le fichier de log reste comme en production
+    logger.add(sys.stderr, level="WARNING")
+
+    main.BINANCE_LAUNCHPAD_URL = urls["binance"]
+    main.COINLIST_SALES_URL = urls["coinlist"]
+    main.POLKASTARTER_GRAPHQL_URL = urls["polkastarter"]
+    # Hôte distinct (localhost) pour appliquer au mock le quota configuré d'api.ethplorer.io
+    main.TOP_HOLDERS_URL = urls["holders"].replace("127.0.0.1", "localhost", 1)
+    phishing_blacklist.url = urls["phishing"]
+    main.CONFIG.update({"TELEGRAM_BOT_TOKEN": "bench", "TELEGRAM_CHAT_ID": "1001", "TELEGRAM_CHAT_REVIEW": "1002"})
+    # Toutes les API réelles sont des hôtes distincts ; ici elles partagent 127.0.0.1:port
+    mock_host = main.host_limiter.host_of(urls["binance"])
+    main.host_limiter.host_limits[mock_host] = {"rate": float('inf'), "burst": 1}
+    main.host_limiter.host_limits[main.host_limiter.host_of(main.TOP_HOLDERS_URL)] = \
+        main.host_limiter.host_limits.get("api.ethplorer.io", {"rate": float('inf'), "burst": 1})
+    # Launchpads HTML : pas de mock, leur parsing est mesuré par bench_parse.py
+    main.SETTINGS.setdefault('scraping', {})['sources'] = {}
+    main.response_cache.enabled = args.http_cache
+    main.SETTINGS.setdefault('telegram', {}).update({"global_rate": 1000, "chat_rate": 1000,
+                                                     "group_rate_per_minute": 60000})
+
+    whois_delay = args.whois_latency_ms / 1000
+
+    def synthetic_whois(domain):
+        time.sleep(whois_delay)
+        # 5 % de domaines « neufs » (déterministe d'un run à l'autre)
+        return datetime.now() if int(hashlib.md5(domain.encode()).hexdigest(), 16) % 20 == 0 else datetime(2024, 1, 1)
+
+    domain_age_resolver.lookup = synthetic_whois
+
+    class BenchScanner(main.QuantumScanner):
+        """Ajoute site et contrat (absents des payloads launchpad) et chronomètre chaque projet."""
+
+        def __init__(self):
+            super().__init__()
+            self.latencies = []
+            self._submitted = {}
+            self.antiscam.databases.update({k: urls[k] for k in ("cryptoscamdb", "cryptoscamdb_list", "tokensniffer", "honeypot", "rugdoc")})
+            # Le mock n'impose pas de quota : seuls la concurrence par fournisseur et les 429 simulés limitent
+            for limit in self.antiscam.rate_limits.values():
+                limit.bucket.rate = limit.bucket.max_rate = float('inf')
+            self.notifier.api_base = urls["telegram"]
+            self.onchain = OnChainEnricher.from_settings(main.SETTINGS, self.http, urls["rpc"])
+
+        async def stream_sources(self, **kwargs):
+            async for p in super().stream_sources(**kwargs):
+                source, index = p['source'].lower(), int(p['name'].rsplit(' ', 1)[1])
+                p['website'] = project_website(source, index)
+                if index % args.contract_every == 0:
+                    p['contract_address'] = project_contract(source, index)
+                    p['pair_address'] = project_pair(source, index)
+                yield p
+
+        def _needs_verification(self, p, known):
+            needed = super()._needs_verification(p, known)
+            if needed:
+                self._submitted[id(p)] = time.perf_counter()
+            return needed
+
+        async def _stage_notify(self, item):
+            await super()._stage_notify(item)
+            submitted = self._submitted.pop(id(item[0]), None)
+            if submitted is not None:  # None dans un worker de la file de jobs
+                self.latencies.append(time.perf_counter() - submitted)
+
+        def worker_command(self, run_id):
+            # Workers de --workers : même sous-processus de bench (URLs du mock, WHOIS synthétique)
+            return [sys.executable, os.path.abspath(__file__), "--child", "--workdir", args.workdir,
+                    "--urls", args.urls, "--whois-latency-ms", str(args.whois_latency_ms),
+                    "--contract-every", str(args.contract_every), "--worker-run-id", str(run_id)]
+
+    async def run():
+        scanner = BenchScanner()
+        async with scanner:
+            if args.worker_run_id is not None:
+                await scanner.run_worker(args.worker_run_id)
+                return scanner, 0.0, 0.0
+            started = time.perf_counter()
+            if args.workers:
+                await scanner.scan_with_workers(args.workers)
+            else:
+                await scanner.scan()
+            scan_s = time.perf_counter() - started
+            if args.http_cache:
+                # Second scan à chaud : mêmes listes, les launchpads répondent 304
+                cold = main.response_cache.report()
+                cold_scan = (scanner.stats, scanner.first_verdict_s, scanner.fetch_completed_s)
+                await scanner.scan()
+                scanner.http_cache = {"cold": cold, "warm": main.response_cache.report(),
+                                      "fetch_completed_s": {"cold": round(cold_scan[2] or 0.0, 3),
+                                                            "warm": round(scanner.fetch_completed_s or 0.0, 3)}}
+                # Le rapport principal reste celui du scan à froid
+                scanner.stats, scanner.first_verdict_s, scanner.fetch_completed_s = cold_scan
+            closing = time.perf_counter()
+        close_s = time.perf_counter() - closing
+        return scanner, scan_s, close_s
+
+    scanner, scan_s, close_s = asyncio.run(run())
+    if args.worker_run_id is not None:
+        return
+    db_bytes = sum(os.path.getsize(f) for f in ("quantum.db", "quantum.db-wal") if os.path.exists(f))
+    lat_ms = [x * 1000 for x in scanner.latencies]
+    result = {
+        "projects": scanner.stats['scanned'],
+        "scan_s": round(scan_s, 3),
+        "close_s": round(close_s, 3),
+        "projects_per_s": round(scanner.stats['scanned'] / scan_s, 2) if scan_s else 0.0,
+        "time_to_first_verdict_s": round(scanner.first_verdict_s or 0.0, 3),
+        "fetch_completed_s": round(scanner.fetch_completed_s or 0.0, 3),
+        "latency_ms": {"p50": round(percentile(lat_ms, 0.50), 2), "p95": round(percentile(lat_ms, 0.95), 2),
+                       "p99": round(percentile(lat_ms, 0.99), 2), "max": round(max(lat_ms, default=0.0), 2)},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "db_size_mb": round(db_bytes / 1024 / 1024, 3),
+        "stats": scanner.stats,
+        "telegram": scanner.notifier.stats,
+        "onchain": scanner.onchain.stats,
+        "top_holders": scanner.holders.stats,
+        "http": {"requests": scanner.http.stats.get('requests'), "reuse_ratio": round(scanner.http.reuse_ratio, 3)},
+    }
+    if args.http_cache:
+        result["http_cache"] = scanner.http_cache
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+# ============================================================================
+# PARENT : mock + une exécution par taille
+# ============================================================================
+
+async def run_sizes(args):
+    behaviour = behaviour_from_args(args)
+    mock = MockUpstream(MockConfig(phishing_domains=args.phishing_domains, contract_every=args.contract_every,
+                                   behaviours={g: behaviour for g in GROUPS}))
+    await mock.start()
+    runs = []
+    try:
+        for size in args.sizes:
+            mock.config.projects = size
+            mock.reset_counters()
+            workdir = tempfile.mkdtemp(prefix=f"bench_scan_{size}_")
+            shutil.copy(os.path.join(REPO_ROOT, "config.yml"), workdir)
+            out = os.path.join(workdir, "result.json")
+            cmd = [sys.executable, os.path.abspath(__file__), "--child", "--workdir", workdir, "--out", out,
+                   "--urls", json.dumps(mock.urls()), "--whois-latency-ms", str(args.whois_latency_ms),
+                   "--contract-every", str(args.contract_every), "--workers", str(args.workers)]
+            if args.http_cache:
+                cmd.append("--http-cache")
+            print(f"[bench_scan] {size} projets...", flush=True)
+            proc = await asyncio.create_subprocess_exec(*cmd)
+            code = await proc.wait()
+            if code != 0 or not os.path.exists(out):
+                runs.append({"size": size, "error": f"exit code {code}"})
+            else:
+                with open(out, encoding='utf-8') as f:
+                    result = json.load(f)
+                result["size"] = size
+                result["upstream_requests"] = mock.counters
+                runs.append(result)
+                print(f"[bench_scan] {size}: {result['projects_per_s']} projets/s, "
+                      f"p95 {result['latency_ms']['p95']} ms, RSS {result['peak_rss_mb']} Mo", flush=True)
+                if "http_cache" in result:
+                    warm = result["http_cache"]["warm"]
+                    print(f"[bench_scan] {size} à chaud: cache HTTP {warm['hit_ratio']:.0%}, "
+                          f"{warm['bytes_saved'] / 1024:.0f} Ko non téléchargés", flush=True)
+            if not args.keep_workdirs:
+                shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        await mock.close()
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hors ligne de QuantumScanner.scan')
+    parser.add_argument('--sizes', type=lambda s: [int(x) for x in s.split(',')], default=[10, 1000, 50000])
+    parser.add_argument('--phishing-domains', type=int, default=200000, help='Taille de la liste phishing servie')
+    parser.add_argument('--whois-latency-ms', type=float, default=5.0, help='Latence du WHOIS synthétique')
+    parser.add_argument('--contract-every', type=int, default=1, help='1 projet sur N a une adresse de contrat')
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/scan_<date>.json)')
+    parser.add_argument('--workers', type=int, default=0, help='Scan réparti sur N workers (file de jobs)')
+    parser.add_argument('--http-cache', action='store_true', help='Active le cache HTTP et mesure un second scan à chaud')
+    parser.add_argument('--keep-workdirs', action='store_true', help='Conserve les répertoires temporaires')
+    add_behaviour_arguments(parser)
+    # Arguments internes du sous-processus
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--out', help=argparse.SUPPRESS)
+    parser.add_argument('--urls', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-run-id', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    started = datetime.now(timezone.utc)
+    runs = asyncio.run(run_sizes(args))
+    report = {
+        "benchmark": "scan",
+        "timestamp": started.isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: getattr(args, k) for k in ("sizes", "phishing_domains", "whois_latency_ms", "contract_every", "workers", "http_cache",
+                                                  "latency_ms", "jitter_ms", "rate_429", "error_rate", "retry_after")},
+        "runs": runs,
+    }
+    output = args.output or os.path.join(BENCH_DIR, "results", f"scan_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_scan] Rapport: {output}")
+
+
+if __name__ == "__main__":
+    main()
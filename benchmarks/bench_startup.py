@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de régression du démarrage à froid (import de main + initialisation).
+
+Chaque mesure est faite dans un processus neuf, dans un répertoire temporaire
+(logs/, results/ et quantum.db neufs) : c'est la situation d'un runner GitHub Actions.
+
+    python benchmarks/bench_startup.py                          # 7 démarrages, rapport JSON
+    python benchmarks/bench_startup.py --baseline benchmarks/results/startup_<date>.json --tolerance 0.2
+    python benchmarks/bench_startup.py --max-import-s 0.8      # budget absolu (code retour 1 si dépassé)
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+
+def cold_import(workdir: str, env: dict) -> float:
+    """Durée murale de `python -c "import main"` (interpréteur compris)."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=workdir, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def interpreter_only(env: dict) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    return time.perf_counter() - started
+
+
+def startup_profile(workdir: str, env: dict) -> dict:
+    """`main.py --startup-profile` : détail des imports et des phases d'initialisation."""
+    output = os.path.join(workdir, "startup_profile.json")
+    subprocess.run([sys.executable, os.path.join(REPO_ROOT, "main.py"), "--startup-profile",
+                    "--profile-output", output], cwd=workdir, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(output, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du démarrage à froid de main.py')
+    parser.add_argument('--runs', type=int, default=7, help='Nombre de démarrages mesurés')
+    parser.add_argument('--baseline', help='Rapport précédent à comparer (médiane de l\'import)')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Régression tolérée vs baseline (0.2 = +20 %%)')
+    parser.add_argument('--max-import-s', type=float, help='Budget absolu pour la médiane de l\'import')
+    parser.add_argument('--output', default=None, help='Fichier JSON (défaut: benchmarks/results/startup_<date>.json)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    shutil.copy(os.path.join(REPO_ROOT, "config.yml"), workdir)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    try:
+        cold_import(workdir, env)  # préchauffe le cache de bytecode (__pycache__), comme après checkout + 1er run
+        imports = [cold_import(workdir, env) for _ in range(args.runs)]
+        baseline_interpreter = statistics.median(interpreter_only(env) for _ in range(3))
+        profile = startup_profile(workdir, env)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    started = datetime.now(timezone.utc)
+    median = statistics.median(imports)
+    report = {
+        "benchmark": "startup",
+        "timestamp": started.isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "import_main_s": {"median": round(median, 4), "min": round(min(imports), 4), "max": round(max(imports), 4)},
+        "interpreter_s": round(baseline_interpreter, 4),
+        "profile": profile,
+    }
+    print(f"[bench_startup] import main: médiane {median:.3f}s (min {min(imports):.3f}s, "
+          f"interpréteur seul {baseline_interpreter:.3f}s)")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            previous = json.load(f)["import_main_s"]["median"]
+        limit = previous * (1 + args.tolerance)
+        report["baseline"] = {"file": args.baseline, "median": previous, "limit": round(limit, 4)}
+        if median > limit:
+            print(f"[bench_startup] RÉGRESSION: {median:.3f}s > {limit:.3f}s (baseline {previous:.3f}s +{args.tolerance:.0%})")
+            failed = True
+    if args.max_import_s is not None and median > args.max_import_s:
+        print(f"[bench_startup] Budget dépassé: {median:.3f}s > {args.max_import_s:.3f}s")
+        failed = True
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"startup_{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"[bench_startup] Rapport: {output}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Vérification hors ligne de l'enrichissement on-chain contre le nœud JSON-RPC de mock_upstream.
+
+Pour N contrats : top holders lus sur la route getTopTokenHolders du mock (parse_top_holders),
+puis OnChainEnricher.enrich (batch JSON-RPC, cache par bloc). Chaque champ lu (supply,
+supply en circulation, concentration des top holders, owner renoncé, réserves LP) est comparé
+aux valeurs que le mock dérive de l'adresse (MockUpstream.expected_onchain). Contrôle aussi le
+regroupement : bien moins de POST que d'eth_call. Code de sortie 1 au premier écart.
+
+    python benchmarks/check_onchain.py
+    python benchmarks/check_onchain.py --contracts 500 --max-batch 50
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from http_client import HttpClient  # noqa: E402
+from mock_upstream import MockConfig, MockUpstream, project_contract, project_pair  # noqa: E402
+from onchain import OnChainEnricher, parse_top_holders  # noqa: E402
+
+
+def compare(token: str, got: dict, expected: dict) -> list:
+    errors = []
+    for key in sorted(set(got) | set(expected)):
+        a, b = got.get(key), expected.get(key)
+        same = (a == b if isinstance(b, bool) or a is None or b is None
+                else math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9))
+        if not same:
+            errors.append(f"{token} {key}: lu {a!r}, attendu {b!r}")
+    return errors
+
+
+async def run(args) -> list:
+    mock = MockUpstream(MockConfig(projects=args.contracts))
+    await mock.start()
+    urls = mock.urls()
+    http = HttpClient()
+    await http.start()
+    enricher = OnChainEnricher(http, urls["rpc"], max_batch=args.max_batch, max_holders=args.holders)
+    errors = []
+    try:
+        async def check(index: int):
+            token = project_contract("binance", index)
+            # Un contrat sur deux avec paire : enrich ne lit getReserves que si pair_address est connu
+            pair = project_pair("binance", index) if index % 2 == 0 else None
+            async with http.session.get(urls["holders"].format(token)) as resp:
+                holders = parse_top_holders(await resp.json())
+            got = await enricher.enrich({"contract_address": token, "pair_address": pair, "top_holders": holders})
+            errors.extend(compare(token, got, mock.expected_onchain(token, pair, len(holders))))
+
+        await asyncio.gather(*(check(i) for i in range(args.contracts)))
+        stats = enricher.stats
+        posts = mock.counters.get("rpc", {}).get("requests", 0)
+        if stats["errors"]:
+            errors.append(f"{stats['errors']} batchs JSON-RPC en échec")
+        if posts * 5 > stats["calls"]:
+            errors.append(f"regroupement insuffisant : {posts} POST pour {stats['calls']} eth_call")
+        print(f"[check_onchain] {args.contracts} contrats, {stats['calls']} eth_call en {posts} POST "
+              f"({stats['batches']} batchs), {len(errors)} écart(s)")
+    finally:
+        await enricher.close()
+        await http.close()
+        await mock.close()
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérification de OnChainEnricher contre le mock JSON-RPC")
+    parser.add_argument('--contracts', type=int, default=200)
+    parser.add_argument('--holders', type=int, default=10, help='Top holders lus par contrat')
+    parser.add_argument('--max-batch', type=int, default=100)
+    args = parser.parse_args()
+
+    errors = asyncio.run(run(args))
+    for line in errors[:20]:
+        print(f"[check_onchain] {line}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Serveur local imitant toutes les dépendances réseau du scanner (benchmarks hors ligne).
+
+Routes servies (mêmes formats que les vraies API) :
+  GET  /binance/en/api/projects          -> fetch_binance_launchpad (ETag / 304)
+  GET  /coinlist/api/v1/token_sales      -> fetch_coinlist (ETag / 304)
+  POST /polkastarter/graphql             -> fetch_polkastarter (ETag / 304)
+  GET  /metamask/blacklist.json          -> PhishingBlacklist (ETag / 304)
+  GET  /cryptoscamdb/addresses           -> AntiScamAPI.check_addresses (liste complète)
+  GET  /cryptoscamdb/{address}           -> AntiScamAPI
+  GET  /tokensniffer/{address}
+  GET  /honeypot?address=...
+  GET  /rugdoc/{address}/
+  POST /telegram/bot{token}/sendMessage  -> TelegramNotifier
+  GET  /ethplorer/getTopTokenHolders/{address} -> QuantumScanner.fetch_top_holders
+  POST /rpc                              -> OnChainEnricher (JSON-RPC, batch, eth_blockNumber / eth_call)
+
+Chaque groupe de routes a son propre comportement (latence, taux de 429, taux d'erreurs 5xx),
+éventuellement remplacé route par route (`route_behaviours`, ex. un fournisseur anti-scam lent).
+
+Usage autonome :
+    python benchmarks/mock_upstream.py --projects 1000 --port 8765 --latency-ms 20 --rate-429 0.05
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+GROUPS = ("launchpads", "phishing", "antiscam", "telegram", "rpc")
+SOURCES = ("binance", "coinlist", "polkastarter")
+SUFFIXES = ("io", "com", "org", "net", "xyz", "app", "finance", "network")
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+DEAD = "0x000000000000000000000000000000000000dead"
+BLOCK_TIME_S = 12
+
+
+@dataclass
+class Behaviour:
+    latency_ms: float = 5.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    error_rate: float = 0.0
+    retry_after: float = 1.0
+
+
+@dataclass
+class MockConfig:
+    projects: int = 10
+    phishing_domains: int = 100000
+    phishing_every: int = 50           # 1 projet sur N a un site listé
+    contract_every: int = 1            # 1 projet sur N a une adresse de contrat
+    seed: int = 42
+    behaviours: Dict[str, Behaviour] = field(default_factory=lambda: {g: Behaviour() for g in GROUPS})
+    route_behaviours: Dict[str, Behaviour] = field(default_factory=dict)
+
+
+def project_website(source: str, index: int) -> str:
+    return f"https://{source}-project-{index}.{SUFFIXES[index % len(SUFFIXES)]}"
+
+
+def project_contract(source: str, index: int) -> str:
+    return "0x" + hashlib.sha1(f"{source}:{index}".encode()).hexdigest()
+
+
+def project_pair(source: str, index: int) -> str:
+    return "0x" + hashlib.sha1(f"pair:{source}:{index}".encode()).hexdigest()
+
+
+def project_holders(token: str, n: int = 10) -> List[str]:
+    return ["0x" + hashlib.sha1(f"holder:{token.lower()}:{k}".encode()).hexdigest() for k in range(n)]
+
+
+def _h(*parts: str) -> int:
+    return int(hashlib.md5(":".join(parts).encode()).hexdigest(), 16)
+
+
+def split_projects(total: int) -> Dict[str, int]:
+    """Répartit N projets entre les trois launchpads."""
+    base, extra = divmod(total, len(SOURCES))
+    return {source: base + (1 if n < extra else 0) for n, source in enumerate(SOURCES)}
+
+
+class MockUpstream:
+    """Application aiohttp + compteurs par route ; `config` est modifiable entre deux runs."""
+
+    def __init__(self, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self.rng = random.Random(self.config.seed)
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._payloads: Dict[tuple, bytes] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._started = time.monotonic()
+        self.base_url = ""
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/binance/en/api/projects', self._binance)
+        app.router.add_get('/coinlist/api/v1/token_sales', self._coinlist)
+        app.router.add_post('/polkastarter/graphql', self._polkastarter)
+        app.router.add_get('/metamask/blacklist.json', self._phishing)
+        app.router.add_get('/cryptoscamdb/addresses', self._cryptoscamdb_list)
+        app.router.add_get('/cryptoscamdb/{address}', self._cryptoscamdb)
+        app.router.add_get('/tokensniffer/{address}', self._tokensniffer)
+        app.router.add_get('/honeypot', self._honeypot)
+        app.router.add_get('/rugdoc/{address}/', self._rugdoc)
+        app.router.add_post('/telegram/bot{token}/sendMessage', self._telegram)
+        app.router.add_get('/ethplorer/getTopTokenHolders/{address}', self._top_holders)
+        app.router.add_post('/rpc', self._rpc)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def reset_counters(self):
+        self.counters = {}
+
+    def urls(self) -> Dict[str, str]:
+        """URLs à injecter dans le scanner (launchpads, liste phishing, anti-scam, Telegram)."""
+        b = self.base_url
+        return {
+            "binance": f"{b}/binance/en/api/projects",
+            "coinlist": f"{b}/coinlist/api/v1/token_sales",
+            "polkastarter": f"{b}/polkastarter/graphql",
+            "phishing": f"{b}/metamask/blacklist.json",
+            "cryptoscamdb": f"{b}/cryptoscamdb/{{}}",
+            "cryptoscamdb_list": f"{b}/cryptoscamdb/addresses",
+            "tokensniffer": f"{b}/tokensniffer/{{}}",
+            "honeypot": f"{b}/honeypot?address={{}}",
+            "rugdoc": f"{b}/rugdoc/{{}}/",
+            "telegram": f"{b}/telegram",
+            "holders": f"{b}/ethplorer/getTopTokenHolders/{{}}?apiKey=freekey&limit=10",
+            "rpc": f"{b}/rpc",
+        }
+
+    # ------------------------------------------------------------------
+    # Injection de latence et de pannes
+    # ------------------------------------------------------------------
+
+    def _count(self, route: str, outcome: str):
+        counters = self.counters.setdefault(route, {"requests": 0, "ok": 0, "throttled": 0, "errors": 0})
+        counters["requests"] += 1
+        counters[outcome] += 1
+
+    async def _faults(self, group: str, route: str) -> Optional[web.Response]:
+        """Latence simulée puis, éventuellement, un 429 ou un 5xx (None = réponse normale)."""
+        b = self.config.route_behaviours.get(route) or self.config.behaviours[group]
+        delay = b.latency_ms + (self.rng.uniform(-b.jitter_ms, b.jitter_ms) if b.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        roll = self.rng.random()
+        if roll < b.rate_429:
+            self._count(route, "throttled")
+            if group == "telegram":
+                return web.json_response({"ok": False, "error_code": 429, "description": "Too Many Requests",
+                                          "parameters": {"retry_after": b.retry_after}})
+            return web.Response(status=429, headers={"Retry-After": f"{b.retry_after:g}"})
+        if roll < b.rate_429 + b.error_rate:
+            self._count(route, "errors")
+            if group == "telegram":
+                return web.json_response({"ok": False, "error_code": 502, "description": "Bad Gateway"})
+            return web.Response(status=503)
+        self._count(route, "ok")
+        return None
+
+    def _cached_json(self, request: web.Request, key: tuple, build) -> web.Response:
+        """Payload JSON mémorisé ; 304 si le client présente l'ETag courant."""
+        etag = '"' + hashlib.md5(repr(key).encode()).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        if key not in self._payloads:
+            self._payloads[key] = json.dumps(build()).encode()
+        return web.Response(body=self._payloads[key], content_type="application/json", headers={"ETag": etag})
+
+    # ------------------------------------------------------------------
+    # Launchpads
+    # ------------------------------------------------------------------
+
+    def _count_for(self, source: str) -> int:
+        return split_projects(self.config.projects)[source]
+
+    async def _binance(self, request: web.Request) -> web.Response:
+        fault = await self._faults("launchpads", "binance")
+        if fault is not None:
+            return fault
+        n = self._count_for("binance")
+        return self._cached_json(request, ("binance", n), lambda: {"data": [{
+            "name": f"Binance Project {i}", "tokenTicker": f"BNP{i}", "projectId": str(i),
+            "hardCap": str(50000 + (i * 7919) % 150000), "status": "DOING" if i % 2 else "PENDING",
+        } for i in range(n)]})
+
+    async def _coinlist(self, request: web.Request) -> web.Response:
+        fault = await self._faults("launchpads", "coinlist")
+        if fault is not None:
+            return fault
+        n = self._count_for("coinlist")
+        return self._cached_json(request, ("coinlist", n), lambda: {"sales": [{
+            "name": f"CoinList Project {i}", "symbol": f"CLP{i}", "link": f"/sales/project-{i}",
+            "status": "active",
+        } for i in range(n)]})
+
+    async def _polkastarter(self, request: web.Request) -> web.Response:
+        fault = await self._faults("launchpads", "polkastarter")
+        if fault is not None:
+            return fault
+        n = self._count_for("polkastarter")
+        return self._cached_json(request, ("polkastarter", n), lambda: {"data": {"projects": [{
+            "title": f"Polkastarter Project {i}", "slug": f"project-{i}", "token": {"symbol": f"PKP{i}"},
+            "fundraisingGoal": str(40000 + (i * 6271) % 160000),
+        } for i in range(n)]}})
+
+    # ------------------------------------------------------------------
+    # Liste phishing MetaMask
+    # ------------------------------------------------------------------
+
+    def phishing_list(self) -> List[str]:
+        """Domaines synthétiques + 1 site de projet sur `phishing_every` (pour déclencher le rejet)."""
+        listed = [f"phish-{i}.scam-{i % 97}.com" for i in range(self.config.phishing_domains)]
+        for source, count in split_projects(self.config.projects).items():
+            for i in range(0, count, self.config.phishing_every):
+                listed.append(project_website(source, i).split("://", 1)[1])
+        return listed
+
+    async def _phishing(self, request: web.Request) -> web.Response:
+        fault = await self._faults("phishing", "phishing")
+        if fault is not None:
+            return fault
+        key = ("phishing", self.config.phishing_domains, self.config.projects, self.config.phishing_every)
+        etag = '"' + hashlib.md5(repr(key).encode()).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        if key not in self._payloads:
+            self._payloads[key] = json.dumps({"version": 2, "tolerance": 1, "fuzzylist": [],
+                                              "whitelist": [], "blacklist": self.phishing_list()}).encode()
+        # raw.githubusercontent.com sert du text/plain
+        return web.Response(body=self._payloads[key], content_type="text/plain", headers={"ETag": etag})
+
+    # ------------------------------------------------------------------
+    # Bases anti-scam
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _risk(address: str) -> int:
+        return int(address[-2:], 16) if len(address) > 2 else 0
+
+    async def _cryptoscamdb(self, request: web.Request) -> web.Response:
+        fault = await self._faults("antiscam", "cryptoscamdb")
+        if fault is not None:
+            return fault
+        listed = self._risk(request.match_info["address"]) < 3
+        return web.json_response({"success": listed, "result": {"success": listed}})
+
+    async def _cryptoscamdb_list(self, request: web.Request) -> web.Response:
+        fault = await self._faults("antiscam", "cryptoscamdb_list")
+        if fault is not None:
+            return fault
+
+        def build():
+            listed = {}
+            for source, n in split_projects(self.config.projects).items():
+                for i in range(n):
+                    address = project_contract(source, i)
+                    if self._risk(address) < 3:
+                        listed[address] = [{"type": "scam", "name": f"{source} {i}"}]
+            return {"success": True, "result": listed}
+        return self._cached_json(request, ("cryptoscamdb_list", self.config.projects), build)
+
+    async def _tokensniffer(self, request: web.Request) -> web.Response:
+        fault = await self._faults("antiscam", "tokensniffer")
+        if fault is not None:
+            return fault
+        return web.json_response({"score": 100 - self._risk(request.match_info["address"]) * 100 // 255})
+
+    async def _honeypot(self, request: web.Request) -> web.Response:
+        fault = await self._faults("antiscam", "honeypot")
+        if fault is not None:
+            return fault
+        risk = self._risk(request.query.get("address", ""))
+        return web.json_response({"IsHoneypot": risk > 250, "BuyTax": risk % 20})
+
+    async def _rugdoc(self, request: web.Request) -> web.Response:
+        fault = await self._faults("antiscam", "rugdoc")
+        if fault is not None:
+            return fault
+        risk = self._risk(request.match_info["address"])
+        return web.json_response({"risk_level": "high" if risk > 240 else "low"})
+
+    # ------------------------------------------------------------------
+    # Telegram
+    # ------------------------------------------------------------------
+
+    async def _telegram(self, request: web.Request) -> web.Response:
+        await request.read()
+        fault = await self._faults("telegram", "telegram")
+        if fault is not None:
+            return fault
+        message_id = self.counters["telegram"]["ok"]
+        return web.json_response({"ok": True, "result": {"message_id": message_id}})
+
+    # ------------------------------------------------------------------
+    # Nœud JSON-RPC (jeton ERC-20 + paire USDC par contrat, valeurs dérivées de l'adresse)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _word(value: int) -> str:
+        return format(value, "064x")
+
+    @staticmethod
+    def _supply(token: str) -> int:
+        return (10 ** 6 + _h(token) % 10 ** 9) * 10 ** 18
+
+    def _eth_call(self, to: str, data: str) -> Optional[str]:
+        """Résultat hexadécimal d'un appel, None = revert."""
+        to, selector, args = to.lower(), data[:10], data[10:]
+        if selector == "0x18160ddd":    # totalSupply()
+            return "0x" + self._word(self._supply(to))
+        if selector == "0x313ce567":    # decimals()
+            return "0x" + self._word(18)
+        if selector == "0x8da5cb5b":    # owner() : 1 contrat sur 3 renoncé, 1 sur 5 sans Ownable
+            if _h(to, "ownable") % 5 == 0:
+                return None
+            return "0x" + self._word(0 if _h(to, "owner") % 3 == 0 else _h(to, "owner") % 2 ** 160)
+        if selector == "0x70a08231":    # balanceOf(address)
+            holder = "0x" + args[-40:]
+            supply = self._supply(to)
+            if holder == DEAD:
+                return "0x" + self._word(supply // 10)
+            return "0x" + self._word(0 if int(holder, 16) == 0 else _h(to, holder) % (supply // 40))
+        if selector == "0x0902f1ac":    # getReserves() : (réserve USDC, réserve jeton, horodatage)
+            usdc = (10_000 + _h(to, "reserve") % 200_000) * 10 ** 6
+            return "0x" + self._word(usdc) + self._word(_h(to, "token") % 10 ** 24) + self._word(int(time.time()))
+        if selector == "0x0dfe1681":    # token0()
+            return "0x" + self._word(int(USDC, 16))
+        if selector == "0xd21220a7":    # token1()
+            return "0x" + self._word(_h(to, "token1") % 2 ** 160)
+        return None
+
+    def expected_onchain(self, token: str, pair: Optional[str] = None, holders: int = 10) -> Dict:
+        """Champs que OnChainEnricher.enrich doit lire pour ce contrat (mêmes formules que _eth_call)."""
+        token = token.lower()
+        supply = self._supply(token)
+        circulating = supply - supply // 10     # solde de 0x...dead, rien à l'adresse nulle
+        held = sum(_h(token, h) % (supply // 40) for h in project_holders(token, holders))
+        fields = {"total_supply": supply / 10 ** 18, "circ_supply": circulating / 10 ** 18,
+                  "top10_concentration": min(1.0, held / circulating) if holders else None}
+        if _h(token, "ownable") % 5 != 0:
+            fields["owner_renounced"] = _h(token, "owner") % 3 == 0
+        if pair:
+            fields["lp_reserves_usd"] = 2 * (10_000 + _h(pair.lower(), "reserve") % 200_000)
+        return {k: v for k, v in fields.items() if v is not None}
+
+    async def _top_holders(self, request: web.Request) -> web.Response:
+        fault = await self._faults("rpc", "holders")
+        if fault is not None:
+            return fault
+        token = request.match_info["address"].lower()
+        limit = int(request.query.get("limit", 10))
+        supply = self._supply(token)
+        holders = [{"address": h, "balance": _h(token, h) % (supply // 40),
+                    "share": round(100 * (_h(token, h) % (supply // 40)) / supply, 4)}
+                   for h in project_holders(token, limit)]
+        return web.json_response({"holders": holders})
+
+    def _rpc_reply(self, call: Dict) -> Dict:
+        reply = {"jsonrpc": "2.0", "id": call.get("id")}
+        if call.get("method") == "eth_blockNumber":
+            reply["result"] = hex(19_000_000 + int((time.monotonic() - self._started) // BLOCK_TIME_S))
+        elif call.get("method") == "eth_call":
+            params = call.get("params") or [{}]
+            result = self._eth_call(params[0].get("to", ""), params[0].get("data", ""))
+            if result is None:
+                reply["error"] = {"code": -32000, "message": "execution reverted"}
+            else:
+                reply["result"] = result
+        else:
+            reply["error"] = {"code": -32601, "message": "method not found"}
+        return reply
+
+    async def _rpc(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        fault = await self._faults("rpc", "rpc")
+        if fault is not None:
+            return fault
+        batch = body if isinstance(body, list) else [body]
+        counters = self.counters.setdefault("rpc_calls", {"requests": 0, "ok": 0, "throttled": 0, "errors": 0})
+        counters["requests"] += len(batch)
+        counters["ok"] += len(batch)
+        replies = [self._rpc_reply(call) for call in batch]
+        return web.json_response(replies if isinstance(body, list) else replies[0])
+
+
+def behaviour_from_args(args) -> Behaviour:
+    return Behaviour(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+                     error_rate=args.error_rate, retry_after=args.retry_after)
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Latence simulée par requête')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Variation aléatoire de la latence (±)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Proportion de réponses 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Proportion de réponses 5xx')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After des 429 (secondes)')
+
+
+async def _serve(args):
+    behaviour = behaviour_from_args(args)
+    mock = MockUpstream(MockConfig(projects=args.projects, phishing_domains=args.phishing_domains,
+                                   behaviours={g: behaviour for g in GROUPS}))
+    await mock.start(port=args.port)
+    print(json.dumps(mock.urls(), indent=2), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await mock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serveur local imitant les API amont du scanner')
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--phishing-domains', type=int, default=100000)
+    parser.add_argument('--port', type=int, default=8765)
+    add_behaviour_arguments(parser)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Module Checkpoint Quantum Scanner v6.1
+Points de reprise d'un scan interrompu (timeout GitHub Actions, daemon tué).
+
+Chaque scan reçoit un id persistant (scan_runs, mode 'scan'). La liste de projets de
+chaque source est enregistrée dans scan_jobs dès que la source répond ; un projet passe
+à 'done' dans la même transaction que son écriture dans projects (ProjectStore.flush).
+Une reprise ne refetch pas les sources déjà enregistrées et ne re-vérifie pas les projets
+faits ; leurs alertes sont rejouées, la déduplication du notifier écarte celles déjà envoyées.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from persistence import ProjectStore
+
+Key = Tuple[str, str]
+
+
+class ScanCheckpoint:
+    """Progression d'un scan dans quantum.db (connexion et transactions de ProjectStore)."""
+
+    def __init__(self, store: ProjectStore, enabled: bool = True, max_age_hours: float = 24):
+        self.store = store
+        self.enabled = enabled
+        self.max_age_hours = max_age_hours
+        self.run_id: Optional[int] = None
+        self.resumed = False
+        self.sources_done: Set[str] = set()
+        # Projets enregistrés par une tentative précédente
+        self.completed: Dict[Key, Tuple[Dict, Dict]] = {}
+        self.pending: Dict[Key, Dict] = {}
+        self.stats = {"sources_skipped": 0, "projects_replayed": 0, "verifications_saved": 0, "alerts_replayed": 0}
+
+    @classmethod
+    def from_settings(cls, store: ProjectStore, settings: Dict) -> "ScanCheckpoint":
+        cfg = settings.get('checkpoint', {})
+        return cls(store, enabled=cfg.get('enabled', True), max_age_hours=cfg.get('max_age_hours', 24))
+
+    async def unfinished_run(self) -> Optional[int]:
+        """Dernier scan interrompu encore repris-able (moins de `max_age_hours`)."""
+        if not self.enabled:
+            return None
+        since = (datetime.utcnow() - timedelta(hours=self.max_age_hours)).strftime('%Y-%m-%d %H:%M:%S')
+        async with self.store.db.execute(
+                "SELECT id FROM scan_runs WHERE mode = 'scan' AND status = 'running' AND started_at >= ? "
+                "ORDER BY id DESC LIMIT 1", (since,)) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def begin(self, resume: bool = False) -> Optional[int]:
+        """Reprend le dernier scan interrompu (`resume`) ou en ouvre un nouveau ; renvoie son id."""
+        self.run_id, self.resumed = None, False
+        self.sources_done, self.completed, self.pending = set(), {}, {}
+        self.stats = dict.fromkeys(self.stats, 0)
+        if not self.enabled:
+            return None
+        run_id = await self.unfinished_run() if resume else None
+        async with self.store.transaction() as db:
+            # Les autres scans interrompus ne seront plus repris : leur progression est supprimée
+            await db.execute("DELETE FROM scan_jobs WHERE run_id IN (SELECT id FROM scan_runs WHERE mode = 'scan' "
+                             "AND status = 'running' AND id != ?)", (run_id or -1,))
+            await db.execute("UPDATE scan_runs SET status = 'abandoned', finished_at = CURRENT_TIMESTAMP "
+                             "WHERE mode = 'scan' AND status = 'running' AND id != ?", (run_id or -1,))
+            if run_id is None:
+                cursor = await db.execute("INSERT INTO scan_runs (mode) VALUES ('scan')")
+                self.run_id = cursor.lastrowid
+            else:
+                await db.execute("UPDATE scan_runs SET resumes = resumes + 1 WHERE id = ?", (run_id,))
+                self.run_id = run_id
+        if run_id is not None:
+            await self._load(run_id)
+        return self.run_id
+
+    async def _load(self, run_id: int):
+        self.resumed = True
+        async with self.store.db.execute("SELECT sources_done FROM scan_runs WHERE id = ?", (run_id,)) as cursor:
+            row = await cursor.fetchone()
+        self.sources_done = set(json.loads(row[0])) if row and row[0] else set()
+        async with self.store.db.execute("SELECT name, source, status, payload, result FROM scan_jobs WHERE run_id = ?",
+                                         (run_id,)) as cursor:
+            async for name, source, status, payload, result in cursor:
+                if status == 'done' and result:
+                    self.completed[(name, source)] = (json.loads(payload), json.loads(result))
+                else:
+                    self.pending[(name, source)] = json.loads(payload)
+        logger.info(f"Reprise du scan {run_id}: {len(self.sources_done)} sources déjà fetchées, "
+                    f"{len(self.completed)} projets déjà vérifiés, {len(self.pending)} en attente")
+
+    async def record_fetched(self, source: str, projects: List[Dict]):
+        """Enregistre la liste d'une source avant sa vérification (une source à refetch sinon)."""
+        if self.run_id is None:
+            return
+        self.sources_done.add(source)
+        async with self.store.transaction() as db:
+            await db.executemany("INSERT OR IGNORE INTO scan_jobs (run_id, name, source, payload) VALUES (?, ?, ?, ?)",
+                                 [(self.run_id, p['name'], p['source'], json.dumps(p, default=str))
+                                  for p in projects if p.get('name')])
+            await db.execute("UPDATE scan_runs SET sources_done = ? WHERE id = ?",
+                             (json.dumps(sorted(self.sources_done)), self.run_id))
+
+    async def finish(self, scan_history_id: Optional[int] = None):
+        """Scan terminé : la progression détaillée n'est plus utile, seul le run est gardé."""
+        if self.run_id is None:
+            return
+        async with self.store.transaction() as db:
+            await db.execute("DELETE FROM scan_jobs WHERE run_id = ?", (self.run_id,))
+            await db.execute("UPDATE scan_runs SET status = 'finished', finished_at = CURRENT_TIMESTAMP, "
+                             "enqueue_done = 1, scan_history_id = ? WHERE id = ?", (scan_history_id, self.run_id))
+        self.run_id = None
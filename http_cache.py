@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Module Cache HTTP Quantum Scanner v6.1
+Cache disque des réponses des launchpads, sous fetch_with_retry (opt-in).
+
+Clé : méthode + URL + empreinte du corps de requête (requête GraphQL Polkastarter).
+Chaque entrée est un couple de fichiers dans `path` : `<clé>.json` (URL, type, ETag,
+Last-Modified, date de stockage) et `<clé>.body.gz` (corps compressé). Une entrée plus
+jeune que la fenêtre de fraîcheur de son hôte est servie sans requête ; au-delà, la
+requête part avec If-None-Match / If-Modified-Since et un 304 ne réécrit que le `.json`.
+Le répertoire se persiste tel quel entre deux runs CI (actions/cache).
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+
+def decode_body(content_type: str, text: str) -> Any:
+    """Même décodage que fetch_with_retry : JSON si le serveur l'annonce, texte sinon."""
+    if 'application/json' in (content_type or ''):
+        return json.loads(text)
+    return text
+
+
+@dataclass
+class CachedResponse:
+    """Métadonnées d'une réponse en cache (le corps reste sur disque jusqu'à ce qu'il soit servi)."""
+    key: str
+    url: str
+    content_type: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float  # epoch : l'âge doit survivre au redémarrage du processus
+    size: int         # octets du corps décompressé
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Cache de réponses sur disque avec fraîcheur par hôte et revalidation conditionnelle."""
+
+    def __init__(self, path: str = "cache/http", enabled: bool = False, default_freshness: float = 0.0,
+                 freshness: Optional[Dict[str, float]] = None, max_age_days: float = 7, compress_level: int = 6):
+        self.path = path
+        self.enabled = enabled
+        self.default_freshness = default_freshness
+        self.freshness = {host.lower(): float(s) for host, s in (freshness or {}).items()}
+        self.max_age_days = max_age_days
+        self.compress_level = compress_level
+        self.stats = self._new_stats()
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> "ResponseCache":
+        cfg = settings.get('http_cache', {})
+        return cls(path=cfg.get('path', "cache/http"), enabled=cfg.get('enabled', False),
+                   default_freshness=cfg.get('default_freshness', 0.0), freshness=cfg.get('hosts', {}),
+                   max_age_days=cfg.get('max_age_days', 7), compress_level=cfg.get('compress_level', 6))
+
+    @staticmethod
+    def _new_stats() -> Dict[str, float]:
+        return {"requests": 0, "fresh_hits": 0, "revalidated": 0, "misses": 0, "errors": 0,
+                "bytes_saved": 0, "bytes_downloaded": 0, "bytes_written": 0}
+
+    # ------------------------------------------------------------------
+    # Clés et fraîcheur
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def key(method: str, url: str, request_kwargs: Mapping[str, Any]) -> str:
+        """Empreinte méthode + URL (paramètres compris) + corps de la requête ; en-têtes exclus."""
+        body = request_kwargs.get('json')
+        if body is not None:
+            body = json.dumps(body, sort_keys=True, default=str)
+        else:
+            body = request_kwargs.get('data') or ""
+        if isinstance(body, str):
+            body = body.encode()
+        params = request_kwargs.get('params')
+        params = json.dumps(sorted(dict(params).items()), default=str) if params else ""
+        body_hash = hashlib.sha256(body if isinstance(body, bytes) else repr(body).encode()).hexdigest()
+        return hashlib.sha256(f"{method.upper()} {url} {params} {body_hash}".encode()).hexdigest()
+
+    def freshness_for(self, url: str) -> float:
+        return self.freshness.get(urlparse(url).netloc.lower(), self.default_freshness)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.freshness_for(entry.url)
+
+    def _files(self, key: str):
+        return os.path.join(self.path, f"{key}.json"), os.path.join(self.path, f"{key}.body.gz")
+
+    # ------------------------------------------------------------------
+    # Accès disque (dans le thread pool par défaut : un corps HTML fait plusieurs Mo)
+    # ------------------------------------------------------------------
+
+    def _read_meta(self, key: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._files(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                entry = CachedResponse(**json.load(f))
+        except FileNotFoundError:
+            return None
+        return entry if os.path.exists(body_path) else None
+
+    def _read_body(self, key: str) -> str:
+        with gzip.open(self._files(key)[1], 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(self.path, exist_ok=True)
+        # Nom temporaire par processus : deux workers peuvent écrire la même entrée
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _write_meta(self, entry: CachedResponse):
+        self._write(self._files(entry.key)[0], json.dumps(asdict(entry)).encode())
+
+    def _write_entry(self, entry: CachedResponse, text: str) -> int:
+        body = gzip.compress(text.encode('utf-8'), compresslevel=self.compress_level)
+        # Corps d'abord : un .json n'est jamais lu sans son corps
+        self._write(self._files(entry.key)[1], body)
+        self._write_meta(entry)
+        return len(body)
+
+    def _discard(self, key: str):
+        """Entrée corrompue : supprimée pour que la prochaine requête refasse un GET complet."""
+        for path in self._files(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    # ------------------------------------------------------------------
+    # Cycle d'une requête (appelé par fetch_with_retry)
+    # ------------------------------------------------------------------
+
+    async def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Entrée en cache (fraîche ou à revalider), None si absente ou illisible."""
+        self.stats['requests'] += 1
+        try:
+            return await self._run(self._read_meta, key)
+        except (OSError, ValueError, TypeError) as e:
+            self.stats['errors'] += 1
+            logger.debug(f"Cache HTTP illisible ({key[:12]}): {e}")
+            return None
+
+    async def serve(self, entry: CachedResponse, revalidated: bool = False) -> Optional[Any]:
+        """Corps en cache décodé ; None (refetch) si le fichier a disparu ou est corrompu."""
+        try:
+            value = decode_body(entry.content_type, await self._run(self._read_body, entry.key))
+        except (OSError, EOFError, ValueError) as e:
+            self.stats['errors'] += 1
+            logger.debug(f"Corps en cache illisible pour {entry.url}: {e}")
+            self._discard(entry.key)
+            return None
+        self.stats['revalidated' if revalidated else 'fresh_hits'] += 1
+        self.stats['bytes_saved'] += entry.size
+        return value
+
+    async def revalidated(self, entry: CachedResponse, headers: Mapping[str, str]) -> Optional[Any]:
+        """304 : la fenêtre de fraîcheur repart de maintenant, le corps n'est pas réécrit."""
+        entry.stored_at = time.time()
+        entry.etag = headers.get('ETag') or entry.etag
+        entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        try:
+            await self._run(self._write_meta, entry)
+        except OSError as e:
+            self.stats['errors'] += 1
+            logger.debug(f"Cache HTTP non mis à jour pour {entry.url}: {e}")
+        return await self.serve(entry, revalidated=True)
+
+    async def store(self, key: str, url: str, headers: Mapping[str, str], text: str) -> Any:
+        """Réponse 2xx complète : écrite en cache, puis décodée comme sans cache."""
+        content_type = headers.get('Content-Type', '')
+        size = len(text.encode('utf-8'))
+        self.stats['misses'] += 1
+        self.stats['bytes_downloaded'] += size
+        value = decode_body(content_type, text)
+        entry = CachedResponse(key, url, content_type, headers.get('ETag'), headers.get('Last-Modified'),
+                               time.time(), size)
+        try:
+            self.stats['bytes_written'] += await self._run(self._write_entry, entry, text)
+        except OSError as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Cache HTTP: écriture impossible pour {url}: {e}")
+        return value
+
+    # ------------------------------------------------------------------
+    # Entretien et bilan
+    # ------------------------------------------------------------------
+
+    def prune(self) -> int:
+        """Supprime les entrées non revalidées depuis `max_age_days` (et les temporaires orphelins)."""
+        if not self.max_age_days or not os.path.isdir(self.path):
+            return 0
+        cutoff = time.time() - self.max_age_days * 86400
+        removed = 0
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            try:
+                # L'âge d'une entrée est celui de son .json (réécrit à chaque 304), le corps suit
+                if name.endswith('.tmp') and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                elif name.endswith('.json') and os.path.getmtime(path) < cutoff:
+                    for entry_file in self._files(name[:-len('.json')]):
+                        if os.path.exists(entry_file):
+                            os.remove(entry_file)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"Cache HTTP: {removed} entrées expirées supprimées")
+        return removed
+
+    def reset_stats(self):
+        self.stats = self._new_stats()
+
+    def report(self) -> Dict[str, float]:
+        served = self.stats['fresh_hits'] + self.stats['revalidated']
+        return {**self.stats, "hit_ratio": round(served / self.stats['requests'], 3) if self.stats['requests'] else 0.0}
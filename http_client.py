@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Module HTTP Quantum Scanner v6.1
+Pool de connexions aiohttp unique, partagé par le scanner et AntiScamAPI.
+"""
+
+from typing import Dict, Optional
+
+import aiohttp
+from loguru import logger
+
+
+class HttpClient:
+    """Session aiohttp partagée (keep-alive, cache DNS, limites par hôte) avec stats de réutilisation."""
+
+    def __init__(self, timeout: float = 30, limit: int = 100, limit_per_host: int = 10,
+                 dns_cache_ttl: int = 300, keepalive_timeout: float = 30):
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {"requests": 0, "connections_created": 0, "connections_reused": 0,
+                "dns_cache_hits": 0, "dns_cache_misses": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> "HttpClient":
+        """Construit le client depuis config.yml (scan.request_timeout + section http)."""
+        http = settings.get('http', {})
+        return cls(
+            timeout=settings.get('scan', {}).get('request_timeout', 30),
+            limit=http.get('connection_limit', 100),
+            limit_per_host=http.get('connection_limit_per_host', 10),
+            dns_cache_ttl=http.get('dns_cache_ttl', 300),
+            keepalive_timeout=http.get('keepalive_timeout', 30),
+        )
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        def counter(key):
+            async def _inc(session, ctx, params):
+                self.stats[key] += 1
+            return _inc
+
+        trace.on_request_start.append(counter('requests'))
+        trace.on_connection_create_end.append(counter('connections_created'))
+        trace.on_connection_reuseconn.append(counter('connections_reused'))
+        trace.on_dns_cache_hit.append(counter('dns_cache_hits'))
+        trace.on_dns_cache_miss.append(counter('dns_cache_misses'))
+        return trace
+
+    async def start(self):
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit, limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl, use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[self._trace_config()],
+        )
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HttpClient non démarré (appeler await start())")
+        return self._session
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.stats['connections_created'] + self.stats['connections_reused']
+        return self.stats['connections_reused'] / total if total else 0.0
+
+    def log_stats(self):
+        logger.info(f"HTTP: {self.stats} | réutilisation connexions: {self.reuse_ratio:.0%}")
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Module Job Queue Quantum Scanner v6.1
+File de jobs SQLite partagée par plusieurs workers (processus ou conteneurs) sur quantum.db.
+
+Un run (scan_runs) regroupe les projets à vérifier d'un scan, un job (scan_jobs) par projet.
+Les workers prennent des jobs sous bail (`lease_seconds`), prolongé tant qu'ils tournent ;
+un bail expiré (worker tué) rend le job à nouveau disponible. Le coordinateur signale de même
+sa présence tant qu'il alimente un run : sans heartbeat depuis `coordinator_timeout` secondes
+(coordinateur tué), le run est abandonné et les workers ne l'attendent plus. Le résultat n'est validé que
+si le worker détient toujours le bail, dans la même transaction que l'écriture du projet :
+chaque projet est traité exactement une fois par scan.
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from persistence import PRAGMAS, _PROJECT_SQL, _RATIO_SQL, project_rows
+
+_VERDICT_STATS = {"GO": "accepted", "REVIEW": "review", "REJECT": "rejected"}
+
+
+class JobQueue:
+    """Connexion dédiée (transactions immédiates, hors du tampon write-behind de ProjectStore)."""
+
+    def __init__(self, db_path: str = 'quantum.db', lease_seconds: float = 120, max_attempts: int = 3,
+                 worker_id: Optional[str] = None, busy_retry_s: float = 30.0, coordinator_timeout: float = 300):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.coordinator_timeout = coordinator_timeout
+        self.max_attempts = max_attempts
+        self.busy_retry_s = busy_retry_s
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.db: Optional[aiosqlite.Connection] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self.stats = {"claimed": 0, "completed": 0, "lost_leases": 0, "failed": 0, "reclaimed": 0, "busy_retries": 0}
+
+    @classmethod
+    def from_settings(cls, db_path: str, settings: Dict) -> "JobQueue":
+        cfg = settings.get('job_queue', {})
+        return cls(db_path, lease_seconds=cfg.get('lease_seconds', 120), max_attempts=cfg.get('max_attempts', 3),
+                   coordinator_timeout=cfg.get('coordinator_timeout', 300))
+
+    async def open(self):
+        """Le schéma (migration v3) est créé par ProjectStore.open()."""
+        if self.db is not None:
+            return
+        # isolation_level=None : les transactions sont explicites (BEGIN IMMEDIATE)
+        self.db = await aiosqlite.connect(self.db_path, isolation_level=None)
+        for pragma in PRAGMAS:
+            await self.db.execute(pragma)
+
+    async def close(self):
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+
+    @asynccontextmanager
+    async def _transaction(self):
+        """Transaction BEGIN IMMEDIATE exclusive sur la connexion (claim, complete et heartbeat sont concurrents).
+
+        Avec plusieurs processus, SQLite peut refuser le verrou d'écriture sans passer par
+        busy_timeout : BEGIN est alors retenté avec backoff pendant `busy_retry_s` secondes.
+        """
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            deadline = time.monotonic() + self.busy_retry_s
+            delay = 0.01
+            while True:
+                try:
+                    await self.db.execute("BEGIN IMMEDIATE")
+                    break
+                except sqlite3.OperationalError as e:
+                    if "locked" not in str(e) or time.monotonic() + delay > deadline:
+                        raise
+                    self.stats['busy_retries'] += 1
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                    delay = min(delay * 2, 0.5)
+            try:
+                yield
+                await self.db.execute("COMMIT")
+            except BaseException:
+                await self.db.execute("ROLLBACK")
+                raise
+
+    async def _scalar(self, sql: str, params: Tuple = ()) -> Any:
+        async with self.db.execute(sql, params) as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------
+    # Coordinateur
+    # ------------------------------------------------------------------
+
+    async def create_run(self, mode: str = "queue") -> int:
+        async with self._transaction():
+            cursor = await self.db.execute("INSERT INTO scan_runs (mode, heartbeat_at) VALUES (?, ?)", (mode, time.time()))
+        return cursor.lastrowid
+
+    async def heartbeat(self, run_id: int):
+        """Le coordinateur alimente toujours le run (appelé toutes les coordinator_timeout/3 secondes)."""
+        async with self._transaction():
+            await self.db.execute("UPDATE scan_runs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                                  (time.time(), run_id))
+
+    async def enqueue(self, run_id: int, jobs: List[Tuple[Dict, int]]) -> int:
+        """Met en file des (projet, priorité) pour un run (un projet déjà présent dans ce run est ignoré)."""
+        if not jobs:
+            return 0
+        async with self._transaction():
+            before = self.db.total_changes
+            await self.db.executemany(
+                "INSERT OR IGNORE INTO scan_jobs (run_id, name, source, payload, priority) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, p['name'], p['source'], json.dumps(p, default=str), priority) for p, priority in jobs])
+            return self.db.total_changes - before
+
+    async def close_enqueue(self, run_id: int):
+        """Plus aucun job ne sera ajouté : les workers s'arrêteront une fois la file vide."""
+        async with self._transaction():
+            await self.db.execute("UPDATE scan_runs SET enqueue_done = 1 WHERE id = ?", (run_id,))
+
+    async def run_stats(self, run_id: int) -> Dict[str, int]:
+        """Stats agrégées de tous les workers, au format de QuantumScanner.stats."""
+        stats = {"scanned": 0, "accepted": 0, "rejected": 0, "review": 0, "errors": 0}
+        async with self.db.execute("SELECT status, verdict, COUNT(*) FROM scan_jobs WHERE run_id = ? "
+                                   "GROUP BY status, verdict", (run_id,)) as cursor:
+            async for status, verdict, count in cursor:
+                if status == 'done':
+                    stats['scanned'] += count
+                    stats[_VERDICT_STATS.get(verdict, "rejected")] += count
+                elif status == 'failed':
+                    stats['errors'] += count
+        return stats
+
+    async def results(self, run_id: int) -> List[Tuple[Dict, Dict]]:
+        """(projet, analyse) des jobs terminés d'un run, pour l'archive des ratios."""
+        async with self.db.execute("SELECT payload, result FROM scan_jobs WHERE run_id = ? AND status = 'done' "
+                                   "AND result IS NOT NULL ORDER BY id", (run_id,)) as cursor:
+            return [(json.loads(payload), json.loads(result)) for payload, result in await cursor.fetchall()]
+
+    async def finish_run(self, run_id: int, scan_history_id: Optional[int] = None):
+        async with self._transaction():
+            await self.db.execute("UPDATE scan_runs SET status = 'finished', finished_at = CURRENT_TIMESTAMP, "
+                                  "scan_history_id = ? WHERE id = ?", (scan_history_id, run_id))
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    async def claim(self, limit: int, run_id: Optional[int] = None) -> List[Tuple[int, Dict]]:
+        """Prend jusqu'à `limit` jobs disponibles (en attente ou bail expiré), par priorité.
+
+        BEGIN IMMEDIATE pose le verrou d'écriture avant la lecture : deux workers ne
+        peuvent pas sélectionner les mêmes jobs.
+        """
+        now = time.time()
+        run_filter = "AND j.run_id = ?" if run_id is not None else ""
+        params = (now, self.max_attempts, *((run_id,) if run_id is not None else ()), limit)
+        async with self._transaction():
+            # Coordinateur disparu avant close_enqueue : le run ne sera jamais complété ni clos
+            abandoned = await self.db.execute(
+                "UPDATE scan_runs SET status = 'abandoned', finished_at = CURRENT_TIMESTAMP WHERE mode = 'queue' "
+                "AND status = 'running' AND enqueue_done = 0 AND COALESCE(heartbeat_at, 0) < ?",
+                (now - self.coordinator_timeout,))
+            if abandoned.rowcount:
+                logger.warning(f"{abandoned.rowcount} run(s) abandonné(s) : coordinateur sans heartbeat "
+                               f"depuis {self.coordinator_timeout:.0f}s")
+            # Bail expiré sur la dernière tentative (worker tué à chaque fois) : abandon du job
+            await self.db.execute(
+                "UPDATE scan_jobs SET status = 'failed', error = 'bail expiré', worker = NULL "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?", (now, self.max_attempts))
+            async with self.db.execute(
+                    "SELECT j.id, j.payload, j.status FROM scan_jobs j JOIN scan_runs r ON r.id = j.run_id "
+                    "WHERE r.mode = 'queue' AND r.status = 'running' AND (j.status = 'pending' OR (j.status = 'leased' AND j.lease_until < ?)) "
+                    f"AND j.attempts < ? {run_filter} ORDER BY j.priority, j.id LIMIT ?", params) as cursor:
+                rows = await cursor.fetchall()
+            if rows:
+                await self.db.executemany(
+                    "UPDATE scan_jobs SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?", [(self.worker_id, now + self.lease_seconds, job_id) for job_id, _, _ in rows])
+        reclaimed = sum(1 for _, _, status in rows if status == 'leased')
+        if reclaimed:
+            logger.warning(f"{reclaimed} job(s) repris après expiration du bail d'un autre worker")
+        self.stats['claimed'] += len(rows)
+        self.stats['reclaimed'] += reclaimed
+        return [(job_id, json.loads(payload)) for job_id, payload, _ in rows]
+
+    async def renew(self) -> int:
+        """Prolonge les baux détenus par ce worker (heartbeat)."""
+        async with self._transaction():
+            cursor = await self.db.execute("UPDATE scan_jobs SET lease_until = ? WHERE worker = ? AND status = 'leased'",
+                                           (time.time() + self.lease_seconds, self.worker_id))
+        return cursor.rowcount
+
+    async def complete(self, job_id: int, project: Dict, analysis: Dict) -> bool:
+        """Valide le job et écrit projet + ratios en une transaction, si le bail est toujours à nous.
+
+        False : le bail a expiré et un autre worker a repris le projet ; rien n'est écrit.
+        """
+        project_row, ratio_row = project_rows(project, analysis)
+        result = {"verdict": analysis['verdict'], "score": analysis['score'], "ratios": analysis.get('ratios')}
+        async with self._transaction():
+            cursor = await self.db.execute(
+                "UPDATE scan_jobs SET status = 'done', verdict = ?, score = ?, result = ?, lease_until = NULL, "
+                "finished_at = CURRENT_TIMESTAMP WHERE id = ? AND worker = ? AND status = 'leased'",
+                (analysis['verdict'], analysis['score'], json.dumps(result), job_id, self.worker_id))
+            owned = cursor.rowcount == 1
+            if owned:
+                await self.db.execute(_PROJECT_SQL, project_row)
+                if ratio_row:
+                    await self.db.execute(_RATIO_SQL, ratio_row)
+        self.stats['completed' if owned else 'lost_leases'] += 1
+        if not owned:
+            logger.warning(f"Bail perdu pour le job {job_id} ({project.get('name')}) : résultat ignoré")
+        return owned
+
+    async def fail(self, job_id: int, error: str):
+        """Erreur de traitement : le job repart en file, ou échoue après `max_attempts` tentatives."""
+        async with self._transaction():
+            await self.db.execute(
+                "UPDATE scan_jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_until = NULL, worker = NULL WHERE id = ? AND worker = ? AND status = 'leased'",
+                (self.max_attempts, error[:1000], job_id, self.worker_id))
+        self.stats['failed'] += 1
+
+    async def outstanding(self, run_id: Optional[int] = None) -> int:
+        """Jobs non terminés + runs encore en cours d'alimentation (0 = plus rien à faire).
+
+        Un run dont le coordinateur n'a plus donné signe de vie depuis `coordinator_timeout`
+        n'est plus attendu (claim le marque abandonné).
+        """
+        run_filter = "AND r.id = ?" if run_id is not None else ""
+        params = (run_id,) if run_id is not None else ()
+        alive = "(r.enqueue_done = 1 OR COALESCE(r.heartbeat_at, 0) >= ?)"
+        since = (time.time() - self.coordinator_timeout,)
+        jobs = await self._scalar(
+            "SELECT COUNT(*) FROM scan_jobs j JOIN scan_runs r ON r.id = j.run_id WHERE r.mode = 'queue' AND r.status = 'running' "
+            f"AND {alive} AND j.status IN ('pending', 'leased') {run_filter}", since + params)
+        feeding = await self._scalar(
+            f"SELECT COUNT(*) FROM scan_runs r WHERE r.mode = 'queue' AND r.status = 'running' AND r.enqueue_done = 0 "
+            f"AND {alive} {run_filter}", since + params)
+        return (jobs or 0) + (feeding or 0)
@@ -8,25 +8,44 @@ Implémentation complète du Prompt Absolu.
 
 import asyncio
 import aiohttp
-import aiosqlite
 import os
 import re
 import json
 import time
+import hashlib
 import traceback
 import sys
+import signal
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator, Awaitable, Callable, Set
 from loguru import logger
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from web3 import Web3
-import whois
-from tldextract import extract
-import numpy as np
-import pandas as pd
 import argparse
 import yaml
+from phishing_blacklist import phishing_blacklist
+from whois_cache import domain_age_resolver
+from pipeline import Pipeline, Stage
+from http_client import HttpClient
+from antiscam_api import AntiScamAPI
+from onchain import HolderDirectory, OnChainEnricher, parse_top_holders
+from scraping import HtmlScraper, ScrapeSpec
+from persistence import ProjectStore, project_fingerprint
+from job_queue import JobQueue
+from checkpoint import ScanCheckpoint
+from ratio_archive import RatioArchive
+from notifier import TelegramNotifier
+from alert_renderer import AlertRenderer
+from backtest import Backtester, grid_candidates, load_history, load_labels, sample_candidates, summarize
+from scoring import BatchScorer, ScoreResult
+from http_cache import ResponseCache
+from rate_limiter import AdaptiveRateLimiter, CircuitOpenError, parse_retry_after
+from metrics import metrics
+from sources import SourceRegistry, SourceScheduler
+from startup import StartupProfile, import_profile, lazy_module
+
+# Sous-systèmes lourds chargés au premier usage (démarrage à froid GitHub Actions)
+np = lazy_module("numpy")
+tldextract = lazy_module("tldextract")
 
 # CRITICAL PROTECTION: Force UTF-8 for GitHub Actions environment
 sys.stdout.reconfigure(encoding='utf-8')
@@ -40,7 +59,19 @@ os.makedirs("logs", exist_ok=True)
 os.makedirs("results", exist_ok=True)
 logger.add("logs/quantum_{time:YYYY-MM-DD}.log", rotation="1 day", retention="30 days", compression="zip")
 
-# Configuration des secrets et seuils (tirée de .env)
+def load_yaml_config(path: str = "config.yml") -> Dict:
+    """Charge config.yml (dict vide si absent ou invalide)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.warning(f"config.yml non chargé ({path}): {e}")
+        return {}
+
+SETTINGS = load_yaml_config()
+_SCAN_SETTINGS = SETTINGS.get('scan', {})
+
+# Configuration des secrets et seuils (tirée de .env, puis config.yml)
 CONFIG = {
     "TELEGRAM_BOT_TOKEN": os.getenv('TELEGRAM_BOT_TOKEN'),
     "TELEGRAM_CHAT_ID": os.getenv('TELEGRAM_CHAT_ID'),
@@ -49,15 +80,22 @@ CONFIG = {
     "REVIEW_SCORE": float(os.getenv('REVIEW_SCORE', 40)),
     "MAX_MARKET_CAP_EUR": float(os.getenv('MAX_MARKET_CAP_EUR', 210000)),
     "SCAN_INTERVAL": int(os.getenv('SCAN_INTERVAL_HOURS', 6)),
-    "API_DELAY": float(os.getenv('API_DELAY', 1.0)),
+    "API_DELAY": float(os.getenv('API_DELAY', _SCAN_SETTINGS.get('rate_limit_delay', 1.0))),
+    "SCAN_WORKERS": int(os.getenv('SCAN_WORKERS', _SCAN_SETTINGS.get('workers', 8))),
+    "QUEUE_SIZE": int(os.getenv('QUEUE_SIZE', _SCAN_SETTINGS.get('queue_size', 100))),
+    "SCORE_BATCH": int(os.getenv('SCORE_BATCH', _SCAN_SETTINGS.get('score_batch', 64))),
+    "RETRY_ATTEMPTS": int(os.getenv('RETRY_ATTEMPTS', _SCAN_SETTINGS.get('retry_attempts', 3))),
+    "MAX_FINGERPRINT_AGE_HOURS": float(os.getenv('MAX_FINGERPRINT_AGE_HOURS', _SCAN_SETTINGS.get('max_fingerprint_age_hours', 24))),
+    "METRICS_ENABLED": os.getenv('METRICS_ENABLED', str(SETTINGS.get('metrics', {}).get('enabled', True))).lower() in ('1', 'true', 'yes'),
+    "PROMETHEUS_FILE": os.getenv('PROMETHEUS_FILE', SETTINGS.get('metrics', {}).get('prometheus_file')),
     "INFURA_URL": os.getenv('INFURA_URL'),
     "COINLIST_API_KEY": os.getenv('COINLIST_API_KEY'),
     "TIER1_VCS": ["Binance Labs", "Coinbase Ventures", "a16z", "Paradigm", "Polychain", "Sequoia", "Pantera"],
     "TIER1_AUDITORS": ["CertiK", "PeckShield", "SlowMist", "Quantstamp", "OpenZeppelin"]
 }
 
-# Poids des 21 Ratios
-RATIO_WEIGHTS = {
+# Poids des 21 Ratios (config.yml ratios.weights prioritaire sur ces valeurs par défaut)
+_DEFAULT_RATIO_WEIGHTS = {
     "mc_fdmc": 0.15, "circ_vs_total": 0.08, "volume_mc": 0.07, "liquidity_ratio": 0.12,
     "whale_concentration": 0.10, "audit_score": 0.10, "vc_score": 0.08, "social_sentiment": 0.05,
     "dev_activity": 0.06, "market_sentiment": 0.03, "tokenomics_health": 0.04, "vesting_score": 0.03,
@@ -65,40 +103,94 @@ RATIO_WEIGHTS = {
     "product_maturity": 0.03, "revenue_generation": 0.02, "volatility": 0.02, "correlation": 0.01,
     "historical_performance": 0.02, "risk_adjusted_return": 0.01,
 }
+RATIO_WEIGHTS = {k: float(SETTINGS.get('ratios', {}).get('weights', {}).get(k, w)) for k, w in _DEFAULT_RATIO_WEIGHTS.items()}
 
 # ============================================================================
 # UTILS & NETWORK
 # ============================================================================
 
+# Chronomètres par étape (désactivés : no-op sans appel d'horloge)
+metrics.enabled = CONFIG["METRICS_ENABLED"]
+
+# Endpoints des launchpads (surchargeables, ex. serveur local de benchmarks/)
+BINANCE_LAUNCHPAD_URL = "https://launchpad.binance.com/en/api/projects"
+COINLIST_SALES_URL = "https://coinlist.co/api/v1/token_sales"
+POLKASTARTER_GRAPHQL_URL = "https://api.polkastarter.com/graphql"
+# Top holders d'un jeton (Ethplorer, clé publique "freekey") ; onchain.top_holders_url vide = désactivé
+TOP_HOLDERS_URL = SETTINGS.get('onchain', {}).get(
+    'top_holders_url', "https://api.ethplorer.io/getTopTokenHolders/{}?apiKey=freekey&limit=10")
+
+# Token bucket + circuit breaker par hôte : un launchpad throttlé ne bloque plus les autres
+host_limiter = AdaptiveRateLimiter.from_settings(SETTINGS, default_interval=CONFIG["API_DELAY"])
+
+# Cache disque des réponses (opt-in : http_cache.enabled ou --http-cache), revalidation ETag / Last-Modified
+response_cache = ResponseCache.from_settings(SETTINGS)
+
 async def fetch_with_retry(session: aiohttp.ClientSession, url: str, method: str = "GET", **kwargs) -> Optional[Any]:
-    """Fetch robuste avec retries et gestion des timeouts."""
-    for attempt in range(3):
+    """Fetch robuste avec retries, Retry-After, backoff avec jitter et circuit breaker par hôte."""
+    cache_key = cached = None
+    if response_cache.enabled:
+        cache_key = response_cache.key(method, url, kwargs)
+        cached = await response_cache.lookup(cache_key)
+        if cached is not None:
+            if response_cache.is_fresh(cached):
+                value = await response_cache.serve(cached)
+                if value is not None:
+                    return value
+                cached = None
+            else:
+                kwargs['headers'] = {**(kwargs.get('headers') or {}), **cached.validators()}
+    attempts = CONFIG["RETRY_ATTEMPTS"]
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        try:
+            probe = await host_limiter.acquire(url)
+        except CircuitOpenError:
+            logger.debug(f"Circuit ouvert, requête ignorée: {url}")
+            return None
         try:
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with session.request(method, url, timeout=timeout, **kwargs) as resp:
+            # Timeout par défaut : celui de la session partagée (scan.request_timeout)
+            async with session.request(method, url, **kwargs) as resp:
                 if 200 <= resp.status < 300:
+                    host_limiter.record_success(url)
+                    if cache_key is not None:
+                        return await response_cache.store(cache_key, url, resp.headers, await resp.text())
                     content_type = resp.headers.get('Content-Type', '')
                     if 'application/json' in content_type:
                         return await resp.json()
                     return await resp.text()
+                elif resp.status == 304 and cached is not None:  # Inchangé depuis la dernière réponse
+                    host_limiter.record_success(url)
+                    return await response_cache.revalidated(cached, resp.headers)
                 elif resp.status == 429: # Rate limit
-                    logger.warning(f"Rate limit hit for {url}. Waiting 15s.")
-                    await asyncio.sleep(15)
+                    delay = host_limiter.record_throttled(url, parse_retry_after(resp.headers.get('Retry-After')), attempt)
+                    logger.warning(f"Rate limit hit for {url}. Waiting {delay:.1f}s.")
+                    if last_attempt:
+                        return None
+                    await host_limiter.sleep(url, delay, "retry_after")
                     continue
                 else:
+                    if resp.status >= 500:
+                        host_limiter.record_failure(url)
+                    else:
+                        host_limiter.record_success(url)  # 4xx : l'hôte répond, pas de raison d'ouvrir le circuit
                     logger.warning(f"HTTP Error {resp.status} for {url}")
                     return None
         except Exception as e:
-            logger.warning(f"Retry {attempt+1}/3 for {url}: {e}")
-            await asyncio.sleep(2 ** attempt)
+            host_limiter.record_failure(url)
+            logger.warning(f"Retry {attempt+1}/{attempts} for {url}: {e}")
+            if not last_attempt:
+                await host_limiter.sleep(url, host_limiter.backoff_delay(attempt), "backoff")
+        finally:
+            # Requête de test annulée ou sans verdict (429) : le half-open n'attend pas une réponse qui ne viendra plus
+            if probe:
+                host_limiter.release_probe(url)
     return None
 
 # ============================================================================
 # ANTI-SCAM MODULE (Intégré)
 # ============================================================================
 
-PHISHING_LIST_URL = "https://raw.githubusercontent.com/MetaMask/eth-phishing-detect/master/src/blacklist.json"
-
 async def check_domain_safety(session: aiohttp.ClientSession, website_url: str) -> Tuple[int, bool, List[str]]:
     """Vérifie l'âge du domaine et la liste de phishing MetaMask."""
     flags = []
@@ -109,22 +201,24 @@ async def check_domain_safety(session: aiohttp.ClientSession, website_url: str)
         if not website_url or website_url.lower() == 'n/a':
             return 0, False, ["NO_WEBSITE"]
         
-        domain_name = extract(website_url).domain + '.' + extract(website_url).suffix
+        extracted = tldextract.extract(website_url)
+        domain_name = extracted.domain + '.' + extracted.suffix
         if not domain_name or domain_name == '.':
             return 0, False, ["INVALID_DOMAIN"]
 
-        # 1. WHOIS (Domain Age)
-        try:
-            w = whois.whois(domain_name)
-            creation_date = w.creation_date[0] if isinstance(w.creation_date, list) else w.creation_date
-            if creation_date and creation_date.year:
-                domain_age_days = (datetime.now() - creation_date.replace(tzinfo=None)).days
-        except Exception:
+        # 1. WHOIS (Domain Age) - thread pool + cache SQLite, ne bloque pas la boucle
+        with metrics.timer("whois"):
+            age = await domain_age_resolver.age_days(domain_name)
+        if age is None:
             flags.append("WHOIS_FAIL")
+        else:
+            domain_age_days = age
 
-        # 2. MetaMask Phishing List
-        data = await fetch_with_retry(session, PHISHING_LIST_URL)
-        if data and domain_name in data.get('blacklist', []):
+        # 2. MetaMask Phishing List (index en mémoire, rafraîchi au plus une fois par TTL)
+        with metrics.timer("blacklist"):
+            await phishing_blacklist.refresh(session)
+            listed = phishing_blacklist.is_blacklisted(extracted.fqdn or domain_name)
+        if listed:
             is_phishing = True
             flags.append("METAMASK_PHISHING")
             
@@ -146,66 +240,99 @@ async def check_domain_safety(session: aiohttp.ClientSession, website_url: str)
 class QuantumScanner:
     """Moteur principal du scanner crypto early-stage."""
 
-    def __init__(self):
+    def __init__(self, full_rescan: bool = False):
         logger.info("INITIALISATION QUANTUM ULTIME v6.1...")
         self.db_path = 'quantum.db'
+        # Scan incrémental : seuls les projets dont l'empreinte a changé sont re-vérifiés
+        self.full_rescan = full_rescan
+        # Changer les poids ou les seuils invalide toutes les empreintes
+        self.scoring_signature = hashlib.sha256(json.dumps(
+            [RATIO_WEIGHTS, CONFIG["GO_SCORE"], CONFIG["REVIEW_SCORE"]], sort_keys=True).encode()).hexdigest()
         
-        # Web3 init
-        infura_url = CONFIG["INFURA_URL"]
-        self.web3 = Web3(Web3.HTTPProvider(infura_url)) if infura_url else None
+        # Web3 (~1 s d'import) : construit au premier accès à self.web3, jamais pendant un scan
+        self._web3 = None
         
-        self.stats = {"scanned": 0, "accepted": 0, "rejected": 0, "review": 0, "errors": 0}
+        self.stats = self._new_stats()
+        # Time-to-first-verdict du scan en cours (secondes depuis le début du fetch)
+        self._scan_started: Optional[float] = None
+        self.first_verdict_s: Optional[float] = None
+        self.fetch_completed_s: Optional[float] = None
         
-        asyncio.run(self.init_db())
+        # Pool HTTP unique (keep-alive, cache DNS) partagé avec AntiScamAPI
+        self.http = HttpClient.from_settings(SETTINGS)
+        self.antiscam = AntiScamAPI.from_settings(SETTINGS, http=self.http)
+        # Lectures on-chain groupées en batch JSON-RPC sur l'endpoint du provider Web3
+        self.onchain = OnChainEnricher.from_settings(SETTINGS, self.http, CONFIG["INFURA_URL"])
+        # Top holders chargés en tâche de fond (quota Ethplorer) : l'étage verify n'attend que holders_wait
+        self.holders = HolderDirectory.from_settings(SETTINGS, lambda token: self.fetch_top_holders(self.http.session, token))
+        # Connexion SQLite persistante avec écriture différée par lots
+        self.store = ProjectStore.from_settings(self.db_path, SETTINGS)
+        # Historique colonnaire des ratios (volatilité / performance historique sans requête SQLite)
+        self.ratio_archive = RatioArchive.from_settings(SETTINGS)
+        # Points de reprise : un scan interrompu repart de sa dernière progression (--resume)
+        self.checkpoint = ScanCheckpoint.from_settings(self.store, SETTINGS)
+        # File de jobs partagée (--workers N / --worker), ouverte seulement dans ces modes
+        self.job_queue = JobQueue.from_settings(self.db_path, SETTINGS)
+        self._jobs_inflight = 0
+        # Mode daemon : empreintes vérifiées (enregistrées après persistance) et projets en cours
+        self._known: Dict = {}
+        self._pending: Dict = {}
+        self._job_finished: Optional[asyncio.Event] = None
+        # File d'envoi Telegram (limites par chat, retry_after, dédup via table notifications)
+        self.notifier = TelegramNotifier.from_settings(self.http, self.store, CONFIG['TELEGRAM_BOT_TOKEN'], SETTINGS)
+        self.renderer = AlertRenderer(RATIO_WEIGHTS)
+        self.scorer = BatchScorer(RATIO_WEIGHTS, CONFIG["GO_SCORE"], CONFIG["REVIEW_SCORE"], CONFIG['TIER1_AUDITORS'])
+        # Registre des sources : tier (launchpads.tier1/2/3) et cadence propre en mode daemon
+        self.sources = SourceRegistry.from_settings(SETTINGS, scan_interval_hours=CONFIG['SCAN_INTERVAL'])
+        self.sources.register("binance", lambda: self.fetch_binance_launchpad(self.http.session))
+        self.sources.register("coinlist", lambda: self.fetch_coinlist(self.http.session))
+        self.sources.register("polkastarter", lambda: self.fetch_polkastarter(self.http.session))
+        # Launchpads sans API JSON : pages HTML parsées dans un pool de processus
+        self.scraper = HtmlScraper.from_settings(SETTINGS)
+        for spec in self.scraper.specs:
+            self.sources.register(spec.key, lambda spec=spec: self.fetch_scraped(self.http.session, spec))
+
+    @property
+    def web3(self):
+        if self._web3 is None and CONFIG["INFURA_URL"]:
+            from web3 import Web3
+            self._web3 = Web3(Web3.HTTPProvider(CONFIG["INFURA_URL"]))
+        return self._web3
+
+    async def start(self):
+        """Initialise les ressources liées à la boucle d'événements (DB, pool HTTP)."""
+        await self.init_db()
+        if response_cache.enabled:
+            response_cache.prune()
+        await self.http.start()
+        await self.notifier.start()
         logger.success("SYSTEME OPERATIONNEL")
 
+    async def close(self):
+        """Vide le dernier lot DB et ferme les ressources (aussi sur annulation)."""
+        try:
+            await self.notifier.close()
+            await self.store.close()
+            await self.antiscam.close()
+            await self.holders.close()
+            await self.onchain.close()
+            await self.job_queue.close()
+            await domain_age_resolver.close()
+            self.scraper.close()
+        finally:
+            await self.http.close()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
     async def init_db(self):
-        """Initialisation des 7 tables SQLite (Prompt Ultime)"""
+        """Initialisation des 7 tables SQLite (Prompt Ultime) sur la connexion persistante"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # 7 Tables du Prompt Ultime
-                await db.execute('''CREATE TABLE IF NOT EXISTS projects (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, symbol TEXT, chain TEXT, 
-                    source TEXT, link TEXT, website TEXT, twitter TEXT, telegram TEXT, github TEXT,
-                    contract_address TEXT, pair_address TEXT, verdict TEXT, score REAL, reason TEXT,
-                    estimated_mc_eur REAL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, UNIQUE(name, source))''')
-                
-                await db.execute('''CREATE TABLE IF NOT EXISTS ratios (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, mc_fdmc REAL, 
-                    circ_vs_total REAL, volume_mc REAL, liquidity_ratio REAL, whale_concentration REAL, 
-                    audit_score REAL, vc_score REAL, social_sentiment REAL, dev_activity REAL, 
-                    market_sentiment REAL, tokenomics_health REAL, vesting_score REAL, 
-                    exchange_listing_score REAL, community_growth REAL, partnership_quality REAL,
-                    product_maturity REAL, revenue_generation REAL, volatility REAL, correlation REAL,
-                    historical_performance REAL, risk_adjusted_return REAL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES projects(id))''')
-
-                await db.execute('''CREATE TABLE IF NOT EXISTS scan_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, scan_start DATETIME, scan_end DATETIME,
-                    projects_found INTEGER, projects_accepted INTEGER, projects_rejected INTEGER,
-                    projects_review INTEGER, errors TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-
-                await db.execute('''CREATE TABLE IF NOT EXISTS social_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL,
-                    twitter_followers INTEGER, telegram_members INTEGER, github_stars INTEGER,
-                    github_commits_90d INTEGER, discord_members INTEGER, reddit_subscribers INTEGER,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (project_id) REFERENCES projects(id))''')
-
-                await db.execute('''CREATE TABLE IF NOT EXISTS blacklists (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, address TEXT UNIQUE, domain TEXT, reason TEXT, 
-                    source TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-                
-                await db.execute('''CREATE TABLE IF NOT EXISTS lockers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, address TEXT UNIQUE, name TEXT, chain TEXT,
-                    verified BOOLEAN DEFAULT 0, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-                
-                await db.execute('''CREATE TABLE IF NOT EXISTS notifications (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, channel TEXT,
-                    message_id TEXT, sent_at DATETIME DEFAULT CURRENT_TIMESTAMP, 
-                    FOREIGN KEY (project_id) REFERENCES projects(id))''')
-                
-                await db.commit()
+            await self.store.open()
         except Exception as e:
             logger.error(f"Erreur Init DB: {e}")
             
@@ -215,8 +342,7 @@ class QuantumScanner:
 
     async def fetch_binance_launchpad(self, session) -> List[Dict]:
         """Fetch Binance Launchpad (Tier 1)"""
-        url = "https://launchpad.binance.com/en/api/projects"
-        data = await fetch_with_retry(session, url)
+        data = await fetch_with_retry(session, BINANCE_LAUNCHPAD_URL)
         if not data: return []
         return [{
             "name": p.get("name", "Unknown"), "symbol": p.get("tokenTicker", "N/A"),
@@ -227,9 +353,8 @@ class QuantumScanner:
 
     async def fetch_coinlist(self, session) -> List[Dict]:
         """Fetch CoinList token sales (Tier 1)"""
-        url = "https://coinlist.co/api/v1/token_sales"
         headers = {'Authorization': f"Bearer {CONFIG['COINLIST_API_KEY']}"} if CONFIG.get('COINLIST_API_KEY') else {}
-        data = await fetch_with_retry(session, url, headers=headers)
+        data = await fetch_with_retry(session, COINLIST_SALES_URL, headers=headers)
         if not data: return []
         return [{
             "name": p.get("name"), "symbol": p.get("symbol"),
@@ -239,9 +364,8 @@ class QuantumScanner:
 
     async def fetch_polkastarter(self, session) -> List[Dict]:
         """Fetch Polkastarter (Tier 1)"""
-        url = "https://api.polkastarter.com/graphql"
         query = {"query": "{ projects(where: {status: \"upcoming\"}) { title slug token { symbol } fundraisingGoal } }"}
-        data = await fetch_with_retry(session, url, method="POST", json=query)
+        data = await fetch_with_retry(session, POLKASTARTER_GRAPHQL_URL, method="POST", json=query)
         if not data: return []
         return [{
             "name": p.get("title"), "symbol": p.get("token", {}).get("symbol"),
@@ -250,56 +374,104 @@ class QuantumScanner:
             "chain": "Polkadot"
         } for p in data.get("data", {}).get("projects", [])]
 
-    # ... (Ajout des 12+ autres fetchers pour la complétude du Prompt Ultime)
+    async def fetch_top_holders(self, session, token: str) -> Optional[List[str]]:
+        """Plus gros détenteurs du jeton (concentration mesurée on-chain par OnChainEnricher) ; None en erreur"""
+        if not TOP_HOLDERS_URL:
+            return []
+        try:
+            return parse_top_holders(await fetch_with_retry(session, TOP_HOLDERS_URL.format(token)))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Top holders {token}: {e}")
+            return None
 
-    async def fetch_all_sources(self) -> List[Dict]:
-        """Orchestre tous les fetchers (15+ sources)"""
-        logger.info("SCANNING 15+ SOURCES...")
-        async with aiohttp.ClientSession() as session:
-            tasks = [
-                self.fetch_binance_launchpad(session), self.fetch_coinlist(session), 
-                self.fetch_polkastarter(session), 
-                # Ajout des autres fetchers ici...
-                # Simuler 12 autres sources pour respecter le "15+" du prompt
-                asyncio.sleep(0.1, result=[]), # TrustPad
-                asyncio.sleep(0.1, result=[]), # Seedify
-                asyncio.sleep(0.1, result=[]), # RedKite
-                asyncio.sleep(0.1, result=[]), # BSCStation
-                asyncio.sleep(0.1, result=[]), # PAID Network
-                asyncio.sleep(0.1, result=[]), # DuckSTARTER
-                asyncio.sleep(0.1, result=[]), # DAO Maker
-                asyncio.sleep(0.1, result=[]), # DxSale
-                asyncio.sleep(0.1, result=[]), # Team.Finance
-                asyncio.sleep(0.1, result=[]), # UNCX
-                asyncio.sleep(0.1, result=[]), # Enjinstarter
-                asyncio.sleep(0.1, result=[]), # GameFi
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        all_projects = []
-        for res in results:
-            if isinstance(res, list): all_projects.extend(res)
-            elif isinstance(res, Exception): logger.error(f"Erreur Fetcher: {res}")
+    async def fetch_scraped(self, session, spec: ScrapeSpec) -> List[Dict]:
+        """Fetch d'un launchpad HTML (TrustPad, Seedify, DAO Maker...) : I/O ici, parsing dans le pool"""
+        html = await fetch_with_retry(session, spec.url, headers={'Accept': 'text/html'})
+        return await self.scraper.parse(html, spec)
+
+    async def stream_sources(self, skip_sources: Optional[Set[str]] = None,
+                             on_fetched: Optional[Callable[[str, List[Dict]], Awaitable[None]]] = None) -> AsyncIterator[Dict]:
+        """Orchestre tous les fetchers (15+ sources) en flux : chaque projet est produit dès que
+        sa source répond, dédupliqué à la volée ; le launchpad le plus lent ne retarde plus les autres.
+
+        `skip_sources` ne sont pas fetchées ; `on_fetched(source, projets)` est attendu avant de les produire."""
+        specs = [spec for spec in self.sources if spec.name not in (skip_sources or ())]
+        logger.info(f"SCANNING {len(specs)} SOURCES...")
+
+        async def fetch(spec):
+            try:
+                return spec.name, await metrics.track(f"fetch_{spec.name}", spec.fetcher())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erreur Fetcher {spec.name}: {e}")
+                return spec.name, None
+
+        coros = [fetch(spec) for spec in specs]
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(c) for c in coros]
+        pending = set(tasks)
 
-        # Deduplication
-        unique = {f"{p['name']}_{p['source']}": p for p in all_projects if p.get('name')}.values()
-        logger.info(f"Projets uniques trouvés: {len(unique)}")
-        return list(unique)
+        def _fetched(task):
+            # Fin réelle du fetch (indépendante de la vitesse du consommateur)
+            pending.discard(task)
+            if not pending:
+                self.fetch_completed_s = time.monotonic() - started
+                metrics.observe("fetch_all", self.fetch_completed_s)
+
+        for task in tasks:
+            task.add_done_callback(_fetched)
+        if not tasks:  # toutes les sources viennent d'un point de reprise
+            self.fetch_completed_s = 0.0
+        seen = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                source, res = await next_done
+                if res is None:
+                    continue
+                if on_fetched is not None:
+                    await on_fetched(source, res)
+                # Deduplication à la volée
+                for p in res:
+                    key = (p.get('name'), p.get('source'))
+                    if not p.get('name') or key in seen:
+                        continue
+                    seen.add(key)
+                    yield p
+        finally:
+            # Consommateur arrêté en route (annulation, erreur) : on n'abandonne pas de fetcher en vol
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Projets uniques trouvés: {len(seen)}")
+
+    async def fetch_all_sources(self) -> List[Dict]:
+        """Tous les projets dédupliqués (attend la fin de toutes les sources)"""
+        return [p async for p in self.stream_sources()]
 
     # ========================================================================
     # 🛡️ ANALYSE & LOGIQUE
     # ========================================================================
 
-    async def verify_project(self, project: Dict) -> Dict:
-        """Vérification complète du projet (Anti-Scam, Ratios, Verdict)"""
-        self.stats['scanned'] += 1
-        
+    async def enrich_project(self, project: Dict) -> Tuple[Dict, List[str]]:
+        """Anti-scam et enrichissement d'un projet (I/O) ; ratios et verdict sont calculés par lot (score_batch)"""
+        onchain = bool(project.get('contract_address') and self.onchain.enabled)
+        if onchain and not project.get('top_holders'):
+            self.holders.prefetch(project['contract_address'])  # chargé pendant les contrôles anti-scam
         # 1. Anti-Scam Check
-        async with aiohttp.ClientSession() as session:
-            domain_age_days, is_phishing, domain_flags = await check_domain_safety(session, project.get('website', 'n/a'))
+        domain_age_days, is_phishing, domain_flags = await check_domain_safety(self.http.session, project.get('website', 'n/a'))
         
         flags = domain_flags
         
+        # Bases anti-scam (même pool HTTP) si une adresse de contrat est connue
+        if project.get('contract_address'):
+            with metrics.timer("antiscam"):
+                scam_check = await self.antiscam.check_address(project['contract_address'])
+            if scam_check.get('is_scam'):
+                flags.append("ANTISCAM_LISTED")
+        
         # Simulation de données enrichies pour le calcul des 21 ratios
         enriched_data = {
             "domain_age_days": domain_age_days,
@@ -322,232 +494,610 @@ class QuantumScanner:
             "circ_supply": 2000000,
         }
         project.update(enriched_data)
+        # Valeurs mesurées on-chain (supply, owner, réserves LP, top holders) à la place des valeurs simulées
+        if onchain:
+            with metrics.timer("onchain"):
+                if not project.get('top_holders'):
+                    project['top_holders'] = await self.holders.get(project['contract_address'])
+                project.update(await self.onchain.enrich(project))
+        # Volatilité et performance réelles dès que le projet a assez de scans archivés
+        with metrics.timer("history"):
+            project.update(self.ratio_archive.history_features(project['name'], project['source']))
 
-        # 2. Hard Reject Rules (Critiques)
-        if "DOMAIN_TOO_YOUNG_REJECT" in flags:
-            return {"verdict": "REJECT", "score": 0, "reason": "Site web < 7 jours."}
-        if "METAMASK_PHISHING" in flags:
-            return {"verdict": "REJECT", "score": 0, "reason": "Phishing MetaMask."}
-        
-        # 3. Calculate 21 Ratios
-        ratios = self.calculate_ratios(project)
-        score = sum(ratios[k] * RATIO_WEIGHTS.get(k, 0) for k in ratios) * 100
-        
-        # 4. Verdict Final
-        verdict = "REJECT"
-        if score >= CONFIG["GO_SCORE"] and not flags:
-            verdict = "GO"
-            self.stats['accepted'] += 1
-        elif score >= CONFIG["REVIEW_SCORE"] or flags:
-            verdict = "REVIEW"
-            self.stats['review'] += 1
-        else:
-            self.stats['rejected'] += 1
-        
-        return {
-            "verdict": verdict, "score": score, "ratios": ratios, 
-            "reason": f"Score: {score:.1f} | Flags: {', '.join(flags) or 'Aucun'}",
-            "flags": flags
-        }
+        return project, flags
 
-    def calculate_ratios(self, p: Dict) -> Dict:
-        """Calcul des 21 ratios financiers selon les formules exactes du Prompt."""
-        r = {}
-        
-        # Données de base
-        mc = p.get('mc', 1)
-        fdv = p.get('fdv', 1)
-        supply = p.get('total_supply', 1)
-        circ_supply = p.get('circ_supply', 1)
-        volume_24h = p.get('volume_24h', 0)
-        lp_reserves_usd = p.get('lp_reserves_usd', 0)
-        top10_concentration = p.get('top10_concentration', 0.5)
-        
-        # 6 Ratios CRITIQUES (Formules exactes)
-        r['mc_fdmc'] = min(1.0, mc / fdv) if fdv > 0 else 0.5 # 1. MC / FDV
-        r['circ_vs_total'] = min(1.0, circ_supply / supply) # 2. Circ / Total
-        r['volume_mc'] = min(1.0, volume_24h / mc) if mc > 0 else 0.1 # 3. Vol / MC
-        r['liquidity_ratio'] = min(1.0, lp_reserves_usd / mc) if mc > 0 else 0.1 # 4. LP / MC
-        r['whale_concentration'] = 1.0 - min(1.0, top10_concentration) # 5. 1 - Top10%
-        r['audit_score'] = 1.0 if p.get('audit_firm') in CONFIG['TIER1_AUDITORS'] else 0.5 # 6. Audit 0-1
-        r['vc_score'] = min(1.0, len(p.get('backers', [])) * 0.33) # 7. VC Score
-        
-        # 14 Ratios SIMULÉS/COMPLÉTÉS (Logique pour l'exhaustivité)
-        r['social_sentiment'] = min(1.0, p.get('social_followers', 0) / 100000) # 8. 
-        r['dev_activity'] = min(1.0, p.get('github_commits', 0) / 100) # 9.
-        r['market_sentiment'] = 0.5 # 10. (Nécessite données externes)
-        r['tokenomics_health'] = 1.0 if p.get('owner_renounced') and p.get('lp_locked') else 0.2 # 11.
-        r['vesting_score'] = 0.7 # 12. (Simulé)
-        r['exchange_listing_score'] = 0.5 # 13. (Simulé)
-        r['community_growth'] = 0.6 # 14. (Simulé)
-        r['partnership_quality'] = 0.8 if len(p.get('backers', [])) > 0 else 0.2 # 15.
-        r['product_maturity'] = 1.0 if p.get('contract_verified') else 0.5 # 16.
-        r['revenue_generation'] = 0.5 # 17. (Simulé)
-        r['volatility'] = 1.0 - p.get('volatility_score', 0.5) # 18. (Inversé: 1.0=Low Vol, 0.0=High Vol)
-        r['correlation'] = 0.5 # 19. (Simulé)
-        r['historical_performance'] = 0.5 # 20. (Simulé)
-        r['risk_adjusted_return'] = 0.5 # 21. (Simulé)
-        
-        return r
+    def score_projects(self, projects: List[Dict], flags: Optional[List[List[str]]] = None) -> ScoreResult:
+        """Scoring vectorisé de N projets enrichis (ratios, scores, verdicts)."""
+        flags = flags or [[] for _ in projects]
+        has_flags = np.array([bool(f) for f in flags], dtype=bool)
+        hard_reject = np.array([bool({"DOMAIN_TOO_YOUNG_REJECT", "METAMASK_PHISHING"} & set(f)) for f in flags], dtype=bool)
+        return self.scorer.score(BatchScorer.columns_from_projects(projects), has_flags, hard_reject)
+
+    def score_batch(self, enriched: List[Tuple[Dict, List[str]]]) -> List[Dict]:
+        """Ratios, scores et verdicts d'un lot de projets enrichis, en une passe BatchScorer."""
+        flags = [f for _, f in enriched]
+        with metrics.timer("ratios"):
+            result = self.score_projects([p for p, _ in enriched], flags)
+        analyses = []
+        for project_flags, ratios, score, verdict in zip(flags, result.ratio_dicts(), result.scores.tolist(),
+                                                         result.verdicts.tolist()):
+            # Rejets durs (critiques) : ni ratios ni score
+            if "DOMAIN_TOO_YOUNG_REJECT" in project_flags:
+                analyses.append({"verdict": "REJECT", "score": 0, "reason": "Site web < 7 jours."})
+            elif "METAMASK_PHISHING" in project_flags:
+                analyses.append({"verdict": "REJECT", "score": 0, "reason": "Phishing MetaMask."})
+            else:
+                analyses.append({
+                    "verdict": verdict, "score": score, "ratios": ratios,
+                    "reason": f"Score: {score:.1f} | Flags: {', '.join(project_flags) or 'Aucun'}",
+                    "flags": project_flags
+                })
+        return analyses
 
     # ========================================================================
     # 📨 TELEGRAM (FORMAT ULTIME & SÉCURISÉ)
     # ========================================================================
 
     async def send_telegram(self, project: Dict, analysis: Dict):
-        """Envoi alerte Telegram (Format complet du Prompt)"""
+        """Alerte Telegram (Format complet du Prompt), mise en file d'envoi"""
         verdict = analysis['verdict']
-        if not self.bot_token or verdict == "REJECT": return
+        if not self.notifier.enabled or verdict == "REJECT": return
         
         chat_id = CONFIG['TELEGRAM_CHAT_ID'] if verdict == 'GO' else CONFIG['TELEGRAM_CHAT_REVIEW']
         
-        # Strict MarkdownV2 escape function (CRITIQUE pour éviter SyntaxError dans Telegram)
-        def esc(t): 
-            return str(t).replace('.', '\.').replace('-', '\-').replace('!', '\!').replace('(', '\(').replace(')', '\)').replace('=', '\=').replace('+', '\+').replace('|', '\|').replace('[', '\[').replace(']', '\]').replace('{', '\{').replace('}', '\}')
+        # Gabarit MarkdownV2 préparé une fois, échappement en une passe (alert_renderer)
+        if self.notifier.digest:
+            msg = self.renderer.digest_entry(project, analysis)
+        else:
+            msg = self.renderer.alert(project, analysis)
+        # Mise en file non bloquante : envoi, limites Telegram, digest et dédup gérés par le notifier
+        self.notifier.enqueue(chat_id, msg, project, analysis)
 
-        ratios = analysis['ratios']
-        
-        # Calcul des 5 meilleurs ratios pondérés
-        weighted_ratios = {k: v * RATIO_WEIGHTS.get(k, 0) for k, v in ratios.items()}
-        top_5 = sorted(weighted_ratios.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_str = "\n".join([f"• {esc(k)}: {ratios.get(k)*100:.0f}% \(Poids: {RATIO_WEIGHTS.get(k)*100:.0f}\%\)" for k,w in top_5])
+    # ========================================================================
+    # 🔄 ORCHESTRATION & DAEMON
+    # ========================================================================
 
-        # Codes Unicode sécurisés pour les emojis (IMPORTANT)
-        # 🌌=\U0001F30C, 📊=\U0001F4CA, 🎯=\U0001F3AF, 🚀=\U0001F680, 💰=\U0001F4B0, 💧=\U0001F4A7, 🛡️=\U0001F6E1, 👥=\U0001F465, 💻=\U0001F4BB, 🔗=\U0001F517, ⚠️=\U000026A0\ufe0f
-        
-        # Message construction (Format Ultime du Prompt)
-        msg = f"""
-\U0001F30C *QUANTUM SCAN \- {esc(project.get('name', 'N/A'))} \({esc(project.get('symbol', 'N/A'))}\)*
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {"scanned": 0, "accepted": 0, "rejected": 0, "review": 0, "errors": 0, "skipped": 0}
 
-\U0001F4CA *SCORE: {analysis['score']:.1f}/100* \| \U0001F3AF *VERDICT:* {esc(verdict)}
-\U0001F680 *PHASE: ICO/IDO/PRE\-TGE*
+    def _needs_verification(self, p: Dict, known: Dict) -> bool:
+        """Calcule l'empreinte du projet ; False s'il est inchangé et vérifié récemment."""
+        p['fingerprint'] = project_fingerprint(p, self.scoring_signature)
+        if self.full_rescan:
+            return True
+        previous = known.get((p['name'], p['source']))
+        if previous is None or previous[0] != p['fingerprint']:
+            return True
+        # Rafraîchissement forcé au-delà de max_fingerprint_age_hours (0 = jamais)
+        max_age = CONFIG["MAX_FINGERPRINT_AGE_HOURS"]
+        verified_at = previous[1]
+        return bool(max_age) and (verified_at is None or datetime.now() - verified_at > timedelta(hours=max_age))
 
----
+    def _record_verdict(self, analysis: Dict):
+        """Comptabilise un verdict (appel synchrone : aucun entrelacement possible entre workers)."""
+        if self.first_verdict_s is None and self._scan_started is not None:
+            self.first_verdict_s = time.monotonic() - self._scan_started
+            metrics.observe("time_to_first_verdict", self.first_verdict_s)
+        self.stats['scanned'] += 1
+        key = {"GO": "accepted", "REVIEW": "review"}.get(analysis['verdict'], "rejected")
+        self.stats[key] += 1
 
-\U0001F4B0 *FINANCIERS*
-• Hard Cap: {esc(project.get('hard_cap_usd', 0)):,.0f} €
-• MC Estimé: {esc(project.get('mc', 0)):,.0f} €
-• Potentiel: x{esc(analysis['score'] / 50):.1f}
+    def _on_stage_error(self, stage: Stage, item, error: BaseException):
+        project = next((x for x in item if isinstance(x, dict)), {}) if isinstance(item, tuple) else item
+        self._pending.pop((project.get('name'), project.get('source')), None)
+        logger.error(f"Erreur étage {stage.name} pour {project.get('name')}: "
+                     f"{''.join(traceback.format_exception(type(error), error, error.__traceback__))}")
+        self.stats['errors'] += 1
 
----
+    async def _stage_verify(self, project: Dict):
+        with metrics.timer("verify"):
+            return await self.enrich_project(project)
 
-\U0001F3AF *TOP 5 RATIOS*
-{esc(top_str)}
+    async def _stage_score(self, items: List[Tuple[Dict, List[str]]]):
+        analyses = self.score_batch(items)
+        for analysis in analyses:
+            self._record_verdict(analysis)
+        return [(project, analysis) for (project, _), analysis in zip(items, analyses)]
 
----
+    async def _stage_persist(self, item):
+        project = item[0]
+        key = (project['name'], project['source'])
+        saved = await self.save_project(*item)
+        self.ratio_archive.append(*item)
+        # Daemon : l'empreinte n'est retenue qu'une fois le projet persisté, sinon il sera re-vérifié
+        if self._pending.get(key) == project['fingerprint']:
+            del self._pending[key]
+            if saved:
+                self._known[key] = (project['fingerprint'], datetime.now())
+        return item
 
-\U0001F6E1 *SÉCURITÉ*
-• Audit: {esc(project.get('audit_firm', 'Absent'))}
-• Domain Age: {esc(project.get('domain_age_days', 0))} jours
+    async def _stage_notify(self, item):
+        with metrics.timer("notify"):
+            await self.send_telegram(*item)
 
----
+    def build_pipeline(self, prioritized: bool = False) -> Pipeline:
+        """Pipeline verify -> score (par lots) -> persist -> notify avec files bornées entre étages."""
+        return Pipeline([
+            Stage("verify", self._stage_verify, workers=CONFIG["SCAN_WORKERS"]),
+            Stage("score", self._stage_score, batch_size=CONFIG["SCORE_BATCH"]),
+            Stage("persist", self._stage_persist, workers=1),
+            Stage("notify", self._stage_notify, workers=1),
+        ], queue_size=CONFIG["QUEUE_SIZE"], on_error=self._on_stage_error, prioritized=prioritized)
 
-\U000026A0\ufe0f *RED FLAGS:* {esc(", ".join(analysis.get('flags', [])) or "Aucun ✅")}
+    async def scan(self, resume: bool = False):
+        """Scan principal (`resume` : reprend le dernier scan interrompu là où il s'était arrêté)"""
+        start_time = datetime.now()
+        self.stats = self._new_stats()
+        host_limiter.reset_stats()
+        response_cache.reset_stats()
+        self.antiscam.reset_stats()
+        metrics.begin_scan()
+        known = await self.store.load_fingerprints()
+        self._scan_started = time.monotonic()
+        self.first_verdict_s = self.fetch_completed_s = None
+        checkpoint = self.checkpoint
+        run_id = await checkpoint.begin(resume)
+        
+        # La vérification démarre dès la première source, pendant que les autres répondent
+        found = 0
+        pipeline = self.build_pipeline()
+        await pipeline.start()
+        try:
+            if checkpoint.resumed:
+                found = await self._replay_checkpoint(pipeline, known)
+            async for p in self.stream_sources(skip_sources=checkpoint.sources_done, on_fetched=checkpoint.record_fetched):
+                found += 1
+                if not self._needs_verification(p, known):
+                    self.stats['skipped'] += 1
+                    continue
+                await pipeline.submit(p)
+            await pipeline.join()
+        except BaseException:
+            await pipeline.cancel()
+            if run_id is not None:
+                logger.warning(f"Scan {run_id} interrompu : reprise possible avec --resume")
+            raise
 
----
+        if self.first_verdict_s is not None:
+            # En mode lot, aucun verdict n'était possible avant la fin du fetch complet
+            logger.info(f"Premier verdict après {self.first_verdict_s:.2f}s "
+                        f"(fetch de toutes les sources terminé après {self.fetch_completed_s:.2f}s)")
+        if checkpoint.resumed:
+            self._log_resume_savings()
+        scan_id = await self._close_window(start_time, found)
+        await checkpoint.finish(scan_id)
 
-\U0001F517 *LIENS*
-\[Launchpad]({esc(project.get('link', ''))}) | \[Site]({esc(project.get('website', ''))})
+    async def _replay_checkpoint(self, pipeline: Pipeline, known: Dict) -> int:
+        """Reprise : projets faits comptés sans re-vérification (alertes rejouées, dédupliquées par le
+        notifier), projets en attente des sources déjà fetchées soumis au pipeline."""
+        checkpoint = self.checkpoint
+        checkpoint.stats['sources_skipped'] = len(checkpoint.sources_done)
+        enqueued = self.notifier.stats['enqueued']
+        for project, analysis in checkpoint.completed.values():
+            self.stats['scanned'] += 1
+            self.stats[{"GO": "accepted", "REVIEW": "review"}.get(analysis['verdict'], "rejected")] += 1
+            await self.send_telegram(project, analysis)
+        checkpoint.stats['verifications_saved'] = len(checkpoint.completed)
+        checkpoint.stats['alerts_replayed'] = self.notifier.stats['enqueued'] - enqueued
+        for p in checkpoint.pending.values():
+            if not self._needs_verification(p, known):
+                self.stats['skipped'] += 1
+                continue
+            await pipeline.submit(p)
+        checkpoint.stats['projects_replayed'] = len(checkpoint.completed) + len(checkpoint.pending)
+        return checkpoint.stats['projects_replayed']
 
-\_ID: {esc(str(time.time()))} \| {esc(datetime.now().strftime('%Y-%m-%d %H:%M'))}\_
-"""
-        try:
-            url = f"https://api.telegram.org/bot{CONFIG['TELEGRAM_BOT_TOKEN']}/sendMessage"
-            async with aiohttp.ClientSession() as session:
-                resp = await session.post(url, json={
-                    "chat_id": chat_id, 
-                    "text": msg, 
-                    "parse_mode": "MarkdownV2",
-                    "disable_web_page_preview": True
-                })
-                response_data = await resp.json()
-                if not response_data.get('ok'):
-                    logger.error(f"Telegram API Error: {response_data}")
-            logger.info(f"Alert sent [{verdict}] for: {project.get('name')}")
-        except Exception as e:
-            logger.error(f"Telegram Fail: {e}")
+    def _log_resume_savings(self):
+        """Travail évité par la reprise (durée estimée avec le temps moyen de vérification de ce scan)."""
+        saved = self.checkpoint.stats
+        verify_mean_s = metrics.summary().get("verify", {}).get("mean_s", 0.0)
+        logger.info(f"Reprise du scan {self.checkpoint.run_id}: {saved['sources_skipped']} sources non refetchées, "
+                    f"{saved['projects_replayed']} projets relus du point de reprise, "
+                    f"{saved['verifications_saved']} vérifications évitées (~{saved['verifications_saved'] * verify_mean_s:.1f}s), "
+                    f"{saved['alerts_replayed']} alertes non parties renvoyées")
 
-    # ========================================================================
-    # 🔄 ORCHESTRATION & DAEMON
-    # ========================================================================
+    async def _close_window(self, start_time: datetime, found: int) -> Optional[int]:
+        """Bilan d'un scan (ou d'une fenêtre du daemon) : logs, métriques, scan_history, Prometheus."""
+        duration = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Scan terminé en {duration:.0f}s. Stats: {self.stats}")
+        logger.info(f"Incrémental: {self.stats['skipped']} projets inchangés ignorés, {self.stats['scanned']} recalculés")
+        logger.info(f"Telegram: {self.notifier.stats}")
+        logger.info(f"Cache anti-scam: {self.antiscam.cache_stats()}")
+        for provider, counters in self.antiscam.provider_stats().items():
+            if counters['requests'] or counters['fast_failed'] or counters['skipped']:
+                logger.info(f"Anti-scam [{provider}]: {counters}")
+        if self.onchain.enabled:
+            logger.info(f"On-chain (JSON-RPC): {self.onchain.stats}, top holders: {self.holders.stats}")
+        self.http.log_stats()
+        for host, counters in host_limiter.report().items():
+            logger.info(f"Rate limit [{host}]: {counters}")
+        if response_cache.enabled:
+            logger.info(f"Cache HTTP: {response_cache.report()}")
+        stage_metrics = metrics.end_scan()
+        metrics.log_summary(stage_metrics)
+        scan_id = await self.save_scan_history(found, duration, stage_metrics)
+        self.ratio_archive.commit_scan(scan_id)
+        if CONFIG["PROMETHEUS_FILE"] and metrics.enabled:
+            metrics.write_prometheus(CONFIG["PROMETHEUS_FILE"], gauges={
+                "last_scan_duration_seconds": round(duration, 3),
+                "last_scan_timestamp_seconds": int(time.time()),
+                **{f"last_scan_projects_{k}": v for k, v in self.stats.items()},
+                **({"last_scan_http_cache_hit_ratio": response_cache.report()['hit_ratio'],
+                    "last_scan_http_cache_bytes_saved": response_cache.stats['bytes_saved']}
+                   if response_cache.enabled else {}),
+            })
+        return scan_id
 
-    async def scan(self):
-        """Scan principal"""
+    # ------------------------------------------------------------------
+    # Mode file de jobs : un coordinateur alimente scan_jobs, N workers la vident
+    # ------------------------------------------------------------------
+
+    async def scan_with_workers(self, workers: int):
+        """Scan réparti : ce processus fetch et met en file, `workers` processus locaux vérifient.
+
+        Les stats de tous les workers sont agrégées depuis scan_jobs dans scan_history.
+        """
         start_time = datetime.now()
-        projects = await self.fetch_all_sources()
-        
-        for p in projects:
+        self.stats = self._new_stats()
+        host_limiter.reset_stats()
+        response_cache.reset_stats()
+        self.antiscam.reset_stats()
+        metrics.begin_scan()
+        await self.job_queue.open()
+        known = await self.store.load_fingerprints()
+        run_id = await self.job_queue.create_run()
+        logger.info(f"Scan réparti (run {run_id}) : {workers} workers")
+        procs = [await asyncio.create_subprocess_exec(*self.worker_command(run_id)) for _ in range(workers)]
+        found = skipped = enqueued = 0
+        batch: List[Tuple[Dict, int]] = []
+        # Heartbeat du run tant qu'il est alimenté : tué ici, le run est abandonné et les workers s'arrêtent
+        heartbeat = asyncio.create_task(self._coordinator_heartbeat(run_id), name="run-heartbeat")
+        try:
+            async for p in self.stream_sources():
+                found += 1
+                if not self._needs_verification(p, known):
+                    skipped += 1
+                    continue
+                batch.append((p, self.sources.tiers.get(p['source'].lower(), 3)))
+                if len(batch) >= CONFIG["SCAN_WORKERS"]:
+                    enqueued += await self.job_queue.enqueue(run_id, batch)
+                    batch = []
+            enqueued += await self.job_queue.enqueue(run_id, batch)
+            await self.job_queue.close_enqueue(run_id)
+            heartbeat.cancel()
+            logger.info(f"Run {run_id}: {enqueued} jobs en file, {skipped} projets inchangés")
+            codes = await asyncio.gather(*(proc.wait() for proc in procs))
+            # Worker mort en route : ses baux expirent et le coordinateur termine la file lui-même
+            if await self.job_queue.outstanding(run_id):
+                logger.warning(f"Workers terminés (codes {codes}) avec des jobs restants : reprise locale")
+                await self.run_worker(run_id, standalone=False)
+        except BaseException:
+            for proc in procs:
+                if proc.returncode is None:
+                    proc.terminate()
+            await asyncio.gather(*(proc.wait() for proc in procs), return_exceptions=True)
+            raise
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        self.stats = {**await self.job_queue.run_stats(run_id), "skipped": skipped}
+        for project, result in await self.job_queue.results(run_id):
+            self.ratio_archive.append(project, result)
+        scan_id = await self._close_window(start_time, found)
+        await self.job_queue.finish_run(run_id, scan_id)
+
+    def worker_command(self, run_id: int) -> List[str]:
+        """Ligne de commande d'un worker local (même interpréteur, même répertoire de travail)."""
+        return [sys.executable, os.path.abspath(__file__), '--worker', '--run-id', str(run_id)]
+
+    async def run_worker(self, run_id: Optional[int] = None, standalone: bool = True):
+        """Worker : prend des jobs sous bail, les vérifie, valide et notifie, jusqu'à file vide.
+
+        Sans `run_id`, sert tous les runs en cours (workers lancés à part, ex. conteneurs).
+        """
+        await self.job_queue.open()
+        if standalone:
+            self.stats = self._new_stats()
+            metrics.begin_scan()
+        capacity = 2 * CONFIG["SCAN_WORKERS"]
+        poll_interval = SETTINGS.get('job_queue', {}).get('poll_interval', 1.0)
+        self._jobs_inflight = 0
+        self._job_finished = asyncio.Event()
+        pipeline = Pipeline([
+            Stage("verify", self._stage_job_verify, workers=CONFIG["SCAN_WORKERS"]),
+            Stage("score", self._stage_job_score, batch_size=CONFIG["SCORE_BATCH"]),
+            Stage("commit", self._stage_job_commit, workers=1),
+            Stage("notify", self._stage_notify, workers=1),
+        ], queue_size=CONFIG["QUEUE_SIZE"], on_error=self._on_stage_error)
+        await pipeline.start()
+        heartbeat = asyncio.create_task(self._renew_leases(), name="lease-heartbeat")
+        try:
+            while True:
+                # Pas plus de `capacity` jobs sous bail à la fois : les autres workers se partagent le reste
+                if self._jobs_inflight >= capacity:
+                    self._job_finished.clear()
+                    await self._job_finished.wait()
+                    continue
+                jobs = await self.job_queue.claim(capacity - self._jobs_inflight, run_id)
+                for job in jobs:
+                    self._jobs_inflight += 1
+                    await pipeline.submit(job)
+                if jobs:
+                    continue
+                if not await self.job_queue.outstanding(run_id):
+                    break
+                await asyncio.sleep(poll_interval)
+            await pipeline.join()
+        except BaseException:
+            await pipeline.cancel()
+            raise
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+        logger.info(f"Worker {self.job_queue.worker_id}: {self.job_queue.stats} | {self.stats}")
+        if standalone:
+            metrics.log_summary(metrics.end_scan())
+
+    async def _renew_leases(self):
+        while True:
+            await asyncio.sleep(self.job_queue.lease_seconds / 3)
             try:
-                analysis = await self.verify_project(p)
-                await self.save_project(p, analysis)
-                await self.send_telegram(p, analysis)
-                await asyncio.sleep(CONFIG.get('API_DELAY', 1.0))
+                await self.job_queue.renew()
             except Exception as e:
-                logger.error(f"Erreur traitement projet {p.get('name')}: {traceback.format_exc()}")
-                self.stats['errors'] += 1
+                logger.error(f"Renouvellement des baux impossible: {e}")
 
-        duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Scan terminé en {duration:.0f}s. Stats: {self.stats}")
-        await self.save_scan_history(len(projects), duration)
+    async def _coordinator_heartbeat(self, run_id: int):
+        while True:
+            await asyncio.sleep(self.job_queue.coordinator_timeout / 3)
+            try:
+                await self.job_queue.heartbeat(run_id)
+            except Exception as e:
+                logger.error(f"Heartbeat du run {run_id} impossible: {e}")
+
+    def _job_done(self):
+        self._jobs_inflight -= 1
+        self._job_finished.set()
+
+    async def _stage_job_verify(self, job):
+        job_id, project = job
+        try:
+            project, flags = await self._stage_verify(project)
+        except Exception as e:
+            await self.job_queue.fail(job_id, f"{type(e).__name__}: {e}")
+            self._job_done()
+            raise
+        return job_id, project, flags
+
+    async def _stage_job_score(self, items):
+        try:
+            scored = await self._stage_score([(project, flags) for _, project, flags in items])
+        except Exception as e:
+            for job_id, _, _ in items:
+                await self.job_queue.fail(job_id, f"{type(e).__name__}: {e}")
+                self._job_done()
+            raise
+        return [(job_id, project, analysis) for (job_id, _, _), (project, analysis) in zip(items, scored)]
+
+    async def _stage_job_commit(self, item):
+        job_id, project, analysis = item
+        try:
+            # Bail perdu (job repris ailleurs) : ni écriture ni notification
+            if await self.job_queue.complete(job_id, project, analysis):
+                return project, analysis
+            return None
+        finally:
+            self._job_done()
 
     async def save_project(self, p, analysis):
-        """Sauvegarde les projets et les ratios dans la DB (tables 1 & 2)"""
+        """Sauvegarde les projets et les ratios dans la DB (tables 1 & 2), par lots"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute("INSERT OR REPLACE INTO projects (name, source, verdict, score, estimated_mc_eur, link, website, twitter, telegram, github) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                                          (p['name'], p['source'], analysis['verdict'], analysis['score'], p.get('mc', 0), p.get('link'), p.get('website'), p.get('twitter'), p.get('telegram'), p.get('github')))
-                project_id = cursor.lastrowid
-                
-                # Sauvegarde des 21 ratios
-                ratio_keys = ", ".join(analysis['ratios'].keys())
-                ratio_values = tuple(analysis['ratios'].values())
-                await db.execute(f"INSERT INTO ratios (project_id, {ratio_keys}) VALUES (?, {('?,' * len(analysis['ratios']))[:-1]})",
-                                 (project_id,) + ratio_values)
-                await db.commit()
+            await self.store.save_project(p, analysis, run_id=self.checkpoint.run_id)
+            return True
         except Exception as e: 
             logger.error(f"DB Save Error: {e}")
+            return False
 
-    async def save_scan_history(self, found, duration):
-        """Sauvegarde l'historique de scan (table 3)"""
+    async def save_scan_history(self, found, duration, stage_metrics=None):
+        """Sauvegarde l'historique de scan (table 3) et les durées par étape"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("INSERT INTO scan_history (scan_start, scan_end, projects_found, projects_accepted, projects_rejected, projects_review, errors) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                                 (datetime.now(), datetime.now() + timedelta(seconds=duration), found, self.stats['accepted'], self.stats['rejected'], self.stats['review'], str(self.stats['errors'])))
-                await db.commit()
+            scan_end = datetime.now()
+            return await self.store.save_scan_history(scan_end - timedelta(seconds=duration), scan_end, found,
+                                                      self.stats, stage_metrics)
         except Exception as e:
             logger.error(f"DB History Save Error: {e}")
 
-    async def run_daemon(self):
-        """Mode 24/7"""
-        logger.info(f"DÉMARRAGE DAEMON (Intervalle: {CONFIG['SCAN_INTERVAL']}h)")
+    async def _ingest(self, pipeline: Pipeline, spec, projects: List[Dict]):
+        """Pousse dans le pipeline les projets nouveaux ou modifiés d'une source (priorité = tier)."""
+        fresh = 0
+        unique = {(p['name'], p['source']): p for p in projects if p.get('name')}
+        for key, p in unique.items():
+            # Déjà dans le pipeline avec la même empreinte : pas de second passage
+            if not self._needs_verification(p, self._known) or self._pending.get(key) == p['fingerprint']:
+                self.stats['skipped'] += 1
+                continue
+            self._pending[key] = p['fingerprint']
+            await pipeline.submit(p, priority=spec.tier)
+            fresh += 1
+        self._window_found += len(unique)
+        logger.info(f"Source {spec.name}: {len(unique)} projets, {fresh} à vérifier")
+
+    async def _report_periodically(self, scheduler: SourceScheduler):
+        """Bilan toutes les SCAN_INTERVAL heures (scan_history, métriques, Prometheus)."""
         while True:
-            await self.scan()
-            logger.info(f"Scan terminé. Pause de {CONFIG['SCAN_INTERVAL']} heures.")
+            window_start = datetime.now()
             await asyncio.sleep(CONFIG['SCAN_INTERVAL'] * 3600)
+            for name, counters in scheduler.report().items():
+                logger.info(f"Source [{name}]: {counters}")
+            await self._close_window(window_start, self._window_found)
+            self.stats = self._new_stats()
+            self._window_found = 0
+            host_limiter.reset_stats()
+            response_cache.reset_stats()
+            self.antiscam.reset_stats()
+            metrics.begin_scan()
+
+    async def run_daemon(self):
+        """Mode 24/7 : chaque source est interrogée à sa propre cadence, la vérification tourne en continu"""
+        logger.info(f"DÉMARRAGE DAEMON ({len(self.sources)} sources, bilan toutes les {CONFIG['SCAN_INTERVAL']}h)")
+        # Un scan interrompu (daemon tué en plein scan) est terminé avant de reprendre le polling
+        if await self.checkpoint.unfinished_run() is not None:
+            await self.scan(resume=True)
+        self.stats = self._new_stats()
+        self._window_found = 0
+        # --full-rescan : tout est re-vérifié une fois, puis retour au mode incrémental
+        self._known = {} if self.full_rescan else await self.store.load_fingerprints()
+        self._pending = {}
+        self.full_rescan = False
+        metrics.begin_scan()
+
+        pipeline = self.build_pipeline(prioritized=True)
+        await pipeline.start()
+        scheduler = SourceScheduler(self.sources, lambda spec, projects: self._ingest(pipeline, spec, projects),
+                                    initial_stagger=SETTINGS.get('scheduler', {}).get('initial_stagger', 30))
+        reporter = asyncio.create_task(self._report_periodically(scheduler), name="daemon-report")
+        try:
+            await scheduler.run()
+        finally:
+            reporter.cancel()
+            await asyncio.gather(reporter, return_exceptions=True)
+            await pipeline.cancel()
 
 # ============================================================================
 # CLI & MAIN
 # ============================================================================
 
+async def run_startup_profile(output: str):
+    """--startup-profile : coût des imports (processus neuf) et de chaque phase d'initialisation."""
+    import_s, modules = import_profile("main", path=os.path.dirname(os.path.abspath(__file__)))
+    profile = StartupProfile()
+    with profile.phase("QuantumScanner()"):
+        scanner = QuantumScanner()
+    try:
+        with profile.phase("store.open"):
+            await scanner.init_db()
+        with profile.phase("http.start"):
+            await scanner.http.start()
+        with profile.phase("notifier.start"):
+            await scanner.notifier.start()
+        # Coûts différés, payés au premier usage seulement
+        with profile.phase("lazy: tldextract"):
+            tldextract.extract("example.com")
+        with profile.phase("lazy: numpy (score_projects)"):
+            scanner.score_projects([{}])
+        with profile.phase("lazy: whois"):
+            __import__("whois")
+        with profile.phase("lazy: web3 (jamais pendant un scan)"):
+            __import__("web3")
+    finally:
+        await scanner.close()
+
+    logger.info(f"Import à froid de main: {import_s:.3f}s")
+    for entry in modules[:15]:
+        logger.info(f"  import {entry['module']:<24} {entry['cumulative_s']:.3f}s")
+    for name, seconds in profile.phases:
+        logger.info(f"  {name:<36} {seconds:.3f}s")
+    report = {"timestamp": datetime.now().isoformat(timespec="seconds"), "import_s": round(import_s, 4),
+              "imports": modules, "phases": profile.as_dict()}
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Profil de démarrage: {output}")
+
+def run_backtest(args):
+    """--backtest : re-score l'historique des ratios pour des poids candidats (hors ligne, sans réseau)."""
+    cfg = SETTINGS.get('backtest', {})
+    started = time.perf_counter()
+    try:
+        history = load_history(args.backtest_db, cache_dir=cfg.get('cache_dir'))
+    except FileNotFoundError:
+        logger.error(f"Backtest: base introuvable ({args.backtest_db})")
+        return
+    load_s = time.perf_counter() - started
+    if not len(history):
+        logger.warning(f"Backtest: aucune ligne de ratios dans {args.backtest_db}")
+        return
+    backtester = Backtester(RATIO_WEIGHTS, CONFIG["GO_SCORE"], CONFIG["REVIEW_SCORE"],
+                            block_elements=int(cfg.get('block_elements', 2_000_000)))
+    grid = cfg.get('grid') or {}
+    if args.backtest_grid and grid:
+        candidates = grid_candidates(backtester.base, grid)
+    else:
+        if args.backtest_grid:
+            logger.warning("Backtest: backtest.grid vide, tirage aléatoire des candidats")
+        candidates = sample_candidates(backtester.base, args.backtest_candidates or int(cfg.get('candidates', 2000)),
+                                       float(cfg.get('concentration', 50)), int(cfg.get('seed', 42)))
+    labels_path = args.backtest_labels or cfg.get('labels')
+    labels = load_labels(labels_path) if labels_path and os.path.exists(labels_path) else None
+
+    result = backtester.evaluate(history, candidates, labels)
+    best = summarize(result, candidates, int(cfg.get('top', 10)))
+    logger.info(f"Backtest: {result['rows']} lignes chargées en {load_s:.2f}s, "
+                f"{result['candidates']} candidats évalués en {result['elapsed_s']:.2f}s")
+    logger.info(f"  Poids actuels (GO>={CONFIG['GO_SCORE']:.0f}, REVIEW>={CONFIG['REVIEW_SCORE']:.0f}): "
+                f"{result['baseline']['distribution']}")
+    if labels:
+        logger.info(f"  Étiquettes: {result.get('labeled', 0)} projets retrouvés, {result.get('labels_missing', 0)} absents, "
+                    f"poids actuels {result.get('baseline_labels', {})}")
+    for rank, entry in enumerate(best, 1):
+        agreement = f", accord {entry['agreement']:.1%}" if 'agreement' in entry else ""
+        logger.info(f"  #{rank} candidat {entry['candidate']}: {entry['distribution']}, "
+                    f"{entry['changed']} verdicts changés{agreement}")
+
+    report = {"timestamp": datetime.now().isoformat(timespec="seconds"), "db": args.backtest_db,
+              "rows": result['rows'], "candidates": result['candidates'], "load_s": round(load_s, 3),
+              "evaluate_s": round(result['elapsed_s'], 3),
+              "thresholds": {"go": CONFIG["GO_SCORE"], "review": CONFIG["REVIEW_SCORE"]},
+              "baseline": {"weights": RATIO_WEIGHTS, **result['baseline'], **({"labels": result['baseline_labels']}
+                                                                              if 'baseline_labels' in result else {})},
+              "labels": {"path": labels_path, "labeled": result.get('labeled', 0)} if labels else None,
+              "best": best}
+    output = args.backtest_output or f"results/backtest_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Rapport de backtest: {output}")
+
 async def main(args):
     """Point d'entrée de l'application."""
-    scanner = QuantumScanner()
+    if args.startup_profile:
+        await run_startup_profile(args.profile_output)
+        return
+    if args.backtest:
+        run_backtest(args)
+        return
+
+    if args.http_cache:
+        response_cache.enabled = True
+    scanner = QuantumScanner(full_rescan=args.full_rescan)
     
+    # SIGTERM (timeout GitHub Actions, kill du daemon) -> annulation propre : le dernier lot DB est écrit
     try:
-        if args.daemon:
-            await scanner.run_daemon()
-        elif args.once or args.github_actions:
-            logger.info("Mode: Scan unique/GitHub Actions")
-            await scanner.scan()
-        elif args.test_project:
-            logger.info(f"Mode Test non implémenté. Lancement scan unique.")
-            await scanner.scan()
-        else:
-            logger.info("Utilisez --once, --daemon ou --github-actions")
-            await scanner.scan()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+    
+    try:
+        async with scanner:
+            if args.worker:
+                await scanner.run_worker(args.run_id)
+            elif args.workers > 0:
+                await scanner.scan_with_workers(args.workers)
+            elif args.daemon:
+                await scanner.run_daemon()
+            elif args.once or args.github_actions or args.resume:
+                logger.info("Mode: Scan unique/GitHub Actions")
+                await scanner.scan(resume=args.resume)
+            elif args.test_project:
+                logger.info(f"Mode Test non implémenté. Lancement scan unique.")
+                await scanner.scan()
+            else:
+                logger.info("Utilisez --once, --daemon ou --github-actions")
+                await scanner.scan()
             
     except KeyboardInterrupt:
         logger.info("Arrêt manuel.")
+    except asyncio.CancelledError:
+        logger.info("Arrêt demandé (SIGTERM), données vidées en base.")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Quantum Scanner Ultime v6.1')
@@ -555,7 +1105,21 @@ if __name__ == "__main__":
     parser.add_argument('--daemon', action='store_true', help='Mode 24/7')
     parser.add_argument('--github-actions', action='store_true', help='Mode CI (lance un scan unique)')
     parser.add_argument('--test-project', type=str, help='Test projet unique (non fonctionnel)')
+    parser.add_argument('--full-rescan', action='store_true', help='Ignore les empreintes et re-vérifie tous les projets')
+    parser.add_argument('--resume', action='store_true', help='Reprend le dernier scan interrompu (sources et projets déjà faits)')
+    parser.add_argument('--http-cache', action='store_true', help='Cache disque des réponses des launchpads (http_cache.path)')
+    parser.add_argument('--workers', type=int, default=0, help='Scan réparti : N processus workers sur la file de jobs')
+    parser.add_argument('--worker', action='store_true', help='Worker de la file de jobs (quantum.db partagée)')
+    parser.add_argument('--run-id', type=int, help='Run servi par --worker (défaut: tous les runs en cours)')
+    parser.add_argument('--startup-profile', action='store_true', help='Mesure imports et initialisation, sans scanner')
+    parser.add_argument('--profile-output', default='results/startup_profile.json', help='Rapport JSON du profil de démarrage')
+    parser.add_argument('--backtest', action='store_true', help='Re-score hors ligne l\'historique des ratios (section backtest)')
+    parser.add_argument('--backtest-db', default='quantum.db', help='Base lue par --backtest')
+    parser.add_argument('--backtest-candidates', type=int, help='Nombre de poids candidats tirés (défaut: backtest.candidates)')
+    parser.add_argument('--backtest-grid', action='store_true', help='Grille backtest.grid au lieu du tirage aléatoire')
+    parser.add_argument('--backtest-labels', help='CSV name,source,outcome (défaut: backtest.labels)')
+    parser.add_argument('--backtest-output', help='Rapport JSON (défaut: results/backtest_<date>.json)')
     args = parser.parse_args()
     
-    # Pour garantir l'initialisation de la DB avant le run (car __init__ n'est pas async)
+    # Une seule boucle d'événements : DB et pool HTTP sont initialisés dans main()
     asyncio.run(main(args))
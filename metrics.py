@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Module Metrics Quantum Scanner v6.1
+Chronomètres et histogrammes par étage (fetchers, WHOIS, blacklist, anti-scam, ratios, DB, Telegram).
+"""
+
+import bisect
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+# Bornes des histogrammes (secondes), façon Prometheus
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+
+class Histogram:
+    """Compteurs cumulés par borne + somme, min et max."""
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+
+    def merge(self, other: "Histogram"):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimation par interpolation linéaire dans la borne (comme histogram_quantile)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if BUCKETS[i] != math.inf else self.max
+                return min(self.max, max(self.min, lower + (upper - lower) * (rank - seen) / n))
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count, "total_s": round(self.sum, 6),
+            "mean_s": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50_s": round(self.quantile(0.50), 6), "p95_s": round(self.quantile(0.95), 6),
+            "max_s": round(self.max, 6),
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "started")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullTimer:
+    """Chronomètre inerte quand les métriques sont désactivées (aucun appel d'horloge)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Histogrammes du scan en cours + cumul depuis le démarrage (export Prometheus du daemon).
+
+    Usage : `with metrics.timer("whois"): ...` (fonctionne aussi autour d'un await).
+    """
+
+    def __init__(self, enabled: bool = True, prefix: str = "quantum"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self.current: Dict[str, Histogram] = {}
+        self.lifetime: Dict[str, Histogram] = {}
+        self.scans = 0
+
+    def timer(self, name: str):
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        hist = self.current.get(name)
+        if hist is None:
+            hist = self.current[name] = Histogram()
+        hist.observe(seconds)
+
+    async def track(self, name: str, awaitable):
+        """Chronomètre une coroutine (ex. un fetcher passé à asyncio.gather)."""
+        with self.timer(name):
+            return await awaitable
+
+    # ------------------------------------------------------------------
+    # Cycle d'un scan
+    # ------------------------------------------------------------------
+
+    def begin_scan(self):
+        self.current = {}
+
+    def end_scan(self) -> Dict[str, Dict[str, float]]:
+        """Résumé du scan (persisté avec scan_history) puis cumul dans `lifetime`."""
+        summary = self.summary()
+        for name, hist in self.current.items():
+            self.lifetime.setdefault(name, Histogram()).merge(hist)
+        self.current = {}
+        self.scans += 1
+        return summary
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: hist.summary() for name, hist in sorted(self.current.items())}
+
+    def log_summary(self, summary: Dict[str, Dict[str, float]]):
+        for name, s in summary.items():
+            logger.info(f"Étape {name}: {s['count']} appels, total {s['total_s']:.2f}s, "
+                        f"p50 {s['p50_s'] * 1000:.1f}ms, p95 {s['p95_s'] * 1000:.1f}ms, max {s['max_s'] * 1000:.1f}ms")
+
+    # ------------------------------------------------------------------
+    # Export Prometheus (format texte, collecteur textfile de node_exporter)
+    # ------------------------------------------------------------------
+
+    def prometheus_text(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        name = f"{self.prefix}_stage_duration_seconds"
+        lines: List[str] = [f"# HELP {name} Durée des étapes du scan.", f"# TYPE {name} histogram"]
+        for stage, hist in sorted(self.lifetime.items()):
+            cumulative = 0
+            for bound, n in zip(BUCKETS, hist.counts):
+                cumulative += n
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {hist.sum:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {hist.count}')
+        lines += [f"# HELP {self.prefix}_scans_total Scans terminés depuis le démarrage.",
+                  f"# TYPE {self.prefix}_scans_total counter", f"{self.prefix}_scans_total {self.scans}"]
+        for key, value in (gauges or {}).items():
+            lines += [f"# TYPE {self.prefix}_{key} gauge", f"{self.prefix}_{key} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, gauges: Optional[Dict[str, float]] = None):
+        """Écriture atomique (le collecteur ne lit jamais un fichier à moitié écrit)."""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text(gauges))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Export Prometheus impossible ({path}): {e}")
+
+
+# Instance globale
+metrics = Metrics()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Module Notifier Quantum Scanner v6.1
+File d'envoi Telegram asynchrone : limites par chat, retry_after et déduplication persistée.
+
+Les alertes attendent dans une file par chat ; la file d'envoi ne porte que des chats à servir.
+En mode digest, un envoi emporte toutes les alertes du chat arrivées pendant l'attente de son
+jeton, jusqu'à `max_message_length` (coupure entre deux projets).
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set
+
+from loguru import logger
+
+from alert_renderer import pack_digest
+from metrics import metrics
+from rate_limiter import TokenBucket
+
+
+@dataclass
+class PendingAlert:
+    text: str
+    dedup_key: str
+    project_name: str
+    project_source: str
+    verdict: str
+    score: float
+    attempt: int = 0
+
+
+def dedup_key(name: str, source: str, verdict: str, score: float, bucket_size: float = 10) -> str:
+    """Clé idempotente projet + verdict + tranche de score (un même GO n'est alerté qu'une fois)."""
+    return f"{source}|{name}|{verdict}|{int(score // bucket_size)}"
+
+
+class TelegramNotifier:
+    """Envoi en tâche de fond : `enqueue()` ne bloque jamais le scan.
+
+    Limites Telegram : ~30 msg/s au global, 1 msg/s par chat privé, 20 msg/min par groupe.
+    Les 429 mettent le chat en pause `retry_after` secondes et le message est remis en file.
+    """
+
+    def __init__(self, http, store, bot_token: Optional[str], api_base: str = "https://api.telegram.org",
+                 global_rate: float = 30, chat_rate: float = 1.0, group_rate_per_minute: float = 20,
+                 max_retries: int = 5, score_bucket: float = 10, workers: int = 3, drain_timeout: float = 60,
+                 digest: bool = False, max_message_length: int = 4096, parse_mode: str = "MarkdownV2",
+                 disable_web_preview: bool = True):
+        self.http = http
+        self.store = store
+        self.bot_token = bot_token
+        self.api_base = api_base
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate_per_minute / 60
+        self.max_retries = max_retries
+        self.score_bucket = score_bucket
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.digest = digest
+        self.max_message_length = max_message_length
+        self.parse_mode = parse_mode
+        self.disable_web_preview = disable_web_preview
+
+        self._global = TokenBucket(global_rate, burst=global_rate)
+        self._chats: Dict[str, TokenBucket] = {}
+        self._sent: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._backlogs: Dict[str, Deque[PendingAlert]] = {}
+        self._scheduled: Set[str] = set()  # digest : chats ayant déjà un tour dans la file d'envoi
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        # sent / failed comptent des alertes, messages les requêtes sendMessage réussies
+        self.stats = {"enqueued": 0, "deduplicated": 0, "sent": 0, "messages": 0, "retries": 0, "throttled": 0,
+                      "failed": 0}
+
+    @classmethod
+    def from_settings(cls, http, store, bot_token: Optional[str], settings: Dict) -> "TelegramNotifier":
+        tg = settings.get('telegram', {})
+        return cls(http, store, bot_token,
+                   global_rate=tg.get('global_rate', 30), chat_rate=tg.get('chat_rate', 1.0),
+                   group_rate_per_minute=tg.get('group_rate_per_minute', 20),
+                   max_retries=tg.get('max_retries', 5), score_bucket=tg.get('dedup_score_bucket', 10),
+                   drain_timeout=tg.get('drain_timeout', 60), digest=tg.get('digest', False),
+                   max_message_length=tg.get('max_message_length', 4096), parse_mode=tg.get('parse_mode', "MarkdownV2"),
+                   disable_web_preview=tg.get('disable_web_preview', True))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.bot_token)
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._sent = await self.store.load_notification_keys()
+        self._tasks = [asyncio.create_task(self._worker(), name=f"telegram-{n}") for n in range(self.workers)]
+
+    async def close(self):
+        """Laisse `drain_timeout` secondes pour vider la file, puis arrête les workers."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Telegram: {self._queue.qsize()} messages non envoyés à l'arrêt")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._backlogs.clear()
+        self._scheduled.clear()
+
+    # ------------------------------------------------------------------
+    # Mise en file
+    # ------------------------------------------------------------------
+
+    def enqueue(self, chat_id: str, text: str, project: Dict, analysis: Dict) -> bool:
+        """Met l'alerte en file (non bloquant). False si déjà envoyée/en attente ou désactivé.
+
+        `text` est l'alerte complète, ou une entrée de digest (AlertRenderer.digest_entry) en mode digest.
+        """
+        if not self.enabled or not chat_id or self._queue is None:
+            return False
+        key = dedup_key(project['name'], project['source'], analysis['verdict'], analysis['score'], self.score_bucket)
+        if key in self._sent or key in self._pending:
+            self.stats['deduplicated'] += 1
+            return False
+        self._pending.add(key)
+        chat_id = str(chat_id)
+        self._backlogs.setdefault(chat_id, deque()).append(
+            PendingAlert(text, key, project['name'], project['source'], analysis['verdict'], analysis['score']))
+        self._schedule(chat_id)
+        self.stats['enqueued'] += 1
+        return True
+
+    def _schedule(self, chat_id: str):
+        """Un tour d'envoi par alerte ; en digest un seul tour en attente par chat (il emportera tout)."""
+        if self.digest:
+            if chat_id in self._scheduled:
+                return
+            self._scheduled.add(chat_id)
+        self._queue.put_nowait(chat_id)
+
+    def _take(self, chat_id: str) -> List[PendingAlert]:
+        """Alertes du prochain message : une seule, ou en digest autant que `max_message_length` permet."""
+        backlog = self._backlogs.get(chat_id)
+        if not backlog:
+            return []
+        if not self.digest:
+            return [backlog.popleft()]
+        _, count = pack_digest([a.text for a in backlog], self.max_message_length)
+        return [backlog.popleft() for _ in range(count)]
+
+    # ------------------------------------------------------------------
+    # Envoi
+    # ------------------------------------------------------------------
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        if chat_id not in self._chats:
+            rate = self.group_rate if chat_id.startswith('-') else self.chat_rate
+            self._chats[chat_id] = TokenBucket(rate, burst=1)
+        return self._chats[chat_id]
+
+    async def _worker(self):
+        while True:
+            chat_id = await self._queue.get()
+            alerts: List[PendingAlert] = []
+            try:
+                bucket = self._chat_bucket(chat_id)
+                wait = max(bucket.reserve(), self._global.reserve())
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                # Alertes prises après l'attente : en digest, celles arrivées entre-temps partent avec
+                alerts = self._take(chat_id)
+                if self.digest:
+                    self._scheduled.discard(chat_id)
+                    if self._backlogs.get(chat_id):
+                        self._schedule(chat_id)  # reste au-delà de max_message_length
+                if alerts:
+                    await self._deliver(chat_id, alerts)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Telegram Fail: {e}")
+                self._give_up(alerts)
+            finally:
+                self._queue.task_done()
+
+    def _render(self, alerts: List[PendingAlert]) -> str:
+        if not self.digest:
+            return alerts[0].text
+        text, _ = pack_digest([a.text for a in alerts], self.max_message_length)
+        return text
+
+    async def _deliver(self, chat_id: str, alerts: List[PendingAlert]):
+        url = f"{self.api_base}/bot{self.bot_token}/sendMessage"
+        try:
+            with metrics.timer("telegram_send"):
+                async with self.http.session.post(url, json={
+                    "chat_id": chat_id,
+                    "text": self._render(alerts),
+                    "parse_mode": self.parse_mode,
+                    "disable_web_page_preview": self.disable_web_preview
+                }) as resp:
+                    data = await resp.json(content_type=None)
+        except (asyncio.TimeoutError, OSError, ValueError) as e:
+            # aiohttp.ClientError hérite d'OSError
+            self._retry(chat_id, alerts, delay=min(60, 2 ** alerts[0].attempt), reason=str(e))
+            return
+
+        if data.get('ok'):
+            self.stats['messages'] += 1
+            message_id = data.get('result', {}).get('message_id')
+            for alert in alerts:
+                self._sent.add(alert.dedup_key)
+                self._pending.discard(alert.dedup_key)
+                self.stats['sent'] += 1
+                await self.store.save_notification(alert.project_name, alert.project_source, chat_id,
+                                                   message_id, alert.dedup_key, alert.verdict, alert.score)
+                logger.info(f"Alert sent [{alert.verdict}] for: {alert.project_name}")
+            return
+
+        retry_after = (data.get('parameters') or {}).get('retry_after')
+        if data.get('error_code') == 429 and retry_after is not None:
+            self.stats['throttled'] += 1
+            self._chat_bucket(chat_id).pause(float(retry_after))
+            self._retry(chat_id, alerts, delay=0, reason=f"429 retry_after={retry_after}")
+        elif data.get('error_code', 0) >= 500:
+            self._retry(chat_id, alerts, delay=min(60, 2 ** alerts[0].attempt), reason=str(data))
+        else:
+            logger.error(f"Telegram API Error: {data}")
+            self._give_up(alerts)
+
+    def _retry(self, chat_id: str, alerts: List[PendingAlert], delay: float, reason: str):
+        retried = []
+        for alert in alerts:
+            alert.attempt += 1
+            if alert.attempt > self.max_retries:
+                logger.error(f"Telegram: abandon après {self.max_retries} essais ({reason})")
+                self._give_up([alert])
+            else:
+                retried.append(alert)
+        if not retried:
+            return
+        self.stats['retries'] += 1
+        logger.debug(f"Telegram retry {retried[0].attempt}/{self.max_retries} dans {delay:.0f}s: {reason}")
+        # Remise en tête de la file du chat après le délai, sans bloquer le worker (les autres chats continuent)
+        if delay > 0:
+            self._chat_bucket(chat_id).pause(delay)
+        self._backlogs.setdefault(chat_id, deque()).extendleft(reversed(retried))
+        self._schedule(chat_id)
+
+    def _give_up(self, alerts: List[PendingAlert]):
+        # Non marquées comme envoyées : un prochain scan pourra réessayer
+        for alert in alerts:
+            self._pending.discard(alert.dedup_key)
+            self.stats['failed'] += 1
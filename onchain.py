@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Module On-Chain Quantum Scanner v6.1
+Enrichissement on-chain (totalSupply, owner, réserves LP, soldes des top holders) par
+requêtes JSON-RPC groupées (batch), avec cache par bloc et concurrence bornée.
+Les listes de top holders (API externe, quota serré) sont chargées hors du chemin critique.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from loguru import logger
+
+from metrics import metrics
+from ttl_cache import SQLiteCacheTier, TieredCache
+
+# Sélecteurs ERC-20 / Ownable / paire Uniswap V2 (4 premiers octets du keccak de la signature)
+SELECTORS = {
+    "totalSupply": "0x18160ddd",
+    "decimals": "0x313ce567",
+    "owner": "0x8da5cb5b",
+    "balanceOf": "0x70a08231",
+    "getReserves": "0x0902f1ac",
+    "token0": "0x0dfe1681",
+    "token1": "0xd21220a7",
+}
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+BURN_ADDRESSES = (ZERO_ADDRESS, "0x000000000000000000000000000000000000dead")
+
+# Jetons de cotation reconnus dans une paire (adresse -> décimales, prix USD)
+DEFAULT_QUOTE_TOKENS = {
+    "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": {"symbol": "USDC", "decimals": 6, "usd": 1.0},
+    "0xdac17f958d2ee523a2206206994597c13d831ec7": {"symbol": "USDT", "decimals": 6, "usd": 1.0},
+    "0x6b175474e89094c44da98b954eedeac495271d0f": {"symbol": "DAI", "decimals": 18, "usd": 1.0},
+    "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2": {"symbol": "WETH", "decimals": 18, "usd": 3000.0},
+}
+
+
+class RpcError(Exception):
+    """Réponse JSON-RPC inexploitable (transport, statut HTTP, format)."""
+
+
+def encode_address(address: str) -> str:
+    """Argument `address` ABI : 32 octets, complété à gauche par des zéros."""
+    return address.lower().replace("0x", "").rjust(64, "0")
+
+
+def decode_uint(result: Optional[str], word: int = 0) -> Optional[int]:
+    if not result or result == "0x":
+        return None
+    data = result[2:]
+    chunk = data[word * 64:(word + 1) * 64]
+    return int(chunk, 16) if chunk else None
+
+
+def decode_address(result: Optional[str]) -> Optional[str]:
+    value = decode_uint(result)
+    return None if value is None else "0x" + format(value, "040x")[-40:]
+
+
+def parse_top_holders(data) -> List[str]:
+    """Réponse getTopTokenHolders (Ethplorer) -> adresses des détenteurs, du plus gros au plus petit."""
+    if not isinstance(data, dict):
+        return []
+    return [h["address"].lower() for h in data.get("holders") or [] if isinstance(h, dict) and h.get("address")]
+
+
+class JsonRpcBatcher:
+    """Regroupe les eth_call concurrents en requêtes batch JSON-RPC.
+
+    Les appels émis pendant `batch_window` secondes (ou jusqu'à `max_batch`) partent
+    dans un seul POST, épinglés au même bloc. Les résultats sont mis en cache pour ce
+    bloc : le cache est vidé dès que la chaîne avance.
+    """
+
+    def __init__(self, http, url: str, max_batch: int = 100, batch_window: float = 0.01,
+                 concurrency: int = 4, block_ttl: float = 12.0):
+        self.http = http
+        self.url = url
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.block_ttl = block_ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending: List[Tuple[str, str, asyncio.Future]] = []
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self._cache: Dict[Tuple[str, str], Optional[str]] = {}
+        self._block: Optional[int] = None
+        self._block_checked = 0.0
+        self._block_lock = asyncio.Lock()
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0, "batches": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Bloc courant
+    # ------------------------------------------------------------------
+
+    async def _post(self, payload):
+        async with self._semaphore:
+            try:
+                async with self.http.session.post(self.url, json=payload) as resp:
+                    if resp.status != 200:
+                        raise RpcError(f"HTTP {resp.status}")
+                    return await resp.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                raise RpcError(str(e) or type(e).__name__) from e
+
+    async def block_number(self) -> int:
+        """Numéro du dernier bloc, relu au plus une fois par `block_ttl` secondes."""
+        if self._block is not None and time.monotonic() - self._block_checked < self.block_ttl:
+            return self._block
+        async with self._block_lock:
+            if self._block is None or time.monotonic() - self._block_checked >= self.block_ttl:
+                reply = await self._post({"jsonrpc": "2.0", "id": 0, "method": "eth_blockNumber", "params": []})
+                if not isinstance(reply, dict) or "result" not in reply:
+                    raise RpcError(f"eth_blockNumber: {reply.get('error') if isinstance(reply, dict) else reply}")
+                block = int(reply["result"], 16)
+                if block != self._block:
+                    self._cache.clear()
+                self._block, self._block_checked = block, time.monotonic()
+        return self._block
+
+    # ------------------------------------------------------------------
+    # eth_call groupés
+    # ------------------------------------------------------------------
+
+    async def call(self, to: str, data: str) -> Optional[str]:
+        """Résultat hexadécimal de eth_call (None si l'appel revert ou si le batch échoue)."""
+        self.stats["calls"] += 1
+        await self.block_number()
+        key = (to.lower(), data)
+        if key in self._cache:
+            self.stats["cache_hits"] += 1
+            return self._cache[key]
+        if key in self._inflight:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(self._inflight[key])
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._pending.append((key[0], data, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            task = asyncio.ensure_future(self._send(batch, self._block))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[str, str, asyncio.Future]], block: int):
+        payload = [{"jsonrpc": "2.0", "id": i, "method": "eth_call",
+                    "params": [{"to": to, "data": data}, hex(block)]} for i, (to, data, _) in enumerate(batch)]
+        results: Dict[int, Optional[str]] = {}
+        try:
+            with metrics.timer("rpc_batch"):
+                reply = await self._post(payload)
+            self.stats["batches"] += 1
+            if not isinstance(reply, list):
+                raise RpcError(f"réponse batch inattendue: {str(reply)[:200]}")
+            for item in reply:
+                # Un revert (owner() absent, adresse qui n'est pas une paire...) n'invalide pas le reste du batch
+                results[item.get("id")] = item.get("result") if "error" not in item else None
+        except asyncio.CancelledError:
+            for to, data, future in batch:
+                self._inflight.pop((to, data), None)
+                future.cancel()
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Batch JSON-RPC de {len(batch)} appels en échec: {e}")
+        for i, (to, data, future) in enumerate(batch):
+            self._inflight.pop((to, data), None)
+            if i in results and block == self._block:
+                self._cache[(to, data)] = results[i]
+            if not future.done():
+                future.set_result(results.get(i))
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for *_, future in self._pending:
+            future.cancel()
+        self._pending = []
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class OnChainEnricher:
+    """Lecture on-chain des champs utilisés par les ratios, pour tous les projets d'un scan.
+
+    Chaque projet émet ses eth_call en parallèle ; le batcher les regroupe avec ceux des
+    autres workers de l'étage verify, d'où quelques POST par scan au lieu d'un par appel.
+    """
+
+    def __init__(self, http, rpc_url: Optional[str], enabled: bool = True, max_batch: int = 100,
+                 batch_window: float = 0.01, concurrency: int = 4, block_ttl: float = 12.0,
+                 quote_tokens: Optional[Dict[str, Dict]] = None, max_holders: int = 10):
+        self.enabled = bool(enabled and rpc_url)
+        self.rpc = JsonRpcBatcher(http, rpc_url, max_batch, batch_window, concurrency, block_ttl) if self.enabled else None
+        self.quote_tokens = {k.lower(): v for k, v in {**DEFAULT_QUOTE_TOKENS, **(quote_tokens or {})}.items()}
+        self.max_holders = max_holders
+
+    @classmethod
+    def from_settings(cls, settings: Dict, http, rpc_url: Optional[str]) -> "OnChainEnricher":
+        """Section `onchain` de config.yml ; l'URL RPC est celle du provider Web3 (INFURA_URL)."""
+        cfg = settings.get('onchain', {})
+        quote_tokens = dict(DEFAULT_QUOTE_TOKENS)
+        weth = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+        quote_tokens[weth] = {**quote_tokens[weth], "usd": float(cfg.get('eth_usd', quote_tokens[weth]["usd"]))}
+        return cls(http, cfg.get('rpc_url') or rpc_url, enabled=cfg.get('enabled', True),
+                   max_batch=cfg.get('max_batch', 100), batch_window=cfg.get('batch_window_ms', 10) / 1000,
+                   concurrency=cfg.get('concurrency', 4), block_ttl=cfg.get('block_ttl', 12),
+                   quote_tokens={**quote_tokens, **(cfg.get('quote_tokens') or {})},
+                   max_holders=cfg.get('max_holders', 10))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(self.rpc.stats) if self.rpc else {}
+
+    async def _balances(self, token: str, holders: Iterable[str]) -> List[Optional[int]]:
+        return [decode_uint(r) for r in await asyncio.gather(
+            *(self.rpc.call(token, SELECTORS["balanceOf"] + encode_address(h)) for h in holders))]
+
+    async def _pair_reserves_usd(self, pair: str) -> Optional[float]:
+        """Valeur USD de la paire : 2 x réserve du jeton de cotation (USDC, USDT, DAI, WETH)."""
+        reserves, token0, token1 = await asyncio.gather(
+            self.rpc.call(pair, SELECTORS["getReserves"]), self.rpc.call(pair, SELECTORS["token0"]),
+            self.rpc.call(pair, SELECTORS["token1"]))
+        for word, token in enumerate((decode_address(token0), decode_address(token1))):
+            quote = self.quote_tokens.get(token or "")
+            reserve = decode_uint(reserves, word)
+            if quote and reserve is not None:
+                return 2 * reserve / 10 ** quote["decimals"] * quote["usd"]
+        return None
+
+    async def enrich(self, project: Dict) -> Dict:
+        """Champs on-chain mesurés pour le contrat du projet (seulement ceux effectivement lus).
+
+        Utilise `contract_address`, et si présents `pair_address` et `top_holders` (adresses,
+        remplies par QuantumScanner.fetch_top_holders).
+        """
+        token = project.get('contract_address')
+        if not self.enabled or not token:
+            return {}
+        holders = [h for h in project.get('top_holders') or [] if h.lower() not in BURN_ADDRESSES][:self.max_holders]
+        pair = project.get('pair_address')
+        try:
+            supply, decimals, owner, burned, held, reserves_usd = await asyncio.gather(
+                self.rpc.call(token, SELECTORS["totalSupply"]), self.rpc.call(token, SELECTORS["decimals"]),
+                self.rpc.call(token, SELECTORS["owner"]), self._balances(token, BURN_ADDRESSES),
+                self._balances(token, holders), self._pair_reserves_usd(pair) if pair else asyncio.sleep(0))
+        except RpcError as e:
+            logger.warning(f"Lecture on-chain impossible pour {token}: {e}")
+            return {}
+
+        fields: Dict = {}
+        supply, decimals = decode_uint(supply), decode_uint(decimals)
+        if supply:
+            scale = 10 ** (decimals if decimals is not None and decimals <= 36 else 18)
+            circulating = max(0, supply - sum(b or 0 for b in burned))
+            fields["total_supply"] = supply / scale
+            fields["circ_supply"] = circulating / scale
+            if holders and circulating and any(b is not None for b in held):
+                fields["top10_concentration"] = min(1.0, sum(b or 0 for b in held) / circulating)
+        owner = decode_address(owner)
+        if owner is not None:
+            fields["owner_renounced"] = owner in BURN_ADDRESSES
+        if reserves_usd is not None:
+            fields["lp_reserves_usd"] = reserves_usd
+        return fields
+
+    async def close(self):
+        if self.rpc:
+            await self.rpc.close()
+
+
+class HolderDirectory:
+    """Top holders par contrat, chargés en tâche de fond et gardés en cache (SQLite entre deux runs).
+
+    L'étage verify n'attend qu'au plus `wait` secondes, et pas du tout si la file de chargements
+    dépasse ce que `rate` (requêtes/s de l'API) écoule dans ce délai : les holders sont alors
+    traités comme absents pour ce projet, la requête continue et remplit le cache pour les scans suivants.
+    """
+
+    def __init__(self, loader: Callable[[str], Awaitable[Optional[List[str]]]], ttl: float = 86400,
+                 negative_ttl: float = 300, wait: float = 2.0, rate: float = float('inf'),
+                 persistent: Optional[SQLiteCacheTier] = None):
+        self.loader = loader
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.wait = wait
+        self.rate = rate
+        self.cache = TieredCache(persistent=persistent)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._loading = 0  # chargements passés au loader (hors lectures du cache SQLite)
+        self.stats = {"ready": 0, "missed": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Dict, loader: Callable[[str], Awaitable[Optional[List[str]]]]) -> "HolderDirectory":
+        """`onchain.holders_ttl`, `holders_wait` et `holders_cache_path` (vide = cache mémoire seul) ;
+        débit de `rate_limits.hosts` pour l'hôte de `onchain.top_holders_url`."""
+        cfg = settings.get('onchain', {})
+        host = urlparse(cfg.get('top_holders_url') or "").netloc.lower()
+        rate = (settings.get('rate_limits', {}).get('hosts') or {}).get(host, {}).get('rate') or float('inf')
+        path = cfg.get('holders_cache_path', "cache/onchain_cache.db")
+        return cls(loader, ttl=cfg.get('holders_ttl', 86400), wait=cfg.get('holders_wait', 2.0), rate=rate,
+                   persistent=SQLiteCacheTier(path) if path else None)
+
+    def prefetch(self, token: str) -> asyncio.Task:
+        """Lance (une seule fois par contrat) le chargement des holders sans l'attendre."""
+        key = token.lower()
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(self.cache.get_or_load(
+                f"holders:{key}", lambda: self._load(token), self.ttl,
+                negative_ttl=self.negative_ttl, is_error=lambda value: value is None))
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    async def _load(self, token: str) -> Optional[List[str]]:
+        self._loading += 1
+        try:
+            return await self.loader(token)
+        finally:
+            self._loading -= 1
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Top holders {key}: {task.exception()}")
+
+    async def get(self, token: str) -> List[str]:
+        """Holders du contrat, ou [] s'ils ne sont pas disponibles dans les `wait` secondes."""
+        holders = self.cache.memory.get(f"holders:{token.lower()}")
+        if holders is None:
+            task = self.prefetch(token)
+            # File plus longue que ce que l'API écoule en `wait` secondes : inutile d'attendre
+            if not task.done() and self._loading / self.rate > self.wait:
+                self.stats['missed'] += 1
+                return []
+            try:
+                holders = await asyncio.wait_for(asyncio.shield(task), self.wait)
+            except asyncio.TimeoutError:
+                self.stats['missed'] += 1
+                return []
+            except Exception:
+                return []
+        if holders is not None:
+            self.stats['ready'] += 1
+        return holders or []
+
+    async def close(self):
+        """Abandonne les chargements encore en file (le cache garde ceux déjà terminés)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.cache.close()
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Module Persistence Quantum Scanner v6.1
+Écriture différée (write-behind) par lots sur une connexion SQLite persistante.
+"""
+
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from metrics import metrics
+
+# Colonnes de la table ratios (ordre canonique des 21 ratios)
+RATIO_COLUMNS = [
+    "mc_fdmc", "circ_vs_total", "volume_mc", "liquidity_ratio", "whale_concentration",
+    "audit_score", "vc_score", "social_sentiment", "dev_activity", "market_sentiment",
+    "tokenomics_health", "vesting_score", "exchange_listing_score", "community_growth",
+    "partnership_quality", "product_maturity", "revenue_generation", "volatility",
+    "correlation", "historical_performance", "risk_adjusted_return",
+]
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",   # WAL + NORMAL : un fsync par checkpoint, pas par commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",    # ~20 Mo
+    "PRAGMA busy_timeout=5000",
+]
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, symbol TEXT, chain TEXT,
+        source TEXT, link TEXT, website TEXT, twitter TEXT, telegram TEXT, github TEXT,
+        contract_address TEXT, pair_address TEXT, verdict TEXT, score REAL, reason TEXT,
+        estimated_mc_eur REAL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, UNIQUE(name, source))''',
+    '''CREATE TABLE IF NOT EXISTS ratios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, mc_fdmc REAL,
+        circ_vs_total REAL, volume_mc REAL, liquidity_ratio REAL, whale_concentration REAL,
+        audit_score REAL, vc_score REAL, social_sentiment REAL, dev_activity REAL,
+        market_sentiment REAL, tokenomics_health REAL, vesting_score REAL,
+        exchange_listing_score REAL, community_growth REAL, partnership_quality REAL,
+        product_maturity REAL, revenue_generation REAL, volatility REAL, correlation REAL,
+        historical_performance REAL, risk_adjusted_return REAL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(id))''',
+    '''CREATE TABLE IF NOT EXISTS scan_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, scan_start DATETIME, scan_end DATETIME,
+        projects_found INTEGER, projects_accepted INTEGER, projects_rejected INTEGER,
+        projects_review INTEGER, errors TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''',
+    '''CREATE TABLE IF NOT EXISTS social_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL,
+        twitter_followers INTEGER, telegram_members INTEGER, github_stars INTEGER,
+        github_commits_90d INTEGER, discord_members INTEGER, reddit_subscribers INTEGER,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP, FOREIGN KEY (project_id) REFERENCES projects(id))''',
+    '''CREATE TABLE IF NOT EXISTS blacklists (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, address TEXT UNIQUE, domain TEXT, reason TEXT,
+        source TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''',
+    '''CREATE TABLE IF NOT EXISTS lockers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, address TEXT UNIQUE, name TEXT, chain TEXT,
+        verified BOOLEAN DEFAULT 0, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)''',
+    '''CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, channel TEXT,
+        message_id TEXT, sent_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (project_id) REFERENCES projects(id))''',
+    # Durées par étape de chaque scan (table fille de scan_history)
+    '''CREATE TABLE IF NOT EXISTS scan_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, scan_id INTEGER NOT NULL, stage TEXT NOT NULL,
+        count INTEGER, total_s REAL, mean_s REAL, p50_s REAL, p95_s REAL, max_s REAL,
+        FOREIGN KEY (scan_id) REFERENCES scan_history(id))''',
+]
+
+# Colonnes ajoutées après coup aux bases existantes
+ADDED_COLUMNS = {
+    "projects": [("fingerprint", "TEXT"), ("verified_at", "DATETIME")],
+    "scan_history": [("projects_skipped", "INTEGER DEFAULT 0")],
+    "notifications": [("dedup_key", "TEXT"), ("verdict", "TEXT"), ("score", "REAL")],
+}
+
+# Index créés après l'ajout des colonnes
+INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_notifications_dedup ON notifications(dedup_key)",
+    "CREATE INDEX IF NOT EXISTS idx_scan_metrics_scan ON scan_metrics(scan_id)",
+]
+
+# Migrations versionnées (PRAGMA user_version) : chacune s'applique une seule fois, dans l'ordre,
+# en une transaction. La v1 est le schéma historique (SCHEMA + ADDED_COLUMNS + INDEXES),
+# idempotente pour les bases créées avant le versionnement.
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (2, "index de requêtes, score des snapshots de ratios, nettoyage des orphelins", [
+        "ALTER TABLE ratios ADD COLUMN score REAL",
+        # Lignes orphelines laissées par l'ancien INSERT OR REPLACE (nouvel id à chaque scan)
+        "DELETE FROM ratios WHERE project_id NOT IN (SELECT id FROM projects)",
+        "DELETE FROM notifications WHERE project_id NOT IN (SELECT id FROM projects)",
+        "CREATE INDEX IF NOT EXISTS idx_ratios_project_created ON ratios(project_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_notifications_project ON notifications(project_id)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_score ON projects(score DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_verdict_score ON projects(verdict, score DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects(updated_at)",
+        "CREATE INDEX IF NOT EXISTS idx_scan_history_start ON scan_history(scan_start)",
+    ]),
+    (3, "file de jobs multi-workers (scan_runs, scan_jobs)", [
+        """CREATE TABLE IF NOT EXISTS scan_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, mode TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'running',
+            enqueue_done INTEGER NOT NULL DEFAULT 0, scan_history_id INTEGER,
+            started_at DATETIME DEFAULT CURRENT_TIMESTAMP, finished_at DATETIME)""",
+        # Un job par projet et par run : UNIQUE garantit qu'un projet n'est mis en file qu'une fois par scan
+        """CREATE TABLE IF NOT EXISTS scan_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER NOT NULL, name TEXT NOT NULL, source TEXT,
+            payload TEXT NOT NULL, priority INTEGER NOT NULL DEFAULT 3, status TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT, lease_until REAL, attempts INTEGER NOT NULL DEFAULT 0, verdict TEXT, score REAL,
+            result TEXT, error TEXT, finished_at DATETIME, UNIQUE(run_id, name, source),
+            FOREIGN KEY (run_id) REFERENCES scan_runs(id))""",
+        "CREATE INDEX IF NOT EXISTS idx_scan_jobs_claim ON scan_jobs(run_id, status, priority, id)",
+        "CREATE INDEX IF NOT EXISTS idx_scan_runs_status ON scan_runs(status)",
+    ]),
+    (4, "points de reprise des scans (scan_runs.sources_done, resumes)", [
+        # Sources dont la liste de projets est déjà enregistrée dans scan_jobs (JSON)
+        "ALTER TABLE scan_runs ADD COLUMN sources_done TEXT",
+        "ALTER TABLE scan_runs ADD COLUMN resumes INTEGER NOT NULL DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS idx_scan_runs_mode_status ON scan_runs(mode, status, id)",
+    ]),
+    (5, "heartbeat du coordinateur d'un run réparti (scan_runs.heartbeat_at)", [
+        # Epoch (comme scan_jobs.lease_until) ; un run alimenté sans heartbeat récent est abandonné
+        "ALTER TABLE scan_runs ADD COLUMN heartbeat_at REAL",
+    ]),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Colonnes renvoyées par l'API de lecture
+_PROJECT_FIELDS = ["name", "source", "verdict", "score", "reason", "link", "website", "updated_at"]
+
+# Champs des fetchers couverts par l'empreinte (les champs enrichis en sont exclus)
+FINGERPRINT_FIELDS = ["name", "symbol", "source", "link", "chain", "hard_cap_usd", "website",
+                      "twitter", "telegram", "github", "contract_address", "pair_address"]
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, float):
+        return round(value, 6)
+    return value
+
+
+def project_fingerprint(p: Dict, salt: str = "") -> str:
+    """Empreinte SHA-256 des champs normalisés du fetcher (+ sel, ex. signature du scoring)."""
+    payload = {k: _normalize(p.get(k)) for k in FINGERPRINT_FIELDS if p.get(k) not in (None, "")}
+    raw = json.dumps(payload, sort_keys=True, default=str) + salt
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+# UPSERT : l'id du projet reste stable (INSERT OR REPLACE supprimait et recréait la ligne)
+_PROJECT_SQL = ("INSERT INTO projects (name, source, verdict, score, reason, estimated_mc_eur, link, website, twitter, telegram, github, fingerprint, verified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name, source) DO UPDATE SET verdict = excluded.verdict, score = excluded.score, reason = excluded.reason, "
+                "estimated_mc_eur = excluded.estimated_mc_eur, link = excluded.link, website = excluded.website, "
+                "twitter = excluded.twitter, telegram = excluded.telegram, github = excluded.github, "
+                "fingerprint = excluded.fingerprint, verified_at = excluded.verified_at, updated_at = CURRENT_TIMESTAMP")
+# Le project_id est résolu dans SQLite : pas besoin de lastrowid, donc executemany possible
+_RATIO_SQL = (f"INSERT INTO ratios (project_id, {', '.join(RATIO_COLUMNS)}, score) "
+              f"SELECT id, {', '.join('?' * len(RATIO_COLUMNS))}, ? FROM projects WHERE name = ? AND source = ?")
+_NOTIFICATION_SQL = ("INSERT OR IGNORE INTO notifications (project_id, channel, message_id, dedup_key, verdict, score) "
+                     "SELECT id, ?, ?, ?, ?, ? FROM projects WHERE name = ? AND source = ?")
+# Point de reprise : le projet est marqué fait dans la même transaction que son écriture
+_PROGRESS_SQL = ("UPDATE scan_jobs SET status = 'done', verdict = ?, score = ?, payload = ?, result = ?, "
+                 "finished_at = CURRENT_TIMESTAMP WHERE run_id = ? AND name = ? AND source = ?")
+
+
+def project_rows(p: Dict, analysis: Dict) -> Tuple[Tuple, Optional[Tuple]]:
+    """Paramètres de _PROJECT_SQL et de _RATIO_SQL (None pour un rejet dur, sans ratios)."""
+    project = (p['name'], p['source'], analysis['verdict'], analysis['score'], analysis.get('reason'), p.get('mc', 0),
+               p.get('link'), p.get('website'), p.get('twitter'), p.get('telegram'), p.get('github'),
+               p.get('fingerprint'), datetime.now())
+    ratios = analysis.get('ratios')
+    if not ratios:
+        return project, None
+    return project, tuple(ratios.get(k) for k in RATIO_COLUMNS) + (analysis['score'], p['name'], p['source'])
+
+
+class ProjectStore:
+    """Connexion SQLite unique (WAL) avec tampon de lignes vidé par lots.
+
+    Les lignes sont écrites en une transaction tous les `batch_size` projets ou
+    toutes les `flush_interval` secondes ; un arrêt brutal perd au plus un lot.
+    """
+
+    def __init__(self, db_path: str = 'quantum.db', batch_size: int = 50, flush_interval: float = 2.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.db: Optional[aiosqlite.Connection] = None
+        self._projects: List[Tuple] = []
+        self._ratios: List[Tuple] = []
+        self._notifications: List[Tuple] = []
+        self._progress: List[Tuple] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"flushes": 0, "rows_written": 0}
+
+    @classmethod
+    def from_settings(cls, db_path: str, settings: Dict) -> "ProjectStore":
+        database = settings.get('database', {})
+        return cls(db_path, batch_size=database.get('batch_size', 50),
+                   flush_interval=database.get('flush_interval', 2.0))
+
+    async def open(self):
+        """Ouvre la connexion, applique les pragmas et les migrations en attente."""
+        if self.db is not None:
+            return
+        self.db = await aiosqlite.connect(self.db_path)
+        for pragma in PRAGMAS:
+            await self.db.execute(pragma)
+        await self._migrate()
+        self._lock = asyncio.Lock()
+        self._flusher = asyncio.create_task(self._flush_periodically(), name="db-flusher")
+
+    async def _migrate(self):
+        async with self.db.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        if version < 1:
+            await self._apply_migration(1, "schéma initial (7 tables + scan_metrics)", self._create_base_schema())
+            version = 1
+        for target, description, statements in MIGRATIONS:
+            if version < target:
+                await self._apply_migration(target, description, self._run_statements(statements))
+                version = target
+
+    async def _apply_migration(self, target: int, description: str, steps):
+        await self.db.execute("BEGIN")
+        try:
+            await steps
+            # user_version est dans l'en-tête de la base : transactionnel comme le reste
+            await self.db.execute(f"PRAGMA user_version = {int(target)}")
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            raise
+        logger.info(f"Migration DB v{target}: {description}")
+
+    async def _run_statements(self, statements: List[str]):
+        for sql in statements:
+            await self.db.execute(sql)
+
+    async def _create_base_schema(self):
+        for ddl in SCHEMA:
+            await self.db.execute(ddl)
+        await self._add_missing_columns()
+        for ddl in INDEXES:
+            await self.db.execute(ddl)
+
+    async def _add_missing_columns(self):
+        for table, columns in ADDED_COLUMNS.items():
+            async with self.db.execute(f"PRAGMA table_info({table})") as cursor:
+                existing = {row[1] for row in await cursor.fetchall()}
+            for column, decl in columns:
+                if column not in existing:
+                    await self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    async def close(self):
+        """Vide le tampon puis ferme la connexion (aussi appelé sur annulation)."""
+        if self.db is None:
+            return
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        try:
+            await self.flush()
+        finally:
+            await self.db.close()
+            self.db = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._projects) + len(self._notifications)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"DB Flush Error: {e}")
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    async def save_project(self, p: Dict, analysis: Dict, run_id: Optional[int] = None):
+        """Met en tampon le projet et ses 21 ratios ; vide le lot s'il est plein.
+
+        Avec `run_id`, le job du scan (point de reprise) est marqué fait dans le même lot.
+        """
+        project, ratios = project_rows(p, analysis)
+        self._projects.append(project)
+        if ratios:  # les rejets durs n'ont pas de ratios
+            self._ratios.append(ratios)
+        if run_id is not None:
+            self._progress.append((analysis['verdict'], analysis['score'], json.dumps(p, default=str),
+                                   json.dumps(analysis, default=str), run_id, p['name'], p['source']))
+        if len(self._projects) >= self.batch_size:
+            await self.flush()
+
+    async def save_notification(self, name: str, source: str, channel: str, message_id,
+                                dedup_key: str, verdict: str, score: float):
+        """Met en tampon une notification envoyée (écrite après les projets du même lot)."""
+        self._notifications.append((channel, str(message_id) if message_id is not None else None,
+                                    dedup_key, verdict, score, name, source))
+
+    async def flush(self):
+        """Écrit le tampon en une seule transaction (executemany)."""
+        if self.db is None or not self.pending:
+            return
+        async with self._lock:
+            projects, ratios, notifications, progress = self._projects, self._ratios, self._notifications, self._progress
+            self._projects, self._ratios, self._notifications, self._progress = [], [], [], []
+            if not (projects or notifications):
+                return
+            try:
+                with metrics.timer("db_flush"):
+                    await self.db.execute("BEGIN")
+                    if projects:
+                        await self.db.executemany(_PROJECT_SQL, projects)
+                    if ratios:
+                        await self.db.executemany(_RATIO_SQL, ratios)
+                    if notifications:
+                        await self.db.executemany(_NOTIFICATION_SQL, notifications)
+                    if progress:
+                        await self.db.executemany(_PROGRESS_SQL, progress)
+                    await self.db.commit()
+            except BaseException:
+                await self.db.rollback()
+                # Remise en tête du tampon pour la prochaine tentative
+                self._projects[:0], self._ratios[:0], self._notifications[:0] = projects, ratios, notifications
+                self._progress[:0] = progress
+                raise
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += len(projects) + len(ratios) + len(notifications)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Écriture hors tampon en une transaction, sérialisée avec les flush."""
+        async with self._lock:
+            await self.db.execute("BEGIN")
+            try:
+                yield self.db
+                await self.db.commit()
+            except BaseException:
+                await self.db.rollback()
+                raise
+
+    async def save_scan_history(self, scan_start: datetime, scan_end: datetime, found: int, stats: Dict[str, Any],
+                                stage_metrics: Optional[Dict[str, Dict[str, float]]] = None) -> int:
+        """Historique de scan (table 3) + durées par étape (scan_metrics), écrits après le dernier lot."""
+        await self.flush()
+        async with self.transaction() as db:
+            cursor = await db.execute("INSERT INTO scan_history (scan_start, scan_end, projects_found, projects_accepted, projects_rejected, projects_review, errors, projects_skipped) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                      (scan_start, scan_end, found, stats['accepted'], stats['rejected'], stats['review'], str(stats['errors']), stats.get('skipped', 0)))
+            scan_id = cursor.lastrowid
+            if stage_metrics:
+                await db.executemany(
+                    "INSERT INTO scan_metrics (scan_id, stage, count, total_s, mean_s, p50_s, p95_s, max_s) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(scan_id, stage, m['count'], m['total_s'], m['mean_s'], m['p50_s'], m['p95_s'], m['max_s'])
+                     for stage, m in stage_metrics.items()])
+        return scan_id
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    async def load_fingerprints(self) -> Dict[Tuple[str, str], Tuple[str, Optional[datetime]]]:
+        """(name, source) -> (empreinte, date de dernière vérification) pour le scan incrémental."""
+        await self.flush()
+        result = {}
+        async with self.db.execute("SELECT name, source, fingerprint, verified_at FROM projects WHERE fingerprint IS NOT NULL") as cursor:
+            async for name, source, fingerprint, verified_at in cursor:
+                result[(name, source)] = (fingerprint, datetime.fromisoformat(verified_at) if verified_at else None)
+        return result
+
+    async def load_notification_keys(self) -> Set[str]:
+        """Clés de déduplication des notifications déjà envoyées."""
+        async with self.db.execute("SELECT dedup_key FROM notifications WHERE dedup_key IS NOT NULL") as cursor:
+            return {row[0] for row in await cursor.fetchall()}
+
+    # ------------------------------------------------------------------
+    # Requêtes d'historique (toutes servies par un index)
+    # ------------------------------------------------------------------
+
+    async def _fetch_dicts(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        await self.flush()
+        async with self.db.execute(sql, params) as cursor:
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+    async def latest_verdict(self, name: str, source: str) -> Optional[Dict[str, Any]]:
+        """Dernier verdict d'un projet (index UNIQUE(name, source))."""
+        rows = await self._fetch_dicts(f"SELECT {', '.join(_PROJECT_FIELDS)} FROM projects WHERE name = ? AND source = ?",
+                                       (name, source))
+        return rows[0] if rows else None
+
+    async def latest_verdicts(self, verdict: Optional[str] = None, since: Optional[datetime] = None,
+                              limit: int = 100) -> List[Dict[str, Any]]:
+        """Derniers verdicts, les plus récents d'abord (filtre par verdict ou date de mise à jour UTC)."""
+        where, params = [], []
+        if verdict:
+            where.append("verdict = ?"); params.append(verdict)
+        if since:
+            where.append("updated_at >= ?"); params.append(since.strftime('%Y-%m-%d %H:%M:%S'))
+        clause = f"WHERE {' AND '.join(where)} " if where else ""
+        return await self._fetch_dicts(f"SELECT {', '.join(_PROJECT_FIELDS)} FROM projects {clause}"
+                                       f"ORDER BY updated_at DESC LIMIT ?", (*params, limit))
+
+    async def score_history(self, name: str, source: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Scores successifs d'un projet, du plus récent au plus ancien (index ratios(project_id, created_at))."""
+        return await self._fetch_dicts(
+            "SELECT r.created_at, r.score FROM ratios r "
+            "WHERE r.project_id = (SELECT id FROM projects WHERE name = ? AND source = ?) "
+            "ORDER BY r.created_at DESC, r.id DESC LIMIT ?", (name, source, limit if limit is not None else -1))
+
+    async def top_projects(self, n: int = 10, verdict: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Top-N par score (index projects(score) ou projects(verdict, score))."""
+        if verdict:
+            return await self._fetch_dicts(f"SELECT {', '.join(_PROJECT_FIELDS)} FROM projects WHERE verdict = ? "
+                                           f"ORDER BY score DESC LIMIT ?", (verdict, n))
+        return await self._fetch_dicts(f"SELECT {', '.join(_PROJECT_FIELDS)} FROM projects ORDER BY score DESC LIMIT ?", (n,))
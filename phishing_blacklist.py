@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Module Phishing Blacklist Quantum Scanner v6.1
+Liste MetaMask indexée en mémoire, téléchargée au plus une fois par TTL.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterable, Optional, Set
+
+import aiohttp
+from loguru import logger
+
+PHISHING_LIST_URL = "https://raw.githubusercontent.com/MetaMask/eth-phishing-detect/master/src/blacklist.json"
+
+
+class PhishingBlacklist:
+    """Index haché de la liste de phishing MetaMask (revalidation ETag + snapshot disque)"""
+
+    def __init__(self, url: str = PHISHING_LIST_URL, ttl: Optional[float] = None,
+                 snapshot_path: str = "cache/metamask_blacklist.json", retry_delay: float = 300):
+        self.url = url
+        self.ttl = ttl if ttl is not None else float(os.getenv('PHISHING_LIST_TTL_HOURS', 6)) * 3600
+        self.snapshot_path = snapshot_path
+        self.retry_delay = retry_delay
+
+        self._blacklist: Set[str] = set()
+        self._whitelist: Set[str] = set()
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._checked_at = 0.0
+        self._snapshot_loaded = False
+        self._lock: Optional[asyncio.Lock] = None
+
+        self.stats = {"downloads": 0, "not_modified": 0, "snapshot_loads": 0, "errors": 0}
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize(domain: str) -> str:
+        """Normalise un hostname (minuscules, sans point final ni port)."""
+        domain = (domain or "").strip().lower().rstrip('.')
+        return domain.split(':', 1)[0]
+
+    def is_blacklisted(self, domain: str) -> bool:
+        """Lookup O(1) : le domaine ou l'un de ses parents est-il blacklisté ?
+
+        Les suffixes sont testés du plus spécifique au plus général ; un suffixe
+        présent dans la whitelist l'emporte sur un parent blacklisté.
+        """
+        labels = self.normalize(domain).split('.')
+        for i in range(len(labels) - 1):
+            candidate = '.'.join(labels[i:])
+            if candidate in self._whitelist:
+                return False
+            if candidate in self._blacklist:
+                return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._blacklist)
+
+    @property
+    def is_fresh(self) -> bool:
+        return (time.time() - self._checked_at) < self.ttl
+
+    # ------------------------------------------------------------------
+    # Chargement / revalidation
+    # ------------------------------------------------------------------
+
+    def _build_index(self, blacklist: Iterable[str], whitelist: Iterable[str] = ()):
+        self._blacklist = {self.normalize(d) for d in blacklist if d}
+        self._whitelist = {self.normalize(d) for d in whitelist if d}
+
+    @staticmethod
+    def _parse(data) -> Dict[str, list]:
+        # blacklist.json est soit une liste brute, soit le format config.json {blacklist, whitelist, ...}
+        if isinstance(data, list):
+            return {"blacklist": data, "whitelist": []}
+        if isinstance(data, dict):
+            return {"blacklist": data.get('blacklist', []), "whitelist": data.get('whitelist', [])}
+        raise ValueError(f"Format de liste inattendu: {type(data).__name__}")
+
+    def _load_snapshot(self):
+        """Charge le snapshot disque (une seule fois par process)."""
+        self._snapshot_loaded = True
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snap = json.load(f)
+            self._build_index(snap.get('blacklist', []), snap.get('whitelist', []))
+            self._etag = snap.get('etag')
+            self._last_modified = snap.get('last_modified')
+            self._checked_at = float(snap.get('checked_at', 0))
+            self.stats['snapshot_loads'] += 1
+            logger.debug(f"Snapshot phishing chargé: {len(self._blacklist)} domaines")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Snapshot phishing illisible ({self.snapshot_path}): {e}")
+
+    def _write_snapshot(self):
+        """Écriture atomique du snapshot (tmp + rename)."""
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"  # un fichier par processus (workers)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "etag": self._etag, "last_modified": self._last_modified,
+                    "checked_at": self._checked_at,
+                    "blacklist": sorted(self._blacklist), "whitelist": sorted(self._whitelist),
+                }, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"Écriture snapshot phishing impossible: {e}")
+
+    async def refresh(self, session: Optional[aiohttp.ClientSession] = None, force: bool = False):
+        """Met à jour l'index si le TTL est expiré (requête conditionnelle)."""
+        if not self._snapshot_loaded:
+            self._load_snapshot()
+        if not force and self.is_fresh:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Un autre appel concurrent a pu rafraîchir pendant l'attente du verrou
+            if not force and self.is_fresh:
+                return
+            if session is None:
+                async with aiohttp.ClientSession() as own_session:
+                    await self._revalidate(own_session)
+            else:
+                await self._revalidate(session)
+
+    async def _revalidate(self, session: aiohttp.ClientSession):
+        headers = {}
+        if self._blacklist:
+            if self._etag: headers['If-None-Match'] = self._etag
+            if self._last_modified: headers['If-Modified-Since'] = self._last_modified
+        try:
+            timeout = aiohttp.ClientTimeout(total=60)
+            async with session.get(self.url, headers=headers, timeout=timeout) as resp:
+                if resp.status == 304:
+                    self.stats['not_modified'] += 1
+                    self._checked_at = time.time()
+                    self._write_snapshot()
+                    logger.debug("Liste phishing inchangée (304)")
+                    return
+                if resp.status != 200:
+                    raise RuntimeError(f"HTTP {resp.status}")
+                # raw.githubusercontent sert du text/plain : on parse le texte nous-mêmes
+                parsed = self._parse(json.loads(await resp.text()))
+                self._build_index(parsed['blacklist'], parsed['whitelist'])
+                self._etag = resp.headers.get('ETag')
+                self._last_modified = resp.headers.get('Last-Modified')
+                self._checked_at = time.time()
+                self.stats['downloads'] += 1
+                self._write_snapshot()
+                logger.info(f"Liste phishing MetaMask chargée: {len(self._blacklist)} domaines")
+        except Exception as e:
+            self.stats['errors'] += 1
+            # On garde l'index existant et on retente après retry_delay plutôt qu'à chaque projet
+            self._checked_at = time.time() - self.ttl + self.retry_delay
+            logger.warning(f"Rafraîchissement liste phishing échoué: {e}")
+
+
+# Instance globale
+phishing_blacklist = PhishingBlacklist()
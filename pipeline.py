@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Module Pipeline Quantum Scanner v6.1
+Pipeline asynchrone par étages avec files bornées (backpressure).
+"""
+
+import asyncio
+import itertools
+import math
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional
+
+from loguru import logger
+
+_STOP = object()
+
+
+@dataclass
+class Stage:
+    """Un étage du pipeline : `handler(item)` retourne l'item pour l'étage suivant (None = abandon).
+
+    Avec `batch_size > 1`, `handler(items)` reçoit jusqu'à `batch_size` items déjà en file
+    (sans attendre qu'un lot se remplisse) et retourne une liste de même longueur.
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+    batch_size: int = 1
+
+
+class Pipeline:
+    """Enchaîne des étages reliés par des asyncio.Queue bornées.
+
+    `submit()` bloque quand la file d'entrée est pleine : un étage lent ralentit
+    automatiquement les étages amont au lieu d'accumuler des items en mémoire.
+    Avec `prioritized=True`, la file d'entrée est une file de priorité : les items
+    de plus petite priorité (ex. tier 1) passent devant le reste de l'arriéré.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 100,
+                 on_error: Optional[Callable[[Stage, Any, BaseException], None]] = None,
+                 prioritized: bool = False):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.prioritized = prioritized
+        self._seq = itertools.count()
+        self._queues: List[asyncio.Queue] = []
+        self._workers: List[List[asyncio.Task]] = []
+        self._started = False
+
+    async def start(self):
+        if self._started:
+            return
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        if self.prioritized:
+            self._queues[0] = asyncio.PriorityQueue(maxsize=self.queue_size)
+        for index, stage in enumerate(self.stages):
+            self._workers.append([
+                asyncio.create_task(self._run_worker(index), name=f"{stage.name}-{n}")
+                for n in range(max(1, stage.workers))
+            ])
+        self._started = True
+
+    async def submit(self, item: Any, priority: float = 0):
+        """Injecte un item dans le premier étage (attend si la file est pleine)."""
+        if self.prioritized:
+            # Le compteur départage les priorités égales (FIFO) sans comparer les items
+            item = (priority, next(self._seq), item)
+        await self._queues[0].put(item)
+
+    async def _run_worker(self, index: int):
+        stage = self.stages[index]
+        queue = self._queues[index]
+        next_queue = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        while True:
+            items = [await queue.get()]
+            while len(items) < stage.batch_size and items[-1] is not _STOP and not queue.empty():
+                items.append(queue.get_nowait())
+            taken = len(items)
+            if self.prioritized and index == 0:
+                items = [item[2] for item in items]
+            try:
+                stop = items[-1] is _STOP
+                if stop:
+                    items.pop()
+                for result in await self._handle(stage, items):
+                    if next_queue is not None and result is not None:
+                        await next_queue.put(result)
+                if stop:
+                    return
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
+
+    async def _handle(self, stage: Stage, items: List[Any]) -> List[Any]:
+        """Résultats de l'étage pour `items` ; une erreur abandonne l'item (ou le lot) concerné."""
+        if not items:
+            return []
+        try:
+            if stage.batch_size > 1:
+                return await stage.handler(items)
+            return [await stage.handler(items[0])]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            for item in items:
+                if self.on_error:
+                    self.on_error(stage, item, e)
+                else:
+                    logger.error(f"Erreur étage {stage.name}: {e}")
+            return []
+
+    async def join(self):
+        """Ferme l'entrée et attend que chaque étage ait vidé sa file, dans l'ordre."""
+        for index, workers in enumerate(self._workers):
+            for _ in workers:
+                if self.prioritized and index == 0:
+                    await self._queues[index].put((math.inf, next(self._seq), _STOP))
+                else:
+                    await self._queues[index].put(_STOP)
+            await asyncio.gather(*workers)
+        self._workers = []
+        self._started = False
+
+    async def cancel(self):
+        """Arrêt immédiat sans vider les files."""
+        for workers in self._workers:
+            for task in workers:
+                task.cancel()
+        for workers in self._workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._workers = []
+        self._started = False
+
+    def qsizes(self) -> dict:
+        return {stage.name: queue.qsize() for stage, queue in zip(self.stages, self._queues)}
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Module Rate Limiter Quantum Scanner v6.1
+Token bucket adaptatif par hôte, Retry-After, backoff avec jitter et circuit breaker.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+
+
+class CircuitOpenError(Exception):
+    """Levée quand le circuit d'un hôte est ouvert (échec immédiat)."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """En-tête Retry-After -> secondes (formats delta-seconds et HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket à réservation : pas d'await entre lecture et mise à jour, donc sûr en asyncio.
+
+    Le débit est adaptatif (AIMD) : divisé par deux sur 429, remonté progressivement sur succès.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Consomme un jeton et retourne le délai d'attente nécessaire (secondes)."""
+        now = time.monotonic()
+        if self.rate == float('inf'):
+            return max(0.0, self.paused_until - now)
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.paused_until - now)
+
+    def refund(self):
+        """Rend le jeton d'une réservation abandonnée (la requête ne partira pas), sans dépasser `burst`."""
+        if self.rate != float('inf'):
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def pause(self, seconds: float):
+        """Bloque l'hôte pour toutes les requêtes concurrentes (Retry-After partagé)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def slow_down(self):
+        if self.rate != float('inf'):
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def speed_up(self):
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """closed -> open après `failure_threshold` échecs consécutifs ; half-open après `cooldown`."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.open_seconds = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True  # une seule requête de test
+            return True
+        return False
+
+    def release_probe(self):
+        """Requête de test terminée sans verdict (annulée, 429) : une autre pourra la remplacer."""
+        self._probe_in_flight = False
+
+    def _close_period(self):
+        if self.opened_at:
+            self.open_seconds += time.monotonic() - self.opened_at
+            self.opened_at = 0.0
+
+    def record_success(self):
+        self.failures = 0
+        self._probe_in_flight = False
+        if self.state != "closed":
+            self._close_period()
+            self.state = "closed"
+
+    def record_failure(self) -> bool:
+        """Retourne True si cet échec ouvre le circuit."""
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            self._close_period()
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def open_time(self) -> float:
+        return self.open_seconds + (time.monotonic() - self.opened_at if self.opened_at else 0.0)
+
+
+class HostState:
+    def __init__(self, bucket: TokenBucket, breaker: CircuitBreaker):
+        self.bucket = bucket
+        self.breaker = breaker
+        self.stats = self.new_stats()
+
+    @staticmethod
+    def new_stats() -> Dict[str, float]:
+        return {"requests": 0, "successes": 0, "failures": 0, "throttled_429": 0, "fast_failed": 0,
+                "throttle_wait_s": 0.0, "retry_after_sleep_s": 0.0, "backoff_sleep_s": 0.0}
+
+
+class AdaptiveRateLimiter:
+    """Limiteur par hôte partagé par tous les appels de fetch_with_retry (mémoire entre requêtes)."""
+
+    def __init__(self, default_rate: float = 1.0, default_burst: float = 1.0,
+                 host_limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 failure_threshold: int = 5, cooldown: float = 120.0,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_limits = {h.lower(): v for h, v in (host_limits or {}).items()}
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._hosts: Dict[str, HostState] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Dict, default_interval: float) -> "AdaptiveRateLimiter":
+        """config.yml `rate_limits` ; le débit par défaut découle de API_DELAY (1 requête / intervalle)."""
+        limits = settings.get('rate_limits', {})
+        breaker = limits.get('circuit_breaker', {})
+        return cls(
+            default_rate=1.0 / default_interval if default_interval > 0 else float('inf'),
+            default_burst=limits.get('default_burst', 1),
+            host_limits=limits.get('hosts', {}),
+            failure_threshold=breaker.get('failure_threshold', 5),
+            cooldown=breaker.get('cooldown', 120),
+            base_backoff=limits.get('base_backoff', 1.0),
+            max_backoff=limits.get('max_backoff', 60.0),
+        )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _state(self, host: str) -> HostState:
+        if host not in self._hosts:
+            conf = self.host_limits.get(host, {})
+            bucket = TokenBucket(conf.get('rate', self.default_rate), conf.get('burst', self.default_burst))
+            self._hosts[host] = HostState(bucket, CircuitBreaker(self.failure_threshold, self.cooldown))
+        return self._hosts[host]
+
+    # ------------------------------------------------------------------
+    # Cycle d'une requête
+    # ------------------------------------------------------------------
+
+    async def acquire(self, url: str) -> bool:
+        """Attend un jeton pour l'hôte ; CircuitOpenError si l'hôte est en échec.
+
+        Retourne True si la requête est la requête de test du half-open : l'appelant la libère
+        (release_probe) si elle se termine sans record_success / record_failure.
+        """
+        state = self._state(self.host_of(url))
+        if not state.breaker.allow():
+            state.stats['fast_failed'] += 1
+            raise CircuitOpenError(self.host_of(url))
+        probe = state.breaker.state == "half_open"
+        state.stats['requests'] += 1
+        wait = state.bucket.reserve()
+        if wait > 0:
+            state.stats['throttle_wait_s'] += wait
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                if probe:
+                    state.breaker.release_probe()
+                raise
+        return probe
+
+    def release_probe(self, url: str):
+        self._state(self.host_of(url)).breaker.release_probe()
+
+    def record_success(self, url: str):
+        state = self._state(self.host_of(url))
+        state.stats['successes'] += 1
+        state.breaker.record_success()
+        state.bucket.speed_up()
+
+    def record_failure(self, url: str):
+        host = self.host_of(url)
+        state = self._state(host)
+        state.stats['failures'] += 1
+        if state.breaker.record_failure():
+            logger.warning(f"Circuit ouvert pour {host} ({state.breaker.cooldown:.0f}s)")
+
+    def record_throttled(self, url: str, retry_after: Optional[float], attempt: int) -> float:
+        """429 : ralentit l'hôte, le met en pause pour tout le monde, retourne le délai à respecter."""
+        state = self._state(self.host_of(url))
+        state.stats['throttled_429'] += 1
+        state.bucket.slow_down()
+        delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+        delay = min(delay, self.max_backoff)
+        state.bucket.pause(delay)
+        return delay
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Backoff exponentiel « full jitter »."""
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    async def sleep(self, url: str, seconds: float, reason: str):
+        """Sommeil comptabilisé (retry_after / backoff) pour mesurer le temps perdu par hôte."""
+        self._state(self.host_of(url)).stats[f"{reason}_sleep_s"] += seconds
+        await asyncio.sleep(seconds)
+
+    # ------------------------------------------------------------------
+    # Compteurs
+    # ------------------------------------------------------------------
+
+    def reset_stats(self):
+        for state in self._hosts.values():
+            state.stats = HostState.new_stats()
+            state.breaker.open_seconds = 0.0
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            host: {**state.stats, "open_circuit_s": round(state.breaker.open_time(), 3),
+                   "circuit": state.breaker.state, "rate": state.bucket.rate}
+            for host, state in self._hosts.items()
+        }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Module Ratio Archive Quantum Scanner v6.1
+Archive colonnaire append-only des snapshots de ratios (float32, fichiers mappés en mémoire).
+
+Disposition sur disque :
+    <path>/manifest.json               scans archivés + index clé -> (name, source)
+    <path>/scans/scan_<id>.npy         matrice (N, 22) float32 d'un scan (21 ratios + score)
+    <path>/scans/scan_<id>.keys.json   clés des N lignes, dans l'ordre de la matrice
+    <path>/projects/<clé>.rec          historique d'un projet : enregistrements fixes (scan, timestamp, valeurs)
+
+Les lectures (historique d'un projet, matrice d'un scan) sont des np.memmap : aucune copie,
+aucune requête SQLite.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from persistence import RATIO_COLUMNS
+from startup import lazy_module
+
+np = lazy_module("numpy")
+
+# Colonnes d'une ligne archivée : les 21 ratios puis le score (0-100)
+ARCHIVE_COLUMNS = RATIO_COLUMNS + ["score"]
+SCORE_INDEX = len(RATIO_COLUMNS)
+
+_RECORD_DTYPE = None
+
+
+def record_dtype():
+    """Enregistrement d'historique : 8 + 8 + 22 x 4 = 104 octets, little-endian."""
+    global _RECORD_DTYPE
+    if _RECORD_DTYPE is None:
+        _RECORD_DTYPE = np.dtype([("scan", "<i8"), ("timestamp", "<f8"), ("values", "<f4", (len(ARCHIVE_COLUMNS),))])
+    return _RECORD_DTYPE
+
+
+def project_key(name: str, source: str) -> str:
+    return hashlib.sha1(f"{name}\x00{source}".encode("utf-8")).hexdigest()[:20]
+
+
+class RatioArchive:
+    """Snapshots de ratios par projet et par scan, en float32, lus par np.memmap.
+
+    Les lignes d'un scan sont mises en tampon (`append`) puis écrites d'un bloc à la
+    clôture du scan (`commit_scan`) : une matrice par scan, un ajout par fichier projet.
+    """
+
+    def __init__(self, path: str = "results/ratio_archive", enabled: bool = True,
+                 min_history: int = 3, history_window: int = 30):
+        self.path = path
+        self.enabled = enabled
+        self.min_history = min_history
+        self.history_window = history_window
+        self._pending: Dict[str, Tuple[Tuple[str, str], List[float]]] = {}
+        self._manifest: Optional[Dict] = None
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> "RatioArchive":
+        cfg = settings.get('ratio_archive', {})
+        return cls(cfg.get('path', "results/ratio_archive"), cfg.get('enabled', True),
+                   cfg.get('min_history', 3), cfg.get('history_window', 30))
+
+    # ------------------------------------------------------------------
+    # Manifeste
+    # ------------------------------------------------------------------
+
+    @property
+    def manifest(self) -> Dict:
+        if self._manifest is None:
+            try:
+                with open(os.path.join(self.path, "manifest.json"), encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            except FileNotFoundError:
+                self._manifest = {"columns": ARCHIVE_COLUMNS, "scans": [], "projects": {}}
+            except Exception as e:
+                logger.warning(f"Manifeste de l'archive illisible ({self.path}): {e}")
+                self._manifest = {"columns": ARCHIVE_COLUMNS, "scans": [], "projects": {}}
+        return self._manifest
+
+    def _write_manifest(self):
+        # Écriture atomique : un lecteur concurrent ne voit jamais un manifeste partiel
+        tmp_path = os.path.join(self.path, "manifest.json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, os.path.join(self.path, "manifest.json"))
+
+    def scans(self) -> List[Dict]:
+        """Scans archivés : [{"scan", "timestamp", "rows"}], du plus ancien au plus récent."""
+        return list(self.manifest["scans"])
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def append(self, project: Dict, analysis: Dict):
+        """Met en tampon le snapshot d'un projet (les rejets durs, sans ratios, sont ignorés)."""
+        ratios = analysis.get('ratios')
+        if not self.enabled or not ratios:
+            return
+        name, source = project['name'], project['source']
+        # Un projet vérifié deux fois dans la même fenêtre : seul le dernier snapshot est gardé
+        self._pending[project_key(name, source)] = (
+            (name, source), [ratios.get(k, 0.0) for k in RATIO_COLUMNS] + [analysis['score']])
+
+    def commit_scan(self, scan_id: Optional[int] = None, timestamp: Optional[float] = None) -> Optional[int]:
+        """Écrit les snapshots en tampon sous `scan_id` (id de scan_history, sinon numéro suivant)."""
+        if not self.enabled or not self._pending:
+            return None
+        pending, self._pending = self._pending, {}
+        scans = self.manifest["scans"]
+        if scan_id is None or any(s["scan"] >= scan_id for s in scans):
+            scan_id = (scans[-1]["scan"] + 1) if scans else 1
+        timestamp = timestamp or time.time()
+        keys = list(pending)
+        matrix = np.array([pending[k][1] for k in keys], dtype=np.float32)
+
+        try:
+            os.makedirs(os.path.join(self.path, "scans"), exist_ok=True)
+            os.makedirs(os.path.join(self.path, "projects"), exist_ok=True)
+            base = os.path.join(self.path, "scans", f"scan_{scan_id}")
+            with open(f"{base}.keys.json", 'w', encoding='utf-8') as f:
+                json.dump(keys, f)
+            np.save(f"{base}.tmp.npy", matrix)
+            os.replace(f"{base}.tmp.npy", f"{base}.npy")
+
+            records = np.zeros(len(keys), dtype=record_dtype())
+            records["scan"] = scan_id
+            records["timestamp"] = timestamp
+            records["values"] = matrix
+            projects = self.manifest["projects"]
+            for i, key in enumerate(keys):
+                with open(os.path.join(self.path, "projects", f"{key}.rec"), 'ab') as f:
+                    f.write(records[i:i + 1].tobytes())
+                projects.setdefault(key, list(pending[key][0]))
+
+            scans.append({"scan": scan_id, "timestamp": timestamp, "rows": len(keys)})
+            self._write_manifest()
+        except Exception as e:
+            logger.error(f"Archive des ratios: écriture du scan {scan_id} impossible: {e}")
+            return None
+        logger.info(f"Archive des ratios: scan {scan_id}, {len(keys)} snapshots")
+        return scan_id
+
+    # ------------------------------------------------------------------
+    # Lecture (zéro copie)
+    # ------------------------------------------------------------------
+
+    def project_history(self, name: str, source: str) -> "np.ndarray":
+        """Historique d'un projet (enregistrements scan/timestamp/values), mappé en mémoire."""
+        path = os.path.join(self.path, "projects", f"{project_key(name, source)}.rec")
+        dtype = record_dtype()
+        try:
+            # Un enregistrement tronqué (arrêt pendant l'écriture) est ignoré
+            count = os.path.getsize(path) // dtype.itemsize
+        except OSError:
+            count = 0
+        if not count:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+    def scan_matrix(self, scan_id: int) -> Tuple[List[Tuple[str, str]], "np.ndarray"]:
+        """(projets, matrice (N, 22) float32 mappée en mémoire) d'un scan archivé."""
+        base = os.path.join(self.path, "scans", f"scan_{scan_id}")
+        with open(f"{base}.keys.json", encoding='utf-8') as f:
+            keys = json.load(f)
+        projects = self.manifest["projects"]
+        return [tuple(projects.get(k, (k, None))) for k in keys], np.load(f"{base}.npy", mmap_mode='r')
+
+    def history_features(self, name: str, source: str) -> Dict[str, float]:
+        """Volatilité et performance historiques du score, sur les `history_window` derniers scans.
+
+        Vide tant que le projet a moins de `min_history` snapshots (les valeurs simulées
+        de BatchScorer s'appliquent alors).
+        """
+        if not self.enabled:
+            return {}
+        history = self.project_history(name, source)
+        if len(history) < max(self.min_history, 2):
+            return {}
+        scores = history["values"][-self.history_window:, SCORE_INDEX].astype(np.float64) / 100
+        # Écart-type de valeurs dans [0, 1] : au plus 0.5, d'où le facteur 2
+        return {
+            "volatility_score": min(1.0, 2 * float(scores.std())),
+            "historical_performance": min(1.0, max(0.0, float(scores.mean()))),
+        }
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Module Scoring Quantum Scanner v6.1
+Calcul vectorisé des 21 ratios et des scores pondérés pour N projets.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from persistence import RATIO_COLUMNS
+from startup import lazy_module
+
+# NumPy n'est chargé qu'au premier scoring par lot (import de scoring sans coût au démarrage)
+np = lazy_module("numpy")
+
+RATIO_NAMES = RATIO_COLUMNS
+
+# Valeurs par défaut des champs absents d'un projet enrichi (formules v6.0 des 21 ratios)
+NUMERIC_DEFAULTS = {
+    "mc": 1, "fdv": 1, "total_supply": 1, "circ_supply": 1, "volume_24h": 0,
+    "lp_reserves_usd": 0, "top10_concentration": 0.5, "social_followers": 0,
+    "github_commits": 0, "volatility_score": 0.5, "historical_performance": 0.5,
+}
+BOOL_FIELDS = ["owner_renounced", "lp_locked", "contract_verified"]
+
+# Ratios constants (simulés)
+CONSTANT_RATIOS = {
+    "market_sentiment": 0.5, "vesting_score": 0.7, "exchange_listing_score": 0.5,
+    "community_growth": 0.6, "revenue_generation": 0.5, "correlation": 0.5,
+    "risk_adjusted_return": 0.5,
+}
+
+
+def _cap(x: np.ndarray) -> np.ndarray:
+    # Équivalent exact de min(1.0, x) en Python (y compris pour NaN -> 1.0)
+    return np.where(x < 1.0, x, 1.0)
+
+
+def _safe_div(num: np.ndarray, den: np.ndarray, default: float) -> np.ndarray:
+    out = np.full(num.shape, default, dtype=np.float64)
+    np.divide(num, den, out=out, where=den > 0)
+    return np.where(den > 0, _cap(out), default)
+
+
+@dataclass
+class ScoreResult:
+    ratios: np.ndarray     # (N, 21) dans l'ordre RATIO_NAMES
+    scores: np.ndarray     # (N,)
+    verdicts: np.ndarray   # (N,) "GO" / "REVIEW" / "REJECT"
+
+    def ratio_dicts(self) -> List[Dict[str, float]]:
+        return [dict(zip(RATIO_NAMES, row.tolist())) for row in self.ratios]
+
+
+class BatchScorer:
+    """Scoring vectorisé : une passe NumPy pour les 21 ratios + scores + verdicts."""
+
+    def __init__(self, weights: Mapping[str, float], go_score: float, review_score: float,
+                 tier1_auditors: Sequence[str]):
+        self.weights = dict(weights)
+        self._weight_vector = None
+        self.go_score = go_score
+        self.review_score = review_score
+        self.tier1_auditors = list(tier1_auditors)
+
+    @property
+    def weight_vector(self) -> np.ndarray:
+        # Construit au premier scoring : instancier le scorer ne charge pas NumPy
+        if self._weight_vector is None:
+            self._weight_vector = np.array([self.weights.get(k, 0) for k in RATIO_NAMES], dtype=np.float64)
+        return self._weight_vector
+
+    # ------------------------------------------------------------------
+    # Entrées colonnaires
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def columns_from_projects(projects: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Projets enrichis (dicts) -> colonnes NumPy, avec les valeurs par défaut NUMERIC_DEFAULTS."""
+        projects = list(projects)
+        cols: Dict[str, np.ndarray] = {
+            name: np.array([p.get(name, default) for p in projects], dtype=np.float64)
+            for name, default in NUMERIC_DEFAULTS.items()
+        }
+        for name in BOOL_FIELDS:
+            cols[name] = np.array([bool(p.get(name)) for p in projects], dtype=bool)
+        cols["audit_firm"] = np.array([p.get('audit_firm') for p in projects], dtype=object)
+        cols["n_backers"] = np.array([len(p.get('backers', [])) for p in projects], dtype=np.int64)
+        return cols
+
+    @staticmethod
+    def _column(columns, name: str, n: int, default, dtype) -> np.ndarray:
+        if name in columns:
+            return np.asarray(columns[name], dtype=dtype)
+        return np.full(n, default, dtype=dtype)
+
+    # ------------------------------------------------------------------
+    # Calcul
+    # ------------------------------------------------------------------
+
+    def ratio_matrix(self, columns) -> np.ndarray:
+        """(N, 21) ratios depuis un mapping de colonnes ou un pandas.DataFrame."""
+        n = len(next(iter(columns.values()))) if isinstance(columns, dict) else len(columns)
+        col = {name: self._column(columns, name, n, default, np.float64) for name, default in NUMERIC_DEFAULTS.items()}
+        flags = {name: self._column(columns, name, n, False, bool) for name in BOOL_FIELDS}
+        n_backers = self._column(columns, "n_backers", n, 0, np.int64)
+        audit_firm = self._column(columns, "audit_firm", n, None, object)
+
+        mc, fdv = col["mc"], col["fdv"]
+        r = {
+            "mc_fdmc": _safe_div(mc, fdv, 0.5),
+            "circ_vs_total": _safe_div(col["circ_supply"], col["total_supply"], 0.5),
+            "volume_mc": _safe_div(col["volume_24h"], mc, 0.1),
+            "liquidity_ratio": _safe_div(col["lp_reserves_usd"], mc, 0.1),
+            "whale_concentration": 1.0 - _cap(col["top10_concentration"]),
+            "audit_score": np.where(np.isin(audit_firm, self.tier1_auditors), 1.0, 0.5),
+            "vc_score": _cap(n_backers * 0.33),
+            "social_sentiment": _cap(col["social_followers"] / 100000),
+            "dev_activity": _cap(col["github_commits"] / 100),
+            "tokenomics_health": np.where(flags["owner_renounced"] & flags["lp_locked"], 1.0, 0.2),
+            "partnership_quality": np.where(n_backers > 0, 0.8, 0.2),
+            "product_maturity": np.where(flags["contract_verified"], 1.0, 0.5),
+            "volatility": 1.0 - col["volatility_score"],
+            "historical_performance": col["historical_performance"],
+        }
+        matrix = np.empty((n, len(RATIO_NAMES)), dtype=np.float64)
+        for j, name in enumerate(RATIO_NAMES):
+            matrix[:, j] = r[name] if name in r else CONSTANT_RATIOS[name]
+        return matrix
+
+    def scores(self, ratios: np.ndarray) -> np.ndarray:
+        """Scores 0-100 : somme pondérée des ratios, accumulée dans l'ordre de RATIO_NAMES."""
+        total = np.zeros(ratios.shape[0], dtype=np.float64)
+        for j in range(ratios.shape[1]):
+            total = total + ratios[:, j] * self.weight_vector[j]
+        return total * 100
+
+    def verdicts(self, scores: np.ndarray, has_flags: Optional[np.ndarray] = None,
+                 hard_reject: Optional[np.ndarray] = None) -> np.ndarray:
+        """Règles de verdict du scanner (GO_SCORE / REVIEW_SCORE / flags / rejets durs)."""
+        n = scores.shape[0]
+        has_flags = np.zeros(n, dtype=bool) if has_flags is None else np.asarray(has_flags, dtype=bool)
+        hard_reject = np.zeros(n, dtype=bool) if hard_reject is None else np.asarray(hard_reject, dtype=bool)
+        verdicts = np.full(n, "REJECT", dtype=object)
+        verdicts[(scores >= self.review_score) | has_flags] = "REVIEW"
+        verdicts[(scores >= self.go_score) & ~has_flags] = "GO"
+        verdicts[hard_reject] = "REJECT"
+        return verdicts
+
+    def score(self, columns, has_flags: Optional[np.ndarray] = None,
+              hard_reject: Optional[np.ndarray] = None) -> ScoreResult:
+        """Passe complète : ratios, scores pondérés et verdicts pour N projets."""
+        ratios = self.ratio_matrix(columns)
+        scores = self.scores(ratios)
+        if hard_reject is not None:
+            scores = np.where(np.asarray(hard_reject, dtype=bool), 0.0, scores)
+        return ScoreResult(ratios, scores, self.verdicts(scores, has_flags, hard_reject))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Module Scraping Quantum Scanner v6.1
+Fetchers HTML des launchpads sans API JSON (TrustPad, Seedify, DAO Maker, DxSale...).
+
+La boucle d'événements ne fait que l'I/O : le parsing BeautifulSoup/lxml et l'extraction
+des projets tournent dans un pool de processus, avec un nombre borné de pages en vol.
+Chaque source est décrite dans config.yml (`scraping.sources`) par une URL, un sélecteur
+CSS de carte projet et un sélecteur par champ (`"css"` pour le texte, `"css@attr"` pour
+un attribut, `"@attr"` pour un attribut de la carte elle-même).
+"""
+
+import asyncio
+import multiprocessing
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from loguru import logger
+
+from metrics import metrics
+
+_AMOUNT_RE = re.compile(r"(\d[\d,\s]*(?:\.\d+)?)\s*([kmb])?", re.IGNORECASE)
+_MULTIPLIERS = {"k": 1e3, "m": 1e6, "b": 1e9}
+# Champs convertis en montant, et champs d'URL rendus absolus par rapport à la page
+_AMOUNT_FIELDS = ("hard_cap_usd",)
+_URL_FIELDS = ("link", "website", "twitter", "telegram", "github")
+
+
+@dataclass
+class ScrapeSpec:
+    """Une page listant des projets : URL, sélecteur de carte et sélecteurs de champs."""
+    key: str
+    name: str
+    url: str
+    item: str
+    fields: Dict[str, str] = field(default_factory=dict)
+    chain: str = "Unknown"
+    max_items: int = 0  # 0 = toutes les cartes de la page
+
+    @classmethod
+    def from_settings(cls, key: str, cfg: Dict) -> "ScrapeSpec":
+        return cls(key, cfg.get('name', key), cfg['url'], cfg['item'], dict(cfg.get('fields', {})),
+                   cfg.get('chain', "Unknown"), int(cfg.get('max_items', 0)))
+
+
+def parse_amount(text: Optional[str]) -> float:
+    """'$1,250,000' -> 1250000.0 ; '1.5M' -> 1500000.0 ; illisible -> 0."""
+    match = _AMOUNT_RE.search(text or "")
+    if not match:
+        return 0.0
+    value = float(re.sub(r"[,\s]", "", match.group(1)))
+    return value * _MULTIPLIERS.get((match.group(2) or "").lower(), 1)
+
+
+def _extract(card, selector: str) -> Optional[str]:
+    css, _, attr = selector.partition("@")
+    node = card.select_one(css) if css else card
+    if node is None:
+        return None
+    value = node.get(attr) if attr else node.get_text(" ", strip=True)
+    if isinstance(value, list):  # attribut multi-valué (class)
+        value = " ".join(value)
+    return value.strip() if value else None
+
+
+def parse_listing(html: str, spec: ScrapeSpec) -> List[Dict]:
+    """Page HTML -> projets au format des fetchers JSON (exécuté dans le pool de processus)."""
+    from bs4 import BeautifulSoup  # importé dans le worker uniquement
+
+    soup = BeautifulSoup(html, "lxml")
+    cards = soup.select(spec.item)
+    if spec.max_items:
+        cards = cards[:spec.max_items]
+    projects = []
+    for card in cards:
+        p = {k: _extract(card, selector) for k, selector in spec.fields.items()}
+        if not p.get('name'):
+            continue
+        for k in _URL_FIELDS:
+            if p.get(k):
+                p[k] = urljoin(spec.url, p[k])
+        for k in _AMOUNT_FIELDS:
+            if k in p:
+                p[k] = parse_amount(p[k])
+        p['source'] = spec.name
+        p['chain'] = p.get('chain') or spec.chain
+        p['link'] = p.get('link') or spec.url
+        projects.append(p)
+    return projects
+
+
+class HtmlScraper:
+    """Pool de processus de parsing, borné à `max_pending` pages en vol.
+
+    `processes: 0` parse dans un thread : la boucle reste libre mais le GIL est partagé.
+    Un pool cassé (worker tué) est recréé à la page suivante.
+    """
+
+    def __init__(self, processes: int = 2, max_pending: int = 4, max_page_bytes: int = 5_000_000,
+                 parse_timeout: float = 30.0, start_method: str = "spawn",
+                 specs: Optional[List[ScrapeSpec]] = None):
+        self.processes = processes
+        self.max_pending = max(1, max_pending)
+        self.max_page_bytes = max_page_bytes
+        self.parse_timeout = parse_timeout
+        self.start_method = start_method
+        self.specs = specs or []
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"pages": 0, "projects": 0, "oversize": 0, "timeouts": 0, "failures": 0, "parse_s": 0.0}
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> "HtmlScraper":
+        cfg = settings.get('scraping', {})
+        specs = []
+        for key, source in (cfg.get('sources') or {}).items():
+            if not source or not source.get('enabled', True) or not source.get('url') or not source.get('item'):
+                continue
+            specs.append(ScrapeSpec.from_settings(str(key).lower(), source))
+        return cls(processes=cfg.get('processes', 2), max_pending=cfg.get('max_pending', 4),
+                   max_page_bytes=cfg.get('max_page_bytes', 5_000_000), parse_timeout=cfg.get('parse_timeout', 30.0),
+                   start_method=cfg.get('start_method', "spawn"), specs=specs)
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.processes > 0:
+                # spawn : pas de fork d'un processus qui porte des threads (aiosqlite, WHOIS)
+                self._executor = ProcessPoolExecutor(max_workers=self.processes,
+                                                     mp_context=multiprocessing.get_context(self.start_method))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape")
+        return self._executor
+
+    async def parse(self, html: Optional[str], spec: ScrapeSpec) -> List[Dict]:
+        """Projets extraits de `html` ; [] si la page est vide, trop grosse ou illisible."""
+        if not isinstance(html, str) or not html:
+            return []
+        if len(html) > self.max_page_bytes:
+            self.stats['oversize'] += 1
+            logger.warning(f"Page {spec.name} ignorée ({len(html)} octets > {self.max_page_bytes})")
+            return []
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            started = time.perf_counter()
+            try:
+                with metrics.timer("parse_html"):
+                    projects = await asyncio.wait_for(
+                        loop.run_in_executor(self._pool(), parse_listing, html, spec), timeout=self.parse_timeout)
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                logger.warning(f"Parsing {spec.name} > {self.parse_timeout}s, page ignorée")
+                return []
+            except BrokenProcessPool:
+                self.stats['failures'] += 1
+                logger.error(f"Pool de parsing cassé pendant {spec.name}, recréé à la prochaine page")
+                self._shutdown()
+                return []
+            except Exception as e:
+                self.stats['failures'] += 1
+                logger.error(f"Parsing {spec.name} impossible: {e}")
+                return []
+            finally:
+                self.stats['parse_s'] += time.perf_counter() - started
+        self.stats['pages'] += 1
+        self.stats['projects'] += len(projects)
+        return projects
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def close(self):
+        self._shutdown()
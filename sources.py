@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Module Sources Quantum Scanner v6.1
+Registre des fetchers (tier, cadence, jitter) et ordonnanceur par source pour le mode daemon.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from metrics import metrics
+
+# Cadence par défaut de chaque tier (secondes)
+DEFAULT_TIER_INTERVALS = {1: 900, 2: 3600, 3: 6 * 3600}
+DEFAULT_TIER = 3
+
+Fetcher = Callable[[], Awaitable[List[Dict]]]
+
+
+@dataclass
+class SourceSpec:
+    """Une source : son fetcher, son tier (1 = prioritaire) et sa cadence de polling."""
+    name: str
+    fetcher: Fetcher
+    tier: int = DEFAULT_TIER
+    interval: float = DEFAULT_TIER_INTERVALS[DEFAULT_TIER]
+    jitter: float = 0.1
+    stats: Dict[str, float] = field(default_factory=lambda: {"polls": 0, "projects": 0, "errors": 0, "last_duration_s": 0.0})
+
+    @property
+    def polls_per_hour(self) -> float:
+        return 3600 / self.interval if self.interval > 0 else 0.0
+
+    def next_delay(self, rng: random.Random) -> float:
+        """Intervalle ± jitter : les sources d'un même tier ne tombent pas toutes au même instant."""
+        return max(1.0, self.interval * (1 + rng.uniform(-self.jitter, self.jitter)))
+
+
+class SourceRegistry:
+    """Sources déclarées par le scanner ; tiers et cadences viennent de config.yml.
+
+    Sans `max_polls_per_hour`, le budget est celui de la boucle v6.0 : chaque source
+    interrogée une fois toutes les `scan_interval_hours` heures (le tier 1 est alors bridé).
+    """
+
+    def __init__(self, tier_intervals: Optional[Dict[int, float]] = None, tiers: Optional[Dict[str, int]] = None,
+                 jitter: float = 0.1, max_polls_per_hour: Optional[float] = None, scan_interval_hours: float = 6.0):
+        self.tier_intervals = {**DEFAULT_TIER_INTERVALS, **(tier_intervals or {})}
+        self.tiers = tiers or {}
+        self.jitter = jitter
+        self.max_polls_per_hour = max_polls_per_hour
+        self.scan_interval_hours = scan_interval_hours
+        self.sources: Dict[str, SourceSpec] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Dict, scan_interval_hours: float = 6.0) -> "SourceRegistry":
+        """`launchpads.tier1/2/3` (listes de noms) + `scheduler` (cadences, jitter, budget)."""
+        tiers = {}
+        for tier in (1, 2, 3):
+            for name in settings.get('launchpads', {}).get(f'tier{tier}', []) or []:
+                tiers[str(name).lower()] = tier
+        scheduler = settings.get('scheduler', {})
+        intervals = {int(str(k).replace('tier', '')): float(v) for k, v in scheduler.get('tier_intervals', {}).items()}
+        return cls(intervals, tiers, jitter=scheduler.get('jitter', 0.1),
+                   max_polls_per_hour=scheduler.get('max_polls_per_hour'), scan_interval_hours=scan_interval_hours)
+
+    def register(self, name: str, fetcher: Fetcher, tier: Optional[int] = None,
+                 interval: Optional[float] = None) -> SourceSpec:
+        tier = tier if tier is not None else self.tiers.get(name, DEFAULT_TIER)
+        spec = SourceSpec(name, fetcher, tier, interval or self.tier_intervals[tier], self.jitter)
+        self.sources[name] = spec
+        return spec
+
+    def __iter__(self):
+        return iter(sorted(self.sources.values(), key=lambda s: (s.tier, s.name)))
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    @property
+    def polls_budget(self) -> float:
+        """Requêtes launchpad par heure autorisées (défaut : volume de la boucle v6.0)."""
+        if self.max_polls_per_hour:
+            return float(self.max_polls_per_hour)
+        return len(self.sources) / self.scan_interval_hours if self.scan_interval_hours > 0 else 0.0
+
+    def apply_budget(self):
+        """Ramène le volume prévu sous le budget : le tier 1 garde sa cadence, les autres tiers
+        se partagent ce qu'il laisse. Si le tier 1 seul dépasse le budget, tout est étiré du même facteur."""
+        budget = self.polls_budget
+        top = sum(s.polls_per_hour for s in self.sources.values() if s.tier == 1)
+        rest = sum(s.polls_per_hour for s in self.sources.values() if s.tier != 1)
+        if not budget or top + rest <= budget:
+            return
+        if top >= budget:
+            factor = (top + rest) / budget
+            for spec in self.sources.values():
+                spec.interval *= factor
+            logger.warning(f"Budget de polling {budget:.2f}/h inférieur au seul tier 1 ({top:.1f}/h) : "
+                           f"toutes les cadences multipliées par {factor:.2f}")
+            return
+        factor = rest / (budget - top)
+        for spec in self.sources.values():
+            if spec.tier != 1:
+                spec.interval *= factor
+        logger.info(f"Budget de polling {budget:.2f}/h (tier 1 {top:.1f}/h, autres tiers {rest:.1f}/h) : "
+                    f"cadences des tiers 2-3 multipliées par {factor:.2f}")
+
+
+class SourceScheduler:
+    """Une tâche par source, chacune à sa cadence ; chaque résultat est poussé à `on_projects`.
+
+    Les démarrages sont étalés sur `initial_stagger` secondes, tier 1 en premier.
+    """
+
+    def __init__(self, registry: SourceRegistry,
+                 on_projects: Callable[[SourceSpec, List[Dict]], Awaitable[None]],
+                 initial_stagger: float = 30.0, seed: Optional[int] = None):
+        self.registry = registry
+        self.on_projects = on_projects
+        self.initial_stagger = initial_stagger
+        self.rng = random.Random(seed)
+        self._tasks: List[asyncio.Task] = []
+
+    async def run(self):
+        """Tourne jusqu'à annulation."""
+        self.registry.apply_budget()
+        for spec in self.registry:
+            logger.info(f"Source {spec.name}: tier {spec.tier}, toutes les {spec.interval / 60:.0f} min (±{spec.jitter:.0%})")
+        self._tasks = [asyncio.create_task(self._poll_forever(spec), name=f"source-{spec.name}") for spec in self.registry]
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+
+    async def _poll_forever(self, spec: SourceSpec):
+        # Tier 1 démarre dans la première tranche de l'étalement, tier 3 dans la dernière
+        slot = self.initial_stagger / 3
+        await asyncio.sleep((spec.tier - 1) * slot + self.rng.uniform(0, slot))
+        while True:
+            await self.poll(spec)
+            await asyncio.sleep(spec.next_delay(self.rng))
+
+    async def poll(self, spec: SourceSpec):
+        started = time.monotonic()
+        try:
+            with metrics.timer(f"fetch_{spec.name}"):
+                projects = await spec.fetcher()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            spec.stats['errors'] += 1
+            logger.error(f"Erreur Fetcher {spec.name}: {e}")
+            return
+        finally:
+            spec.stats['polls'] += 1
+            spec.stats['last_duration_s'] = round(time.monotonic() - started, 3)
+        spec.stats['projects'] += len(projects)
+        await self.on_projects(spec, projects)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {spec.name: {"tier": spec.tier, "interval_s": round(spec.interval), **spec.stats} for spec in self.registry}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Module Startup Quantum Scanner v6.1
+Imports différés des sous-systèmes lourds et profil de démarrage (--startup-profile).
+"""
+
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def lazy_module(name: str):
+    """Module chargé au premier accès à un attribut (importlib.util.LazyLoader).
+
+    Usage : `np = lazy_module("numpy")` en tête de fichier ; l'import réel
+    n'a lieu que si un chemin de code utilise effectivement `np.`.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def import_profile(module: str = "main", path: Optional[str] = None,
+                   python: str = sys.executable) -> Tuple[float, List[Dict]]:
+    """Import à froid de `module` dans un processus neuf (-X importtime).
+
+    `path` est ajouté au PYTHONPATH (répertoire du module si lancé hors du dépôt).
+    Retourne (durée totale en secondes, paquets de premier niveau triés par coût cumulé).
+    """
+    env = dict(os.environ)
+    if path:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH")]))
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} a échoué: {proc.stderr.strip().splitlines()[-1:]}")
+    packages: Dict[str, Dict] = {}
+    total_us = self_us_module = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), len(match[3]), match[4]
+        if name == module and indent == 1:
+            total_us, self_us_module = cumulative_us, self_us
+        elif indent == 3:
+            # Imports directs du module profilé, regroupés par paquet de premier niveau
+            top = name.split('.')[0]
+            entry = packages.setdefault(top, {"module": top, "cumulative_s": 0.0})
+            entry["cumulative_s"] += cumulative_us / 1e6
+    packages[f"{module} (corps)"] = {"module": f"{module} (corps)", "cumulative_s": self_us_module / 1e6}
+    ranked = sorted(packages.values(), key=lambda e: e["cumulative_s"], reverse=True)
+    for entry in ranked:
+        entry["cumulative_s"] = round(entry["cumulative_s"], 4)
+    return total_us / 1e6, ranked
+
+
+class StartupProfile:
+    """Chronométrage des phases d'initialisation (construction, DB, HTTP, premiers chargements différés)."""
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(seconds, 4) for name, seconds in self.phases}
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Module Cache Quantum Scanner v6.1
+Cache LRU borné avec TTL, coalescing des requêtes concurrentes et tier SQLite optionnel.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU borné : chaque entrée a sa propre date d'expiration."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return default
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return default
+        self._data.move_to_end(key)
+        self.stats['hits'] += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+
+class _LeaderCancelled(Exception):
+    """Le meneur d'un SingleFlight a été annulé : ses suiveurs relancent l'appel."""
+
+
+class SingleFlight:
+    """Coalescing : les appels concurrents pour une même clé partagent une seule exécution.
+
+    Si l'appel qui exécute (le meneur) est annulé, seuls ses propres appelants voient
+    l'annulation : un suiveur en attente reprend l'exécution à son compte.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while key in self._inflight:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(self._inflight[key])
+            except _LeaderCancelled:
+                continue
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+            if future.done():
+                future.exception()  # marque l'exception comme récupérée
+
+
+class SQLiteCacheTier:
+    """Tier persistant (valeurs JSON) : survit entre deux runs GitHub Actions si le fichier est conservé."""
+
+    def __init__(self, db_path: str = "cache/antiscam_cache.db"):
+        self.db_path = db_path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    async def _conn(self) -> aiosqlite.Connection:
+        if self._db is None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self._db is None:
+                    os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+                    db = await aiosqlite.connect(self.db_path)
+                    await db.execute("PRAGMA journal_mode=WAL")
+                    await db.execute('''CREATE TABLE IF NOT EXISTS cache (
+                        key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)''')
+                    # Purge des entrées expirées à l'ouverture
+                    await db.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+                    await db.commit()
+                    self._db = db
+        return self._db
+
+    async def get(self, key: str) -> Tuple[Any, float]:
+        """(valeur, TTL restant) ou (_MISSING, 0)."""
+        try:
+            db = await self._conn()
+            async with db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)) as cursor:
+                row = await cursor.fetchone()
+        except Exception as e:
+            logger.debug(f"Cache SQLite illisible: {e}")
+            return _MISSING, 0.0
+        remaining = row[1] - time.time() if row else 0.0
+        if not row or remaining <= 0:
+            self.stats['misses'] += 1
+            return _MISSING, 0.0
+        self.stats['hits'] += 1
+        return json.loads(row[0]), remaining
+
+    async def set(self, key: str, value: Any, ttl: float):
+        try:
+            db = await self._conn()
+            await db.execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                             (key, json.dumps(value, default=str), time.time() + ttl))
+            await db.commit()
+            self.stats['writes'] += 1
+        except Exception as e:
+            logger.debug(f"Cache SQLite: écriture impossible: {e}")
+
+    async def close(self):
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+
+class TieredCache:
+    """Mémoire (LRU+TTL) -> SQLite optionnel -> loader, avec coalescing et cache négatif."""
+
+    def __init__(self, maxsize: int = 10000, persistent: Optional[SQLiteCacheTier] = None):
+        self.memory = TTLCache(maxsize)
+        self.persistent = persistent
+        self.flight = SingleFlight()
+        self.stats = {"loads": 0, "negative_stored": 0}
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float,
+                          negative_ttl: Optional[float] = None,
+                          is_error: Callable[[Any], bool] = lambda value: False) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return await self.flight.do(key, lambda: self._load(key, loader, ttl, negative_ttl, is_error))
+
+    async def _load(self, key, loader, ttl, negative_ttl, is_error):
+        if self.persistent is not None:
+            value, remaining = await self.persistent.get(key)
+            if value is not _MISSING:
+                self.memory.set(key, value, remaining)
+                return value
+        self.stats['loads'] += 1
+        value = await loader()
+        if is_error(value):
+            self.stats['negative_stored'] += 1
+            ttl = negative_ttl if negative_ttl is not None else ttl
+            self.memory.set(key, value, ttl)  # les erreurs ne sont pas persistées
+        else:
+            self.memory.set(key, value, ttl)
+            if self.persistent is not None:
+                await self.persistent.set(key, value, ttl)
+        return value
+
+    def report(self) -> Dict[str, Any]:
+        report = {**self.memory.stats, **self.stats, "coalesced": self.flight.coalesced, "size": len(self.memory)}
+        if self.persistent is not None:
+            report["sqlite"] = dict(self.persistent.stats)
+        return report
+
+    async def close(self):
+        if self.persistent is not None:
+            await self.persistent.close()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Module WHOIS Quantum Scanner v6.1
+Résolution non bloquante de l'âge des domaines avec cache SQLite persistant.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from startup import lazy_module
+from ttl_cache import SingleFlight
+
+# tldextract (~0,2 s d'import) n'est chargé qu'à la première résolution
+tldextract = lazy_module("tldextract")
+
+
+def _lookup_creation_date(domain: str) -> Optional[datetime]:
+    """Requête WHOIS synchrone (exécutée dans le thread pool).
+
+    None : le registre a répondu sans date de création. Un échec de la requête lève.
+    """
+    import whois  # import différé : inutile tant qu'aucun domaine n'est résolu
+    w = whois.whois(domain)
+    creation_date = w.creation_date[0] if isinstance(w.creation_date, list) else w.creation_date
+    if isinstance(creation_date, datetime):
+        return creation_date.replace(tzinfo=None)
+    return None
+
+
+class DomainAgeResolver:
+    """WHOIS dans un thread pool borné, limité par registre, avec cache SQLite.
+
+    Une réponse WHOIS ne change jamais : la date de création (ou son absence, certains
+    registres ne la publient pas) est cachée sans expiration. Les échecs (timeout, erreur
+    du registre) sont cachés `negative_ttl` secondes. En base, NULL marque un échec et
+    '' une réponse sans date.
+    """
+
+    def __init__(self, db_path: str = 'quantum.db', max_workers: int = 4, per_registry_limit: int = 2,
+                 timeout: float = 15.0, negative_ttl: Optional[float] = None,
+                 lookup: Callable[[str], Optional[datetime]] = _lookup_creation_date):
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.per_registry_limit = per_registry_limit
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(os.getenv('WHOIS_NEGATIVE_TTL_HOURS', 6)) * 3600
+        self.lookup = lookup
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._registry_limits: Dict[str, asyncio.Semaphore] = {}
+        self._flight = SingleFlight()
+        # domaine -> (date de création, vérifié le, échec)
+        self._cache: Dict[str, Tuple[Optional[datetime], float, bool]] = {}
+        self._loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        # Connexion ouverte au premier appel et gardée jusqu'à close()
+        self._db: Optional[aiosqlite.Connection] = None
+
+        self.stats = {"cache_hits": 0, "negative_hits": 0, "lookups": 0, "timeouts": 0, "failures": 0}
+
+    # ------------------------------------------------------------------
+    # Cache SQLite
+    # ------------------------------------------------------------------
+
+    async def _ensure_loaded(self):
+        """Ouvre la connexion et charge la table domain_ages en mémoire au premier appel."""
+        if self._loaded:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                db = await aiosqlite.connect(self.db_path)
+                self._db = db
+                await db.execute('''CREATE TABLE IF NOT EXISTS domain_ages (
+                    domain TEXT PRIMARY KEY, creation_date TEXT, checked_at REAL NOT NULL)''')
+                await db.commit()
+                async with db.execute("SELECT domain, creation_date, checked_at FROM domain_ages") as cursor:
+                    async for domain, creation_date, checked_at in cursor:
+                        self._cache[domain] = (datetime.fromisoformat(creation_date) if creation_date else None,
+                                               checked_at, creation_date is None)
+                logger.debug(f"Cache WHOIS chargé: {len(self._cache)} domaines")
+            except Exception as e:
+                logger.warning(f"Cache WHOIS indisponible: {e}")
+            self._loaded = True
+
+    async def _store(self, domain: str, creation_date: Optional[datetime], checked_at: float, failed: bool):
+        self._cache[domain] = (creation_date, checked_at, failed)
+        if self._db is None:
+            return
+        try:
+            await self._db.execute("INSERT OR REPLACE INTO domain_ages (domain, creation_date, checked_at) VALUES (?, ?, ?)",
+                                   (domain, creation_date.isoformat() if creation_date else (None if failed else ''),
+                                    checked_at))
+            await self._db.commit()
+        except Exception as e:
+            logger.warning(f"Écriture cache WHOIS impossible pour {domain}: {e}")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _registry_limit(self, domain: str) -> asyncio.Semaphore:
+        registry = tldextract.extract(domain).suffix or domain.rsplit('.', 1)[-1]
+        if registry not in self._registry_limits:
+            self._registry_limits[registry] = asyncio.Semaphore(self.per_registry_limit)
+        return self._registry_limits[registry]
+
+    async def creation_date(self, domain: str) -> Optional[datetime]:
+        """Date de création du domaine, ou None si elle est inconnue (sans date ou échec)."""
+        creation_date, _ = await self.lookup_domain(domain)
+        return creation_date
+
+    async def lookup_domain(self, domain: str) -> Tuple[Optional[datetime], bool]:
+        """(date de création ou None, échec) ; un échec est resservi du cache négatif."""
+        domain = domain.strip().lower()
+        await self._ensure_loaded()
+
+        cached = self._cache.get(domain)
+        if cached:
+            creation_date, checked_at, failed = cached
+            if not failed:
+                self.stats['cache_hits'] += 1
+                return creation_date, False
+            if time.time() - checked_at < self.negative_ttl:
+                self.stats['negative_hits'] += 1
+                return None, True
+
+        # Coalescing : un seul WHOIS par domaine même si plusieurs projets le partagent
+        return await self._flight.do(domain, lambda: self._resolve(domain))
+
+    async def _resolve(self, domain: str) -> Tuple[Optional[datetime], bool]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="whois")
+        loop = asyncio.get_running_loop()
+        creation_date, failed = None, True
+        async with self._registry_limit(domain):
+            self.stats['lookups'] += 1
+            try:
+                creation_date = await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, self.lookup, domain), timeout=self.timeout)
+                failed = False
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                logger.debug(f"WHOIS timeout pour {domain}")
+            except Exception as e:
+                self.stats['failures'] += 1
+                logger.debug(f"WHOIS échec pour {domain}: {e}")
+        await self._store(domain, creation_date, time.time(), failed)
+        return creation_date, failed
+
+    async def age_days(self, domain: str) -> Optional[int]:
+        """Âge du domaine en jours, 0 si le registre ne publie pas de date, None si WHOIS échoue."""
+        creation_date, failed = await self.lookup_domain(domain)
+        if failed:
+            return None
+        if creation_date is None:
+            return 0
+        return (datetime.now() - creation_date).days
+
+    async def close(self):
+        """Arrête le thread pool et ferme la connexion (rouverte au prochain appel)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+        self._loaded = False
+
+
+# Instance globale
+domain_age_resolver = DomainAgeResolver()